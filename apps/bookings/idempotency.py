@@ -0,0 +1,153 @@
+"""
+`Idempotency-Key` support for booking writes (POST /bookings/, PATCH /bookings/{id}/cancel/).
+
+    @idempotent
+    def post(self, request): ...
+
+The first request with a key claims an IdempotencyKey row (committed at once,
+so concurrent duplicates see it), runs the view and stores the rendered response.
+Same user + key afterwards:
+- same request (method, path, body) -> the stored response, replayed without running
+  the view: no Resource/Booking locks, no overlap query; marked `Idempotent-Replayed: true`
+- first request still in flight     -> 409 CONFLICT
+- different request                  -> 400 VALIDATION_ERROR (a key names one operation)
+
+5xx and transient errors (responses with Retry-After, e.g. RESOURCE_BUSY) are not
+stored: the claim is released so the client can retry with the same key.
+A claim whose request died mid-flight is taken over after IDEMPOTENCY_IN_FLIGHT_TIMEOUT.
+complete()/release() are fenced on the claim's created_at: a request that was only
+slow (its claim taken over meanwhile) lost the key and leaves the new owner's row alone.
+Rows live IDEMPOTENCY_KEY_TTL seconds; `manage.py purge_idempotency_keys` deletes expired ones.
+"""
+import hashlib
+import json
+import logging
+from datetime import timedelta
+from functools import wraps
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.http import HttpResponse
+from django.utils import timezone
+
+from common.exceptions import AppError, Conflict, ValidationError
+from common.renderers import JSONRenderer
+from common.responses import error_response
+from .models import IdempotencyKey
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 255
+
+logger = logging.getLogger(__name__)
+
+
+def request_hash(request) -> str:
+    body = json.dumps(request.data, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(f"{request.method} {request.path}\n{body}".encode("utf-8")).hexdigest()
+
+
+def claim(*, user, key: str, request_hash: str) -> IdempotencyKey:
+    """
+    Returns either a fresh in-flight row owned by the caller (status_code None)
+    or the completed row to replay. Raises Conflict / ValidationError otherwise.
+    """
+    if not key or len(key) > MAX_KEY_LENGTH:
+        raise ValidationError(f"{IDEMPOTENCY_HEADER} must be 1-{MAX_KEY_LENGTH} characters")
+
+    now = timezone.now()
+    record = IdempotencyKey.objects.filter(user=user, key=key).first()  # a replay costs this query only
+    if record is None:
+        try:
+            with transaction.atomic():
+                return IdempotencyKey.objects.create(
+                    user=user,
+                    key=key,
+                    request_hash=request_hash,
+                    created_at=now,
+                    expires_at=now + timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL),
+                )
+        except IntegrityError:
+            # a concurrent duplicate claimed it first
+            record = IdempotencyKey.objects.get(user=user, key=key)
+
+    stale = now - timedelta(seconds=settings.IDEMPOTENCY_IN_FLIGHT_TIMEOUT)
+    if record.expires_at <= now or (record.status_code is None and record.created_at <= stale):
+        # expired, or its request died mid-flight: take it over (conditional, one winner)
+        taken = IdempotencyKey.objects.filter(pk=record.pk, created_at=record.created_at).update(
+            request_hash=request_hash,
+            status_code=None,
+            response_body=None,
+            created_at=now,
+            expires_at=now + timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL),
+        )
+        if taken:
+            record.request_hash, record.status_code, record.response_body = request_hash, None, None
+            record.created_at = now
+            return record
+        record = IdempotencyKey.objects.get(pk=record.pk)
+
+    if record.request_hash != request_hash:
+        raise ValidationError(
+            f"{IDEMPOTENCY_HEADER} was already used for a different request",
+            details={"key": key},
+        )
+    if record.status_code is None:
+        raise Conflict(f"A request with this {IDEMPOTENCY_HEADER} is still in progress", details={"key": key})
+    return record
+
+
+def complete(record: IdempotencyKey, response) -> bool:
+    """Store the response; False if the claim was taken over meanwhile (nothing written)."""
+    stored = IdempotencyKey.objects.filter(pk=record.pk, created_at=record.created_at).update(
+        status_code=response.status_code,
+        response_body=JSONRenderer().render(response.data),
+    )
+    if not stored:
+        logger.warning("idempotency key %s: claim lost while in flight, response not stored", record.key)
+    return bool(stored)
+
+
+def release(record: IdempotencyKey) -> bool:
+    """Drop an in-flight claim; False if it was taken over meanwhile (nothing deleted)."""
+    deleted, _ = IdempotencyKey.objects.filter(
+        pk=record.pk, created_at=record.created_at, status_code__isnull=True
+    ).delete()
+    return bool(deleted)
+
+
+def replay(record: IdempotencyKey) -> HttpResponse:
+    response = HttpResponse(bytes(record.response_body), status=record.status_code, content_type="application/json")
+    response[REPLAYED_HEADER] = "true"
+    return response
+
+
+def idempotent(handler):
+    """Decorator for APIView handlers; requests without the header are untouched."""
+
+    @wraps(handler)
+    def wrapper(view, request, *args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if key is None or not request.user.is_authenticated:
+            return handler(view, request, *args, **kwargs)
+
+        try:
+            record = claim(user=request.user, key=key, request_hash=request_hash(request))
+        except AppError as e:
+            return error_response(e)
+        if record.status_code is not None:
+            return replay(record)
+
+        try:
+            response = handler(view, request, *args, **kwargs)
+        except BaseException:
+            release(record)
+            raise
+
+        if response.status_code >= 500 or response.has_header("Retry-After"):
+            release(record)
+        else:
+            complete(record, response)
+        return response
+
+    return wrapper
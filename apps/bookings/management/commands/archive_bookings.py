@@ -0,0 +1,54 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from apps.bookings.services import archive_bookings
+
+
+class Command(BaseCommand):
+    help = (
+        "Move bookings that ended more than --older-than-days ago (any status) from "
+        "bookings_booking into bookings_bookingarchive, in short batches. Run from cron; "
+        "on Postgres VACUUM (ANALYZE) bookings_booking afterwards to reclaim index space."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--older-than-days", type=int, default=settings.BOOKING_ARCHIVE_AFTER_DAYS)
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--max-batches", type=int, default=0, help="stop after N batches (0 = until done)")
+        parser.add_argument("--sleep", type=float, default=0.0, help="seconds between batches (replica lag)")
+        parser.add_argument("--vacuum", action="store_true", help="VACUUM ANALYZE both tables when done (Postgres)")
+
+    def handle(self, *args, **opts):
+        if opts["older_than_days"] < 1:
+            # the hot table must keep everything has_overlap can still see
+            raise CommandError("--older-than-days must be >= 1")
+
+        before = timezone.now() - timedelta(days=opts["older_than_days"])
+        total = batches = 0
+        t0 = time.perf_counter()
+        while True:
+            moved = archive_bookings(before=before, batch_size=opts["batch_size"])
+            if not moved:
+                break
+            total += moved
+            batches += 1
+            self.stdout.write(f"  batch {batches}: {moved} rows")
+            if opts["max_batches"] and batches >= opts["max_batches"]:
+                break
+            if opts["sleep"]:
+                time.sleep(opts["sleep"])
+
+        if opts["vacuum"] and connection.vendor == "postgresql":
+            with connection.cursor() as cur:
+                cur.execute("VACUUM ANALYZE bookings_booking")
+                cur.execute("VACUUM ANALYZE bookings_bookingarchive")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Archived {total} bookings ended before {before.isoformat()} "
+            f"in {batches} batches ({time.perf_counter() - t0:.1f}s)."
+        ))
@@ -0,0 +1,77 @@
+import time
+import tracemalloc
+import uuid
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.bookings.models import Booking, BookingStatus
+from apps.bookings.selectors import list_bookings
+from apps.bookings.serializers import BOOKING_LIST_FIELDS, BookingListItemSerializer, booking_list_row
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare BookingListItemSerializer with the values()+booking_list_row projection "
+        "(rows/sec and peak memory). Synthetic rows by default, --db reads seeded bookings."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", type=int, nargs="+", default=[50, 10_000])
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--db", action="store_true", help="include the query (ORM instances vs values())")
+
+    def handle(self, *args, **opts):
+        for size in opts["sizes"]:
+            if opts["db"]:
+                serializer_path = lambda: BookingListItemSerializer(  # noqa: E731
+                    list(list_bookings().select_related("resource", "user")[:size]), many=True
+                ).data
+                projection_path = lambda: [  # noqa: E731
+                    booking_list_row(row) for row in list_bookings().values(*BOOKING_LIST_FIELDS)[:size]
+                ]
+            else:
+                instances, rows = _synthetic(size)
+                serializer_path = lambda: BookingListItemSerializer(instances, many=True).data  # noqa: E731
+                projection_path = lambda: [booking_list_row(row) for row in rows]  # noqa: E731
+
+                # both paths must produce identical JSON
+                assert [dict(r) for r in serializer_path()] == projection_path()
+
+            self.stdout.write(f"\npage size {size}{' (db)' if opts['db'] else ''}")
+            for label, fn in (("serializer", serializer_path), ("projection", projection_path)):
+                rows_per_sec, peak = _run(fn, size=size, repeat=opts["repeat"])
+                self.stdout.write(f"  {label:<12} {rows_per_sec:>14,.0f} rows/s   peak {peak / 1024:>10,.1f} KiB")
+
+
+def _run(fn, *, size: int, repeat: int) -> tuple[float, int]:
+    fn()  # warmup
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    elapsed = time.perf_counter() - t0
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size * repeat / elapsed, peak
+
+
+def _synthetic(size: int):
+    now = timezone.now()
+    instances, rows = [], []
+    for i in range(size):
+        row = {
+            "id": uuid.uuid4(),
+            "resource_id": uuid.uuid4(),
+            "user_id": uuid.uuid4(),
+            "start_at": now + timedelta(hours=i),
+            "end_at": now + timedelta(hours=i, minutes=30),
+            "status": BookingStatus.ACTIVE.value,
+            "created_at": now,
+        }
+        rows.append(row)
+        instances.append(Booking(**row))
+    return instances, rows
@@ -0,0 +1,77 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from apps.bookings.models import Booking
+from apps.bookings.selectors import BOOKING_LIST_ORDERING
+from apps.bookings.serializers import BOOKING_LIST_FIELDS
+from common.benchmarks import format_stats, summarize
+from common.db_pool import log_pool_stats, sample_pool
+
+NO_POOL_ALIAS = "bench_no_pool"
+POOL_ALIAS = "bench_pool"
+
+
+class Command(BaseCommand):
+    help = (
+        "Per-request DB latency with and without the psycopg connection pool (Postgres only). "
+        "Each iteration is one request's DB lifecycle: get a connection, read a 50-row "
+        "booking page, release the connection (close vs return to pool)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=500, help="requests per mode")
+        parser.add_argument("--threads", type=int, default=1, help="concurrent request threads")
+        parser.add_argument("--pool-size", type=int, default=4)
+
+    def handle(self, *args, **opts):
+        if connections["default"].vendor != "postgresql":
+            raise CommandError("bench_db_pool needs the Postgres backend (psycopg 3 + psycopg_pool)")
+
+        base = connections.settings["default"]
+        options = {k: v for k, v in base.get("OPTIONS", {}).items() if k != "pool"}
+        connections.settings[NO_POOL_ALIAS] = {
+            **base, "OPTIONS": options, "CONN_MAX_AGE": 0, "CONN_HEALTH_CHECKS": False,
+        }
+        connections.settings[POOL_ALIAS] = {
+            **base,
+            "OPTIONS": {**options, "pool": {"min_size": opts["pool_size"], "max_size": opts["pool_size"], "timeout": 30}},
+            "CONN_MAX_AGE": 0,
+            "CONN_HEALTH_CHECKS": True,
+        }
+
+        try:
+            for label, alias in (("no pool (connect per request)", NO_POOL_ALIAS), ("pool", POOL_ALIAS)):
+                samples = _run(alias, iterations=opts["iterations"], threads=opts["threads"])
+                self.stdout.write(format_stats(label, summarize(samples)))
+
+            sample = sample_pool(POOL_ALIAS)
+            if sample:
+                log_pool_stats(sample)
+                self.stdout.write(
+                    f"pool: max={sample['max']} queued={sample['queued']} "
+                    f"wait={sample['wait_ms']}ms timeouts={sample['timeouts']}"
+                )
+        finally:
+            connections[POOL_ALIAS].close_pool()
+            for alias in (NO_POOL_ALIAS, POOL_ALIAS):
+                del connections.settings[alias]
+
+
+def _run(alias: str, *, iterations: int, threads: int) -> list[float]:
+    def request_cycle() -> float:
+        t0 = time.perf_counter()
+        list(
+            Booking.objects.using(alias)
+            .values(*BOOKING_LIST_FIELDS)
+            .order_by(*BOOKING_LIST_ORDERING)[:50]
+        )
+        # what request_finished does with CONN_MAX_AGE=0: close (or return to the pool)
+        connections[alias].close()
+        return time.perf_counter() - t0
+
+    request_cycle()  # warm-up (pool open, first connection)
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        return list(executor.map(lambda _: request_cycle(), range(iterations)))
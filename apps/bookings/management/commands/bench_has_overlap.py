@@ -0,0 +1,61 @@
+import random
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from apps.bookings.models import Booking, BookingStatus
+from apps.bookings.selectors import has_overlap
+from apps.resources.models import Resource
+from common.benchmarks import explain, format_stats, measure
+
+from .seed_bench_data import ROOM_PREFIX
+
+
+class Command(BaseCommand):
+    help = (
+        "has_overlap latency on random seeded resources (seed_bench_data), plus the hot table and "
+        "index sizes on Postgres. Run before and after `archive_bookings` to compare."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=2000)
+        parser.add_argument("--resources", type=int, default=1000, help="sample of resources to probe")
+
+    def handle(self, *args, **opts):
+        resource_ids = list(
+            Resource.objects.filter(name__startswith=ROOM_PREFIX)
+            .order_by("?")
+            .values_list("id", flat=True)[: opts["resources"]]
+        )
+        if not resource_ids:
+            raise CommandError("No bench resources; run `manage.py seed_bench_data` first.")
+
+        now = timezone.now().replace(minute=0, second=0, microsecond=0)
+
+        def probe():
+            start = now + timedelta(hours=random.randint(1, 24 * 14))
+            has_overlap(resource_id=str(random.choice(resource_ids)), start_at=start, end_at=start + timedelta(hours=1))
+
+        self.stdout.write(format_stats("has_overlap", measure(probe, iterations=opts["iterations"])))
+
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cur:
+                cur.execute(
+                    """
+                    SELECT relname, pg_size_pretty(pg_relation_size(oid)), reltuples::bigint
+                    FROM pg_class
+                    WHERE relname IN ('bookings_booking', 'bookings_bookingarchive')
+                       OR oid IN (SELECT indexrelid FROM pg_index WHERE indrelid = 'bookings_booking'::regclass)
+                    ORDER BY relname
+                    """
+                )
+                for name, size, rows in cur.fetchall():
+                    self.stdout.write(f"  {name:<48} {size:>10}  ~{rows} rows")
+
+        start = now + timedelta(days=1)
+        self.stdout.write(explain(Booking.objects.filter(
+            resource_id=resource_ids[0], status=BookingStatus.ACTIVE,
+            start_at__lt=start + timedelta(hours=1), end_at__gt=start,
+        )))
@@ -0,0 +1,139 @@
+import asyncio
+import json
+import time
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+from common.benchmarks import format_stats, summarize
+
+
+class Command(BaseCommand):
+    help = (
+        "Closed-loop HTTP load test: N concurrent keep-alive clients hammer GET endpoints "
+        "and report throughput and latency percentiles. Compare the same app served as\n"
+        "  WSGI: gunicorn config.wsgi -w 4 --threads 8\n"
+        "  ASGI: ASYNC_READ_VIEWS=True uvicorn config.asgi:application --workers 4\n"
+        "e.g. bench_http_load --base-url http://127.0.0.1:8000 --login bench@x.io:pass "
+        "--path /bookings/?page_size=50 --path /resources/ --concurrency 1000"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+        parser.add_argument("--path", action="append", dest="paths",
+                            help="GET path, repeatable (clients round-robin); default /bookings/")
+        parser.add_argument("--concurrency", type=int, default=1000)
+        parser.add_argument("--duration", type=float, default=30.0, help="seconds")
+        parser.add_argument("--token", help="access token (Authorization: Bearer ...)")
+        parser.add_argument("--login", help="email:password, logs in via /auth/login/ first")
+        parser.add_argument("--timeout", type=float, default=30.0, help="per-request seconds")
+
+    def handle(self, *args, **opts):
+        url = urlsplit(opts["base_url"])
+        if url.scheme != "http" or not url.hostname:
+            raise CommandError("--base-url must be http://host[:port]")
+
+        target = (url.hostname, url.port or 80)
+        token = opts["token"]
+        if not token and opts["login"]:
+            email, _, password = opts["login"].partition(":")
+            token = asyncio.run(_login(target, email, password))
+
+        paths = opts["paths"] or ["/bookings/"]
+        result = asyncio.run(
+            _run(
+                target,
+                paths=paths,
+                token=token,
+                concurrency=opts["concurrency"],
+                duration=opts["duration"],
+                timeout=opts["timeout"],
+            )
+        )
+
+        stats = summarize(result["latencies"])
+        self.stdout.write(format_stats(f"GET x{opts['concurrency']} clients", stats))
+        self.stdout.write(
+            f"throughput={stats['n'] / result['elapsed']:.1f} req/s  "
+            f"non_2xx={result['non_2xx']}  errors={result['errors']}  elapsed={result['elapsed']:.1f}s"
+        )
+
+
+async def _run(target, *, paths, token, concurrency, duration, timeout) -> dict:
+    result = {"latencies": [], "non_2xx": 0, "errors": 0}
+    deadline = time.perf_counter() + duration
+    started = time.perf_counter()
+
+    async def client(n: int):
+        conn = None
+        i = n
+        while time.perf_counter() < deadline:
+            path = paths[i % len(paths)]
+            i += 1
+            try:
+                if conn is None:
+                    conn = await asyncio.wait_for(asyncio.open_connection(*target), timeout)
+                t0 = time.perf_counter()
+                status, _ = await asyncio.wait_for(_request(conn, target, "GET", path, token=token), timeout)
+                result["latencies"].append(time.perf_counter() - t0)
+                if not 200 <= status < 300:
+                    result["non_2xx"] += 1
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError):
+                result["errors"] += 1
+                if conn is not None:
+                    conn[1].close()
+                conn = None
+        if conn is not None:
+            conn[1].close()
+
+    await asyncio.gather(*(client(n) for n in range(concurrency)))
+    result["elapsed"] = time.perf_counter() - started
+    return result
+
+
+async def _login(target, email: str, password: str) -> str:
+    conn = await asyncio.open_connection(*target)
+    try:
+        status, body = await _request(
+            conn, target, "POST", "/auth/login/", body={"email": email, "password": password}
+        )
+    finally:
+        conn[1].close()
+    if status != 200:
+        raise CommandError(f"login failed ({status}): {body[:200]!r}")
+    return json.loads(body)["access_token"]
+
+
+async def _request(conn, target, method: str, path: str, *, token=None, body=None) -> tuple[int, bytes]:
+    """Minimal HTTP/1.1 keep-alive exchange -> (status, body)."""
+    reader, writer = conn
+    payload = json.dumps(body).encode() if body is not None else b""
+    head = [f"{method} {path} HTTP/1.1", f"Host: {target[0]}:{target[1]}", "Accept: application/json"]
+    if token:
+        head.append(f"Authorization: Bearer {token}")
+    if payload:
+        head += ["Content-Type: application/json", f"Content-Length: {len(payload)}"]
+    writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + payload)
+    await writer.drain()
+
+    status_line = await reader.readline()
+    status = int(status_line.split()[1])
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        chunks = []
+        while True:
+            size = int((await reader.readline()).split(b";")[0], 16)
+            if size == 0:
+                await reader.readline()
+                break
+            chunks.append(await reader.readexactly(size))
+            await reader.readline()
+        return status, b"".join(chunks)
+    return status, await reader.readexactly(int(headers.get("content-length", "0")))
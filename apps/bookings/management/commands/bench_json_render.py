@@ -0,0 +1,84 @@
+import json
+import uuid
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from rest_framework import renderers
+
+from apps.bookings.models import BookingStatus
+from apps.bookings.serializers import booking_list_row
+from common import json_codec
+from common.benchmarks import format_stats, measure
+
+
+class Command(BaseCommand):
+    help = (
+        "Render time of DRF's stdlib JSONRenderer vs common.json_codec (orjson) for a "
+        "/bookings/ page and an NDJSON export (synthetic rows, no database)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--page-size", type=int, default=50)
+        parser.add_argument("--export-rows", type=int, default=100_000)
+        parser.add_argument("--iterations", type=int, default=200, help="page renders (export: iterations // 40)")
+
+    def handle(self, *args, **opts):
+        if json_codec.orjson is None:
+            raise CommandError("orjson is not installed: only the stdlib backend is available.")
+
+        rows = _rows(max(opts["page_size"], opts["export_rows"]))
+        page = {
+            "count": 10_000, "page": 1, "page_size": opts["page_size"], "total_pages": 200,
+            "next": 2, "previous": None,
+            "results": [booking_list_row(row) for row in rows[: opts["page_size"]]],
+        }
+        drf = renderers.JSONRenderer()
+        assert drf.render(page) == json_codec.dumps_orjson(page)
+
+        self.stdout.write(f"/bookings/ page, {opts['page_size']} items ({len(drf.render(page))} bytes)")
+        for label, fn in (
+            ("  drf JSONRenderer (stdlib)", lambda: drf.render(page)),
+            ("  json_codec (orjson)", lambda: json_codec.dumps_orjson(page)),
+        ):
+            self.stdout.write(format_stats(label, measure(fn, iterations=opts["iterations"])))
+
+        # export: the old line encoder on formatted rows vs orjson on the raw values() rows
+        export_rows = rows[: opts["export_rows"]]
+        encode = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False).encode
+
+        def export_stdlib():
+            return "".join(encode(booking_list_row(row)) + "\n" for row in export_rows).encode()
+
+        def export_orjson():
+            dumps = json_codec.encoder()
+            return b"".join(dumps(row) + b"\n" for row in export_rows)
+
+        assert export_stdlib() == export_orjson()
+        iterations = max(1, opts["iterations"] // 40)
+        self.stdout.write(f"\nNDJSON export, {len(export_rows)} rows")
+        for label, fn in (
+            ("  booking_list_row + json (old)", export_stdlib),
+            ("  raw rows + json_codec (orjson)", export_orjson),
+        ):
+            stats = measure(fn, iterations=iterations, warmup=1)
+            rate = len(export_rows) / (stats["mean_ms"] / 1000)
+            self.stdout.write(f"{format_stats(label, stats)}  {rate:,.0f} rows/s")
+
+
+def _rows(size: int) -> list[dict]:
+    """values(*BOOKING_LIST_FIELDS)-shaped rows."""
+    now = timezone.now()
+    resource_id, user_id = uuid.uuid4(), uuid.uuid4()
+    return [
+        {
+            "id": uuid.uuid4(),
+            "resource_id": resource_id,
+            "user_id": user_id,
+            "start_at": now + timedelta(hours=i),
+            "end_at": now + timedelta(hours=i, minutes=30),
+            "status": BookingStatus.ACTIVE.value,
+            "created_at": now,
+        }
+        for i in range(size)
+    ]
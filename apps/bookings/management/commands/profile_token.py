@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from common.profiling import TOKEN_HEADER, sign_profile_token
+
+
+class Command(BaseCommand):
+    help = "Prints an X-Profile-Token header that profiles requests to one path (PROFILING_DIR must be set)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--path", required=True, help="exact request path, e.g. /bookings/")
+        parser.add_argument("--ttl", type=int, default=300, help="seconds the token stays valid")
+
+    def handle(self, *args, **opts):
+        self.stdout.write(f"{TOKEN_HEADER}: {sign_profile_token(opts['path'], ttl=opts['ttl'])}")
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.bookings.models import IdempotencyKey
+from common.db import delete_in_batches
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete expired Idempotency-Key records in small batches (short transactions, "
+        "no long table locks). Run from cron, e.g. hourly."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args, **opts):
+        expired = IdempotencyKey.objects.filter(expires_at__lte=timezone.now())
+        total = delete_in_batches(expired, batch_size=opts["batch_size"])
+        self.stdout.write(f"deleted {total} expired idempotency keys")
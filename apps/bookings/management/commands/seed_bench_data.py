@@ -0,0 +1,132 @@
+import random
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.resources.models import Resource
+from apps.bookings.models import Booking, BookingStatus
+
+User = get_user_model()
+
+OWNER_EMAIL = "bench-owner-{}@bench.local"
+ROOM_PREFIX = "bench-room-"
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed synthetic owners/resources/bookings for the bench_* commands. "
+        "Each resource gets non-overlapping 1h bookings every 2h, centered on now. "
+        "Uses generate_series on Postgres (tens of millions of rows are fine), "
+        "bulk_create elsewhere (keep it small)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--owners", type=int, default=100)
+        parser.add_argument("--resources", type=int, default=50_000)
+        parser.add_argument("--bookings-per-resource", type=int, default=400)
+        parser.add_argument("--cancelled-ratio", type=float, default=0.1)
+        parser.add_argument("--batch-resources", type=int, default=1_000)
+        parser.add_argument("--reset", action="store_true", help="delete previously seeded bench data first")
+
+    def handle(self, *args, **opts):
+        bench_owners = User.objects.filter(email__endswith="@bench.local")
+        if bench_owners.exists():
+            if not opts["reset"]:
+                raise CommandError("Bench data already exists; pass --reset to recreate it.")
+            self.stdout.write("Deleting previous bench data...")
+            bench_owners.delete()
+
+        owners = [
+            User(email=OWNER_EMAIL.format(i), full_name=f"Bench Owner {i}", password="!")
+            for i in range(opts["owners"])
+        ]
+        User.objects.bulk_create(owners)
+        owner_ids = [u.id for u in owners]
+
+        if connection.vendor == "postgresql":
+            self._seed_postgres(owner_ids, opts)
+        else:
+            self._seed_orm(owner_ids, opts)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Seeded {opts['resources']} resources x {opts['bookings_per_resource']} bookings."
+        ))
+
+    def _seed_postgres(self, owner_ids, opts):
+        per = opts["bookings_per_resource"]
+        t0 = timezone.now().replace(minute=0, second=0, microsecond=0) - timedelta(hours=per)
+
+        with connection.cursor() as cur:
+            cur.execute(
+                f"""
+                INSERT INTO resources_resource (id, name, owner_id, created_at)
+                SELECT gen_random_uuid(),
+                       '{ROOM_PREFIX}' || lpad(g::text, 7, '0'),
+                       (%s::uuid[])[1 + (g %% %s)],
+                       now() - g * interval '1 second'
+                FROM generate_series(1, %s) AS g
+                """,
+                [owner_ids, len(owner_ids), opts["resources"]],
+            )
+
+            batch = opts["batch_resources"]
+            for offset in range(0, opts["resources"], batch):
+                with transaction.atomic():
+                    cur.execute(
+                        f"""
+                        INSERT INTO bookings_booking
+                            (id, resource_id, user_id, start_at, end_at, status, created_at, cancelled_at)
+                        SELECT gen_random_uuid(), r.id, r.owner_id,
+                               s.start_at, s.start_at + interval '1 hour',
+                               CASE WHEN f.cancelled THEN 'cancelled' ELSE 'active' END,
+                               now(),
+                               CASE WHEN f.cancelled THEN now() END
+                        FROM (
+                            SELECT id, owner_id, row_number() OVER (ORDER BY name) AS rn
+                            FROM resources_resource
+                            WHERE name LIKE '{ROOM_PREFIX}%%'
+                            ORDER BY name OFFSET %s LIMIT %s
+                        ) AS r
+                        CROSS JOIN generate_series(0, %s - 1) AS g
+                        CROSS JOIN LATERAL (
+                            SELECT %s::timestamptz + g * interval '2 hours'
+                                   + (r.rn %% 4) * interval '30 minutes' AS start_at
+                        ) AS s
+                        -- correlated on g so random() runs once per row
+                        CROSS JOIN LATERAL (SELECT random() < %s AS cancelled WHERE g IS NOT NULL) AS f
+                        """,
+                        [offset, batch, per, t0, opts["cancelled_ratio"]],
+                    )
+                self.stdout.write(f"  bookings for resources {offset}..{offset + batch}")
+
+            cur.execute("ANALYZE resources_resource")
+            cur.execute("ANALYZE bookings_booking")
+
+    def _seed_orm(self, owner_ids, opts):
+        per = opts["bookings_per_resource"]
+        now = timezone.now().replace(minute=0, second=0, microsecond=0)
+        t0 = now - timedelta(hours=per)
+
+        resources = [
+            Resource(name=f"{ROOM_PREFIX}{i:07d}", owner_id=owner_ids[i % len(owner_ids)])
+            for i in range(1, opts["resources"] + 1)
+        ]
+        Resource.objects.bulk_create(resources, batch_size=1_000)
+
+        for rn, resource in enumerate(resources, start=1):
+            bookings = []
+            for g in range(per):
+                start_at = t0 + timedelta(hours=2 * g, minutes=30 * (rn % 4))
+                cancelled = random.random() < opts["cancelled_ratio"]
+                bookings.append(Booking(
+                    resource_id=resource.id,
+                    user_id=resource.owner_id,
+                    start_at=start_at,
+                    end_at=start_at + timedelta(hours=1),
+                    status=BookingStatus.CANCELLED if cancelled else BookingStatus.ACTIVE,
+                    cancelled_at=now if cancelled else None,
+                ))
+            Booking.objects.bulk_create(bookings, batch_size=1_000)
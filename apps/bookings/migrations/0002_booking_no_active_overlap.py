@@ -0,0 +1,41 @@
+from django.db import migrations
+
+
+CONSTRAINT_NAME = "bookings_no_active_overlap"
+
+
+def add_exclusion_constraint(apps, schema_editor):
+    # tstzrange + GiST exclusion is Postgres-only; other backends keep using the lock engine
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+    schema_editor.execute(
+        f"""
+        ALTER TABLE bookings_booking
+        ADD CONSTRAINT {CONSTRAINT_NAME}
+        EXCLUDE USING gist (
+            resource_id WITH =,
+            tstzrange(start_at, end_at, '[)') WITH &&
+        )
+        WHERE (status = 'active')
+        """
+    )
+
+
+def drop_exclusion_constraint(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(
+        f"ALTER TABLE bookings_booking DROP CONSTRAINT IF EXISTS {CONSTRAINT_NAME}"
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookings', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_exclusion_constraint, drop_exclusion_constraint),
+    ]
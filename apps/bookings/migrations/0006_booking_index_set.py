@@ -0,0 +1,92 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class AddIndexConcurrently(migrations.AddIndex):
+    """CREATE INDEX CONCURRENTLY on Postgres (bookings stays writable), plain AddIndex elsewhere."""
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor != "postgresql":
+            return super().database_forwards(app_label, schema_editor, from_state, to_state)
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            schema_editor.add_index(model, self.index, concurrently=True)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor != "postgresql":
+            return super().database_backwards(app_label, schema_editor, from_state, to_state)
+        model = from_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            schema_editor.remove_index(model, self.index, concurrently=True)
+
+
+class RemoveIndexConcurrently(migrations.RemoveIndex):
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor != "postgresql":
+            return super().database_forwards(app_label, schema_editor, from_state, to_state)
+        model = from_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            index = from_state.models[app_label, self.model_name_lower].get_index_by_name(self.name)
+            schema_editor.remove_index(model, index, concurrently=True)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor != "postgresql":
+            return super().database_backwards(app_label, schema_editor, from_state, to_state)
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            index = to_state.models[app_label, self.model_name_lower].get_index_by_name(self.name)
+            schema_editor.add_index(model, index, concurrently=True)
+
+
+class Migration(migrations.Migration):
+    # CONCURRENTLY can't run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('bookings', '0005_bookingarchive'),
+        ('resources', '0003_resource_versions'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    # new indexes first, so the hot queries are never without one
+    operations = [
+        AddIndexConcurrently(
+            model_name='booking',
+            index=models.Index(condition=models.Q(('status', 'active')), fields=['resource', 'start_at'], include=('end_at',), name='booking_active_overlap_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='booking',
+            index=models.Index(fields=['start_at', 'created_at', 'id'], include=('resource', 'user', 'end_at', 'status'), name='booking_list_covering_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='booking',
+            index=models.Index(fields=['resource', 'start_at', 'created_at', 'id'], name='booking_resource_list_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='booking',
+            index=models.Index(fields=['user', 'start_at', 'created_at', 'id'], name='booking_user_list_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='booking',
+            index=models.Index(fields=['-created_at'], name='booking_created_at_idx'),
+        ),
+        RemoveIndexConcurrently(
+            model_name='booking',
+            name='bookings_bo_resourc_c6896f_idx',
+        ),
+        RemoveIndexConcurrently(
+            model_name='booking',
+            name='booking_list_keyset_idx',
+        ),
+        migrations.AlterField(
+            model_name='booking',
+            name='resource',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='bookings', to='resources.resource'),
+        ),
+        migrations.AlterField(
+            model_name='booking',
+            name='user',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='bookings', to=settings.AUTH_USER_MODEL),
+        ),
+    ]
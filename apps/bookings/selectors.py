@@ -1,41 +1,43 @@
 from django.db.models import QuerySet
-from django.utils.dateparse import parse_datetime
 
+from common.dates import parse_dt
+from common.db_routing import read_db
 from common.exceptions import ValidationError
-from .models import Booking, BookingStatus
-from datetime import datetime
+from common.ids import parse_uuid
+from .models import Booking, BookingArchive, BookingStatus
+from datetime import datetime, timedelta
 
 
-def _parse_dt(value: str, field_name: str):
-    if not value:
-        return None
-    dt = parse_datetime(value)
-    if dt is None:
-        raise ValidationError(
-            "Invalid datetime format",
-            details={field_name: "Use ISO format, e.g. 2026-02-09T10:00:00Z"},
-        )
-    return dt
+AVAILABILITY_MAX_WINDOW = timedelta(days=31)
+# list order; "id" makes the key unique so it doubles as the keyset cursor key
+BOOKING_LIST_ORDERING = ("start_at", "created_at", "id")
 
 
 def list_bookings(
     *,
     resource_id: str | None = None,
+    user_id: str | None = None,
     date_from: str | None = None,
     date_to: str | None = None,
     status: str | None = None,
+    archived: bool = False,
 ) -> QuerySet:
     """
     All read/query logic lives here (selector pattern).
     Returned queryset is composable and easy to test.
+    Served by a read replica when one is configured (common.db_routing).
+    archived=True reads BookingArchive (bookings moved out by `archive_bookings`) instead.
     """
-    qs = Booking.objects.select_related("resource", "user").all()
+    model = BookingArchive if archived else Booking
+    qs = model.objects.using(read_db()).all()
 
     if resource_id:
-        qs = qs.filter(resource_id=resource_id)
+        qs = qs.filter(resource_id=parse_uuid(resource_id, "resource"))
+    if user_id:
+        qs = qs.filter(user_id=parse_uuid(user_id, "user"))
 
-    df = _parse_dt(date_from, "date_from")
-    dt = _parse_dt(date_to, "date_to")
+    df = parse_dt(date_from, "date_from")
+    dt = parse_dt(date_to, "date_to")
 
     if df and dt and df > dt:
         raise ValidationError("date_from must be <= date_to")
@@ -52,14 +54,15 @@ def list_bookings(
             raise ValidationError("Invalid status", details={"status": "active|cancelled"})
         qs = qs.filter(status=status)
 
-    return qs.order_by("start_at", "created_at")
+    return qs.order_by(*BOOKING_LIST_ORDERING)
 
 
 def has_overlap(*, resource_id: str, start_at: datetime, end_at: datetime) -> bool:
     """
     Overlap exists if:
       new_start < existing_end AND new_end > existing_start
-    Only checks ACTIVE bookings.
+    Only checks ACTIVE bookings. Archived bookings all ended in the past and
+    new bookings can't start in the past, so the hot table is enough.
     """
     return Booking.objects.filter(
         resource_id=resource_id,
@@ -67,3 +70,52 @@ def has_overlap(*, resource_id: str, start_at: datetime, end_at: datetime) -> bo
         start_at__lt=end_at,
         end_at__gt=start_at,
     ).exists()
+
+
+def list_free_slots(
+    *,
+    resource_id: str,
+    date_from: str | None,
+    date_to: str | None,
+    min_duration: timedelta,
+) -> list[tuple[datetime, datetime]]:
+    """
+    Free gaps of a resource inside [date_from, date_to).
+
+    One narrow query (served by the (resource, status, start_at, end_at) index)
+    fetches the ACTIVE intervals ordered by start; a single sweep merges them
+    and emits the gaps that are at least `min_duration` long.
+    """
+    df = parse_dt(date_from, "from")
+    dt = parse_dt(date_to, "to")
+    if not df or not dt:
+        raise ValidationError("from and to are required", details={"from": date_from, "to": date_to})
+    if df >= dt:
+        raise ValidationError("from must be < to")
+    if dt - df > AVAILABILITY_MAX_WINDOW:
+        raise ValidationError(
+            "Time range is too large",
+            details={"max_days": AVAILABILITY_MAX_WINDOW.days},
+        )
+
+    busy = (
+        Booking.objects.filter(
+            resource_id=resource_id,
+            status=BookingStatus.ACTIVE,
+            start_at__lt=dt,
+            end_at__gt=df,
+        )
+        .order_by("start_at")
+        .values_list("start_at", "end_at")
+    )
+
+    slots = []
+    cursor = df
+    for start_at, end_at in busy:
+        if start_at - cursor >= min_duration:
+            slots.append((cursor, start_at))
+        if end_at > cursor:
+            cursor = end_at
+    if dt - cursor >= min_duration:
+        slots.append((cursor, dt))
+    return slots
@@ -1,10 +1,14 @@
 from rest_framework import serializers
+
+from common.formatting import format_datetime
 from .models import Booking
+from .services import BULK_MAX_ITEMS
 
 
 class BookingListItemSerializer(serializers.ModelSerializer):
-    resource_id = serializers.UUIDField(source="resource.id", read_only=True)
-    user_id = serializers.UUIDField(source="user.id", read_only=True)
+    # FK columns directly: no related-object fetch per row
+    resource_id = serializers.UUIDField(read_only=True)
+    user_id = serializers.UUIDField(read_only=True)
 
     class Meta:
         model = Booking
@@ -19,7 +23,36 @@ class BookingListItemSerializer(serializers.ModelSerializer):
         ]
 
 
+# Projection fast path for lists: `.values(*BOOKING_LIST_FIELDS)` rows formatted by
+# booking_list_row() give exactly the JSON of BookingListItemSerializer, without
+# joins, model instances or per-field serializer dispatch.
+BOOKING_LIST_FIELDS = ("id", "resource_id", "user_id", "start_at", "end_at", "status", "created_at")
+
+
+def booking_list_row(row: dict) -> dict:
+    return {
+        "id": str(row["id"]),
+        "resource_id": str(row["resource_id"]),
+        "user_id": str(row["user_id"]),
+        "start_at": format_datetime(row["start_at"]),
+        "end_at": format_datetime(row["end_at"]),
+        "status": row["status"],
+        "created_at": format_datetime(row["created_at"]),
+    }
+
+
 class BookingCreateSerializer(serializers.Serializer):
     resource_id = serializers.UUIDField()
     start_at = serializers.DateTimeField()
     end_at = serializers.DateTimeField()
+
+
+class BookingBulkCreateSerializer(serializers.Serializer):
+    MODE_ALL_OR_NOTHING = "all_or_nothing"
+    MODE_BEST_EFFORT = "best_effort"
+
+    mode = serializers.ChoiceField(
+        choices=[MODE_ALL_OR_NOTHING, MODE_BEST_EFFORT],
+        default=MODE_ALL_OR_NOTHING,
+    )
+    bookings = BookingCreateSerializer(many=True, allow_empty=False, max_length=BULK_MAX_ITEMS)
@@ -1,27 +1,100 @@
+import logging
+import random
+import time
+from bisect import bisect_right, insort
 from datetime import timedelta
-from django.db import transaction
+from django.conf import settings
+from django.db import DatabaseError, IntegrityError, connection, transaction
+from django.db.models import F
 from django.utils import timezone
 
-from common.exceptions import ValidationError, BusinessRuleViolation, PermissionDenied
+from common.db import EXCLUSION_VIOLATION, LOCK_NOT_AVAILABLE, is_postgres, sqlstate
+from common.exceptions import AppError, ValidationError, BusinessRuleViolation, PermissionDenied, ResourceBusy
+from common.metrics import counter, histogram
+from common.responses import error_payload
+from apps.resources import occupancy, stats
 from apps.resources.models import Resource
-from .models import Booking, BookingStatus
+from .models import Booking, BookingArchive, BookingStatus
 from .selectors import has_overlap
 
+logger = logging.getLogger(__name__)
 
 MIN_DURATION = timedelta(minutes=15)
+BULK_MAX_ITEMS = 500
 
+# Overlap engines (settings.BOOKING_OVERLAP_ENGINE):
+# - "lock":       lock the Resource row, then run has_overlap (works everywhere)
+# - "constraint": rely on the Postgres exclusion constraint, no Resource lock (not even for the list ETag)
+OVERLAP_ENGINE_LOCK = "lock"
+OVERLAP_ENGINE_CONSTRAINT = "constraint"
 
-def create_booking(*, user, resource_id: str, start_at, end_at) -> Booking:
+# Resource lock policies of the "lock" engine (settings.BOOKING_LOCK_POLICY), Postgres only:
+# - "block":   wait for the lock as long as it takes
+# - "nowait":  FOR UPDATE NOWAIT, fail at once when another transaction holds it
+# - "timeout": wait at most BOOKING_LOCK_TIMEOUT_MS (SET LOCAL lock_timeout)
+# nowait/timeout retry BOOKING_LOCK_RETRIES times (jittered backoff), then raise ResourceBusy.
+LOCK_POLICY_BLOCK = "block"
+LOCK_POLICY_NOWAIT = "nowait"
+LOCK_POLICY_TIMEOUT = "timeout"
+
+BOOKING_CREATE_SECONDS = histogram("booking_create_seconds", "create_booking latency", ["engine"])
+BOOKING_CANCEL_SECONDS = histogram("booking_cancel_seconds", "cancel_booking latency")
+BOOKING_OVERLAP_REJECTIONS = counter(
+    "booking_overlap_rejections_total", "Bookings rejected for overlapping an active booking", ["source"]
+)
+# labelled per resource to find the hot rooms; only contended resources get a series
+BOOKING_LOCK_CONTENTION = counter(
+    "booking_lock_contention_total", "Resource lock not available (outcome: retried | rejected)",
+    ["resource_id", "outcome"],
+)
+
+
+def _overlap_engine() -> str:
+    engine = getattr(settings, "BOOKING_OVERLAP_ENGINE", OVERLAP_ENGINE_LOCK)
+    # exclusion constraint only exists on Postgres -> fallback to locking elsewhere
+    if engine == OVERLAP_ENGINE_CONSTRAINT and is_postgres():
+        return OVERLAP_ENGINE_CONSTRAINT
+    return OVERLAP_ENGINE_LOCK
+
+
+def _overlap_error(*, resource_id, start_at, end_at, source: str = "create") -> BusinessRuleViolation:
+    BOOKING_OVERLAP_REJECTIONS.inc(source=source)
+    return BusinessRuleViolation(
+        "This resource already has an active booking in the given time range.",
+        details={
+            "resource_id": str(resource_id),
+            "start_at": start_at.isoformat(),
+            "end_at": end_at.isoformat(),
+        },
+    )
+
+
+def _touch_bookings(resource_ids, *, after_commit: bool = False) -> None:
     """
-    Use-case:
-    - validate time
-    - prevent overlap
-    - create booking safely (transaction + locking)
+    Bump Resource.bookings_version (the ETag of GET /bookings/?resource=).
 
-    Race condition note:
-    We lock the Resource row so that two concurrent bookings for the same resource
-    can't both pass the overlap check at the same time.
+    Default: inside the writing transaction, after the booking rows are written and
+    before the rollups (stats.record_*, occupancy.refresh). The paths that lock the
+    Resource row anyway (lock engine, bulk, cancel, archive) take it ahead of the
+    ResourceDailyStats/ResourceOccupancy rows, so two writes of one resource (or a
+    write and rebuild_resource_stats) can't deadlock.
+
+    after_commit=True (constraint engine): one autocommit UPDATE once the insert has
+    committed, so the insert transaction never holds the Resource row. Until it runs,
+    a conditional GET may still answer 304 for the previous list (one statement).
     """
+    ids = list(resource_ids)
+
+    def bump():
+        Resource.objects.filter(id__in=ids).update(bookings_version=F("bookings_version") + 1)
+
+    if after_commit:
+        transaction.on_commit(bump)
+    else:
+        bump()
+
+
+def _validate_interval(*, start_at, end_at) -> None:
     if start_at >= end_at:
         raise ValidationError("start_at must be < end_at")
 
@@ -35,23 +108,86 @@ def create_booking(*, user, resource_id: str, start_at, end_at) -> Booking:
     if start_at < timezone.now():
         raise ValidationError("start_at cannot be in the past")
 
+
+def create_booking(*, user, resource_id: str, start_at, end_at) -> Booking:
+    """
+    Use-case:
+    - validate time
+    - prevent overlap
+    - create booking safely (transaction + locking)
+
+    Race condition note:
+    "lock" engine: we lock the Resource row so that two concurrent bookings for the
+    same resource can't both pass the overlap check at the same time.
+    "constraint" engine (Postgres): the exclusion constraint rejects the second
+    insert instead, so bookings of one resource are not serialized.
+    """
+    engine = _overlap_engine()
+    with BOOKING_CREATE_SECONDS.time(engine=engine):
+        _validate_interval(start_at=start_at, end_at=end_at)
+
+        if engine == OVERLAP_ENGINE_CONSTRAINT:
+            return _create_with_exclusion_constraint(
+                user=user, resource_id=resource_id, start_at=start_at, end_at=end_at
+            )
+        return _create_with_resource_lock(
+            user=user, resource_id=resource_id, start_at=start_at, end_at=end_at
+        )
+
+
+def _lock_policy() -> str:
+    policy = getattr(settings, "BOOKING_LOCK_POLICY", LOCK_POLICY_BLOCK)
+    return policy if policy in (LOCK_POLICY_NOWAIT, LOCK_POLICY_TIMEOUT) else LOCK_POLICY_BLOCK
+
+
+def _lock_resource(resource_id: str, *, policy: str) -> Resource:
+    """SELECT ... FOR UPDATE of the resource row; must run inside the transaction."""
+    qs = Resource.objects.only("id")
+    if is_postgres() and policy == LOCK_POLICY_NOWAIT:
+        return qs.select_for_update(nowait=True).get(id=resource_id)
+    if is_postgres() and policy == LOCK_POLICY_TIMEOUT:
+        # SET LOCAL (is_local=true): scoped to the transaction, also bounds the statements that follow
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT set_config('lock_timeout', %s, true)", [f"{int(settings.BOOKING_LOCK_TIMEOUT_MS)}ms"])
+    return qs.select_for_update().get(id=resource_id)
+
+
+def _lock_backoff(attempt: int) -> float:
+    # "full jitter": uniform(0, base * 2^attempt) spreads the retries of a thundering herd
+    base = getattr(settings, "BOOKING_LOCK_RETRY_BACKOFF_MS", 50) / 1000
+    return random.uniform(0, base * 2 ** attempt)
+
+
+def _create_with_resource_lock(*, user, resource_id: str, start_at, end_at) -> Booking:
+    policy = _lock_policy()
+    retries = getattr(settings, "BOOKING_LOCK_RETRIES", 2) if policy != LOCK_POLICY_BLOCK else 0
+
+    for attempt in range(retries + 1):
+        try:
+            return _create_locked(user=user, resource_id=resource_id, start_at=start_at, end_at=end_at, policy=policy)
+        except DatabaseError as e:
+            if sqlstate(e) != LOCK_NOT_AVAILABLE:
+                raise
+            if attempt == retries:
+                BOOKING_LOCK_CONTENTION.inc(resource_id=str(resource_id), outcome="rejected")
+                logger.warning("resource %s busy: lock not available after %d attempts", resource_id, attempt + 1)
+                raise ResourceBusy(
+                    "This resource is being booked by another request, retry shortly.",
+                    details={"resource_id": str(resource_id)},
+                    retry_after=getattr(settings, "BOOKING_LOCK_RETRY_AFTER", 1),
+                    status=getattr(settings, "BOOKING_LOCK_BUSY_STATUS", 409),
+                )
+            BOOKING_LOCK_CONTENTION.inc(resource_id=str(resource_id), outcome="retried")
+            time.sleep(_lock_backoff(attempt))
+
+
+def _create_locked(*, user, resource_id: str, start_at, end_at, policy: str) -> Booking:
     with transaction.atomic():
         # 🔒 Lock resource row (per-resource serialization)
-        resource = (
-            Resource.objects.select_for_update()
-            .only("id")
-            .get(id=resource_id)
-        )
+        resource = _lock_resource(resource_id, policy=policy)
 
         if has_overlap(resource_id=str(resource.id), start_at=start_at, end_at=end_at):
-            raise BusinessRuleViolation(
-                "This resource already has an active booking in the given time range.",
-                details={
-                    "resource_id": str(resource.id),
-                    "start_at": start_at.isoformat(),
-                    "end_at": end_at.isoformat(),
-                },
-            )
+            raise _overlap_error(resource_id=resource.id, start_at=start_at, end_at=end_at)
 
         booking = Booking.objects.create(
             resource_id=resource.id,
@@ -60,10 +196,163 @@ def create_booking(*, user, resource_id: str, start_at, end_at) -> Booking:
             end_at=end_at,
             status=BookingStatus.ACTIVE,
         )
+        _touch_bookings([resource.id])
+        stats.record_created([booking])
+        occupancy.refresh([booking])
 
     return booking
 
 
+def _create_with_exclusion_constraint(*, user, resource_id: str, start_at, end_at) -> Booking:
+    """
+    Postgres-only path: the `bookings_no_active_overlap` exclusion constraint
+    (see migration 0002) guarantees no two ACTIVE bookings of a resource overlap.
+    No Resource row lock (the list ETag is bumped after commit) -> non-overlapping
+    inserts on one resource run concurrently; only inserts touching the same day
+    queue on that day's rollup rows until commit.
+    """
+    # plain (non-locking) lookup keeps the "unknown resource" behaviour of the lock path
+    resource = Resource.objects.only("id").get(id=resource_id)
+
+    try:
+        with transaction.atomic():
+            booking = Booking.objects.create(
+                resource_id=resource.id,
+                user=user,
+                start_at=start_at,
+                end_at=end_at,
+                status=BookingStatus.ACTIVE,
+            )
+            stats.record_created([booking])  # commutative deltas: no read, no lost update
+            occupancy.refresh([booking], lock_days=True)
+            _touch_bookings([resource.id], after_commit=True)
+    except IntegrityError as e:
+        if sqlstate(e) == EXCLUSION_VIOLATION:
+            raise _overlap_error(resource_id=resource.id, start_at=start_at, end_at=end_at)
+        raise
+
+    return booking
+
+
+def create_bookings_bulk(*, user, items: list[dict], all_or_nothing: bool = True) -> list[dict]:
+    """
+    Bulk use-case (partner calendar imports):
+    - validate every item up front
+    - lock each affected resource once (single query, stable order -> no deadlocks)
+    - one interval query per resource finds conflicts with the DB,
+      a sorted sweep finds conflicts inside the batch (earlier items win)
+    - bulk_create the survivors
+
+    Returns one result per item, in input order:
+      {"index": i, "booking": Booking} or {"index": i, "error": AppError}
+
+    all_or_nothing=True: any failed item -> BusinessRuleViolation, nothing is created.
+    """
+    results: list[dict | None] = [None] * len(items)
+    by_resource: dict[str, list] = {}
+
+    for index, item in enumerate(items):
+        try:
+            _validate_interval(start_at=item["start_at"], end_at=item["end_at"])
+        except AppError as e:
+            results[index] = {"index": index, "error": e}
+            continue
+        by_resource.setdefault(str(item["resource_id"]), []).append(
+            (index, item["start_at"], item["end_at"])
+        )
+
+    with transaction.atomic():
+        locked = {}
+        if by_resource:
+            # 🔒 one lock statement for all resources of the batch
+            locked = {
+                str(r.id): r
+                for r in Resource.objects.select_for_update()
+                .filter(id__in=list(by_resource))
+                .only("id")
+                .order_by("id")
+            }
+
+        to_create = []
+        for resource_id, batch in by_resource.items():
+            resource = locked.get(resource_id)
+            if resource is None:
+                for index, _, _ in batch:
+                    results[index] = {
+                        "index": index,
+                        "error": ValidationError("Resource not found", details={"resource_id": resource_id}),
+                    }
+                continue
+
+            for index, start_at, end_at in _sweep_batch(resource_id=resource_id, batch=batch, results=results):
+                booking = Booking(
+                    resource=resource,
+                    user=user,
+                    start_at=start_at,
+                    end_at=end_at,
+                    status=BookingStatus.ACTIVE,
+                )
+                to_create.append(booking)
+                results[index] = {"index": index, "booking": booking}
+
+        failed = [r for r in results if "error" in r]
+        if all_or_nothing and failed:
+            raise BusinessRuleViolation(
+                f"Bulk booking rejected: {len(failed)} item(s) failed.",
+                details={"errors": [{"index": r["index"], **error_payload(r["error"])} for r in failed]},
+            )
+
+        Booking.objects.bulk_create(to_create)
+        if to_create:
+            _touch_bookings({booking.resource_id for booking in to_create})
+            stats.record_created(to_create)
+            occupancy.refresh(to_create)
+
+    return results
+
+
+def _sweep_batch(*, resource_id: str, batch: list, results: list) -> list:
+    """
+    Accept batch items (in input order) that don't overlap an ACTIVE booking
+    or an already accepted item. Rejected items are written into `results`.
+
+    Active bookings never overlap each other, so `starts`/`ends` are both sorted
+    and the only candidate for a conflict with [s, e) is the first interval whose
+    end is > s (binary search instead of pairwise comparison).
+    """
+    lo = min(start_at for _, start_at, _ in batch)
+    hi = max(end_at for _, _, end_at in batch)
+    existing = (
+        Booking.objects.filter(
+            resource_id=resource_id,
+            status=BookingStatus.ACTIVE,
+            start_at__lt=hi,
+            end_at__gt=lo,
+        )
+        .order_by("start_at")
+        .values_list("start_at", "end_at")
+    )
+    starts, ends = [], []
+    for start_at, end_at in existing:
+        starts.append(start_at)
+        ends.append(end_at)
+
+    accepted = []
+    for index, start_at, end_at in batch:
+        j = bisect_right(ends, start_at)
+        if j < len(starts) and starts[j] < end_at:
+            results[index] = {
+                "index": index,
+                "error": _overlap_error(resource_id=resource_id, start_at=start_at, end_at=end_at, source="bulk"),
+            }
+            continue
+        insort(starts, start_at)
+        insort(ends, end_at)
+        accepted.append((index, start_at, end_at))
+
+    return accepted
+
+
 def cancel_booking(*, user, booking_id: str) -> Booking:
     """
     Cancel use-case:
@@ -71,7 +360,7 @@ def cancel_booking(*, user, booking_id: str) -> Booking:
     - permission: owner or admin
     - state: only active can be cancelled
     """
-    with transaction.atomic():
+    with BOOKING_CANCEL_SECONDS.time(), transaction.atomic():
         booking = (
             Booking.objects.select_for_update()
             .select_related("user")
@@ -90,6 +379,66 @@ def cancel_booking(*, user, booking_id: str) -> Booking:
         booking.status = BookingStatus.CANCELLED
         booking.cancelled_at = timezone.now()
         booking.save(update_fields=["status", "cancelled_at"])
+        _touch_bookings([booking.resource_id])  # resource lock before the rollup rows
+        stats.record_cancelled(booking)
+        occupancy.refresh([booking])
 
     return booking
 
+
+def archive_bookings(*, before, batch_size: int = 5000) -> int:
+    """
+    Move one batch of bookings that ended before `before` (any status) into
+    BookingArchive, oldest first; returns the number of rows moved (0 = done).
+    One short transaction per batch; the affected resources' list ETags are bumped.
+    """
+    with transaction.atomic():
+        if is_postgres():
+            resource_ids = _archive_batch_postgres(before=before, batch_size=batch_size)
+        else:
+            resource_ids = _archive_batch_orm(before=before, batch_size=batch_size)
+        if resource_ids:
+            _touch_bookings(set(resource_ids))
+    return len(resource_ids)
+
+
+def _archive_batch_postgres(*, before, batch_size: int) -> list:
+    # start_at < end_at < before: the (start_at, created_at, id) list index finds the batch
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            WITH moved AS (
+                DELETE FROM bookings_booking
+                WHERE id IN (
+                    SELECT id FROM bookings_booking
+                    WHERE start_at < %s AND end_at < %s
+                    ORDER BY start_at
+                    LIMIT %s
+                    FOR UPDATE SKIP LOCKED
+                )
+                RETURNING id, resource_id, user_id, start_at, end_at, status, created_at, cancelled_at
+            )
+            INSERT INTO bookings_bookingarchive
+                (id, resource_id, user_id, start_at, end_at, status, created_at, cancelled_at, archived_at)
+            SELECT id, resource_id, user_id, start_at, end_at, status, created_at, cancelled_at, now()
+            FROM moved
+            RETURNING resource_id
+            """,
+            [before, before, batch_size],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def _archive_batch_orm(*, before, batch_size: int) -> list:
+    rows = list(
+        Booking.objects.select_for_update()
+        .filter(start_at__lt=before, end_at__lt=before)
+        .order_by("start_at")
+        .values("id", "resource_id", "user_id", "start_at", "end_at", "status", "created_at", "cancelled_at")
+        [:batch_size]
+    )
+    if not rows:
+        return []
+    BookingArchive.objects.bulk_create([BookingArchive(**row) for row in rows])
+    Booking.objects.filter(id__in=[row["id"] for row in rows]).delete()
+    return [row["resource_id"] for row in rows]
@@ -0,0 +1,71 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from apps.bookings.models import Booking, BookingArchive, BookingStatus
+from apps.resources.models import Resource
+
+User = get_user_model()
+
+
+class ArchiveBookingsTests(APITestCase):
+    def setUp(self):
+        self.client.post("/auth/register/", {"email": "a@a.com", "password": "StrongPass123", "full_name": "A"}, format="json")
+        login = self.client.post("/auth/login/", {"email": "a@a.com", "password": "StrongPass123"}, format="json")
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {login.data['access_token']}")
+        self.user = User.objects.get(email="a@a.com")
+        self.room = Resource.objects.create(name="Room A", owner=self.user)
+
+        now = timezone.now()
+        self.old = [
+            self._booking(now - timedelta(days=200 - i), status)
+            for i, status in enumerate([BookingStatus.ACTIVE, BookingStatus.CANCELLED, BookingStatus.ACTIVE])
+        ]
+        self.recent = self._booking(now - timedelta(days=10), BookingStatus.ACTIVE)
+        self.future = self._booking(now + timedelta(days=1), BookingStatus.ACTIVE)
+
+    def _booking(self, start, status):
+        return Booking.objects.create(
+            resource=self.room, user=self.user, start_at=start, end_at=start + timedelta(hours=1), status=status,
+        )
+
+    def _archive(self, **opts):
+        out = StringIO()
+        call_command("archive_bookings", older_than_days=90, stdout=out, **opts)
+        return out.getvalue()
+
+    def test_moves_old_rows_in_batches(self):
+        version = self.room.bookings_version
+        out = self._archive(batch_size=2)
+
+        self.assertIn("Archived 3 bookings", out)
+        self.assertIn("in 2 batches", out)
+        self.assertEqual(set(Booking.objects.values_list("id", flat=True)), {self.recent.id, self.future.id})
+
+        archived = {a.id: a for a in BookingArchive.objects.all()}
+        self.assertEqual(set(archived), {b.id for b in self.old})
+        self.assertEqual(archived[self.old[1].id].status, BookingStatus.CANCELLED)
+        self.assertEqual(archived[self.old[0].id].created_at, self.old[0].created_at)
+
+        self.room.refresh_from_db()
+        self.assertGreater(self.room.bookings_version, version)  # list ETags change
+        self.assertIn("Archived 0 bookings", self._archive())
+
+    def test_list_reads_either_table(self):
+        self._archive()
+        hot = self.client.get("/bookings/")
+        cold = self.client.get("/bookings/?archived=true")
+        self.assertEqual([r["id"] for r in hot.data["results"]], [str(self.recent.id), str(self.future.id)])
+        self.assertEqual([r["id"] for r in cold.data["results"]], [str(b.id) for b in self.old])
+        self.assertEqual(cold.data["results"][0]["resource_id"], str(self.room.id))
+        self.assertEqual(cold.data["results"][1]["status"], "cancelled")
+
+    def test_export_archived(self):
+        self._archive()
+        res = self.client.get("/bookings/export/?archived=1")
+        lines = b"".join(res.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 3)
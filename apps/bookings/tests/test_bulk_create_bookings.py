@@ -0,0 +1,105 @@
+import uuid
+from datetime import timedelta
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from django.contrib.auth import get_user_model
+
+from apps.resources.models import Resource
+from apps.bookings.models import Booking, BookingStatus
+from apps.bookings.services import create_bookings_bulk
+
+User = get_user_model()
+
+
+class BookingBulkCreateTests(APITestCase):
+    def setUp(self):
+        self.client.post("/auth/register/", {"email": "a@a.com", "password": "StrongPass123", "full_name": "A"}, format="json")
+        login = self.client.post("/auth/login/", {"email": "a@a.com", "password": "StrongPass123"}, format="json")
+        self.token = login.data["access_token"]
+
+        self.user = User.objects.get(email="a@a.com")
+        self.room_a = Resource.objects.create(name="Room A", owner=self.user)
+        self.room_b = Resource.objects.create(name="Room B", owner=self.user)
+
+        self.base = timezone.now() + timedelta(days=1)
+        Booking.objects.create(
+            resource=self.room_a,
+            user=self.user,
+            start_at=self.base,
+            end_at=self.base + timedelta(hours=1),
+            status=BookingStatus.ACTIVE,
+        )
+
+    def _item(self, resource, start_h, end_h):
+        return {
+            "resource_id": str(resource.id),
+            "start_at": (self.base + timedelta(hours=start_h)).isoformat(),
+            "end_at": (self.base + timedelta(hours=end_h)).isoformat(),
+        }
+
+    def _post(self, payload):
+        return self.client.post(
+            "/bookings/bulk/", payload, format="json", HTTP_AUTHORIZATION=f"Bearer {self.token}"
+        )
+
+    def test_all_or_nothing_success(self):
+        res = self._post({"bookings": [
+            self._item(self.room_a, 1, 2),
+            self._item(self.room_a, 2, 3),
+            self._item(self.room_b, 0, 1),
+        ]})
+        self.assertEqual(res.status_code, 201)
+        self.assertEqual(res.data["created"], 3)
+        self.assertEqual(res.data["results"][2]["booking"]["resource_id"], str(self.room_b.id))
+        self.assertEqual(Booking.objects.count(), 4)
+
+    def test_all_or_nothing_conflict_creates_nothing(self):
+        res = self._post({"bookings": [
+            self._item(self.room_b, 0, 1),
+            self._item(self.room_a, 0.5, 1.5),  # overlaps existing booking
+        ]})
+        self.assertEqual(res.status_code, 400)
+        self.assertEqual(res.data["error"]["code"], "BUSINESS_RULE_VIOLATION")
+        self.assertEqual(res.data["error"]["details"]["errors"][0]["index"], 1)
+        self.assertEqual(Booking.objects.count(), 1)
+
+    def test_best_effort_reports_each_item(self):
+        res = self._post({"mode": "best_effort", "bookings": [
+            self._item(self.room_a, 0.5, 1.5),  # overlaps DB
+            self._item(self.room_a, 2, 3),
+            self._item(self.room_a, 2.5, 3.5),  # overlaps item 1 of the batch
+            {"resource_id": str(uuid.uuid4()), "start_at": self._item(self.room_a, 4, 5)["start_at"],
+             "end_at": self._item(self.room_a, 4, 5)["end_at"]},
+            self._item(self.room_b, 1, 1.1),  # too short
+        ]})
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.data["created"], 1)
+        self.assertEqual(
+            [r["status"] for r in res.data["results"]],
+            ["failed", "created", "failed", "failed", "failed"],
+        )
+        self.assertEqual(res.data["results"][0]["error"]["code"], "BUSINESS_RULE_VIOLATION")
+        self.assertEqual(res.data["results"][2]["error"]["code"], "BUSINESS_RULE_VIOLATION")
+        self.assertEqual(res.data["results"][3]["error"]["code"], "VALIDATION_ERROR")
+        self.assertEqual(res.data["results"][4]["error"]["code"], "VALIDATION_ERROR")
+        self.assertEqual(Booking.objects.count(), 2)
+
+    def test_one_overlap_query_per_resource(self):
+        items = [
+            {"resource_id": room.id,
+             "start_at": self.base + timedelta(hours=h),
+             "end_at": self.base + timedelta(hours=h, minutes=30)}
+            for room in (self.room_a, self.room_b)
+            for h in range(1, 11)
+        ]
+        # savepoint + lock + 2 interval queries + bulk insert + one bookings_version bump + stats upsert
+        # + one occupancy refresh (select + upsert) for both resources + release
+        with self.assertNumQueries(10):
+            results = create_bookings_bulk(user=self.user, items=items)
+        self.assertTrue(all("booking" in r for r in results))
+        self.assertEqual(Booking.objects.count(), 21)
+
+    def test_empty_list_rejected(self):
+        res = self._post({"bookings": []})
+        self.assertEqual(res.status_code, 400)
+        self.assertEqual(res.data["error"]["code"], "VALIDATION_ERROR")
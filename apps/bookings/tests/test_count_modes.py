@@ -0,0 +1,95 @@
+from datetime import timedelta
+from unittest import mock, skipUnless
+
+from django.db import connection
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from django.contrib.auth import get_user_model
+
+from apps.resources.models import Resource
+from apps.bookings.models import Booking, BookingStatus
+from common.pagination import ESTIMATE_CAP, _planner_rows
+
+User = get_user_model()
+
+
+class BookingCountModeTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="u@u.com", password="StrongPass123", full_name="U")
+        self.client.post("/auth/register/", {"email": "t@t.com", "password": "StrongPass123", "full_name": "T"}, format="json")
+        login = self.client.post("/auth/login/", {"email": "t@t.com", "password": "StrongPass123"}, format="json")
+        self.token = login.data["access_token"]
+
+        resource = Resource.objects.create(name="Room A", owner=self.user)
+        now = timezone.now()
+        for i in range(5):
+            Booking.objects.create(
+                resource=resource,
+                user=self.user,
+                start_at=now + timedelta(hours=i + 1),
+                end_at=now + timedelta(hours=i + 2),
+                status=BookingStatus.ACTIVE,
+            )
+
+    def _get(self, query):
+        return self.client.get(f"/bookings/?{query}", HTTP_AUTHORIZATION=f"Bearer {self.token}")
+
+    def test_exact_is_default(self):
+        res = self._get("page_size=2")
+        self.assertEqual(res.data["count"], 5)
+        self.assertEqual(res.data["total_pages"], 3)
+        self.assertNotIn("count_exact", res.data)
+
+    def test_none_skips_count(self):
+        # auth + one page query fetching page_size + 1 rows
+        with self.assertNumQueries(2):
+            res = self._get("page_size=2&page=2&count=none")
+        self.assertEqual(res.status_code, 200)
+        self.assertIsNone(res.data["count"])
+        self.assertTrue(res.data["has_next"])
+        self.assertEqual(len(res.data["results"]), 2)
+
+        res = self._get("page_size=2&page=3&count=none")
+        self.assertFalse(res.data["has_next"])
+        self.assertEqual(len(res.data["results"]), 1)
+
+    def test_estimate_below_cap_is_exact(self):
+        res = self._get("page_size=2&count=estimate")
+        self.assertEqual(res.data["count"], 5)
+        self.assertTrue(res.data["count_exact"])
+
+    def test_estimate_above_cap(self):
+        with mock.patch("common.pagination.ESTIMATE_CAP", 3):
+            res = self._get("page_size=2&count=estimate")
+        self.assertEqual(res.status_code, 200)
+        self.assertFalse(res.data["count_exact"])
+        self.assertGreaterEqual(res.data["count"], 4)
+
+    @skipUnless(connection.vendor == "postgresql", "planner estimates are read on Postgres")
+    def test_estimate_above_cap_uses_planner(self):
+        resource = Resource.objects.get(name="Room A")
+        start = timezone.now() + timedelta(days=30)
+        Booking.objects.bulk_create([
+            Booking(resource=resource, user=self.user, status=BookingStatus.ACTIVE,
+                    start_at=start + timedelta(hours=i), end_at=start + timedelta(hours=i, minutes=30))
+            for i in range(ESTIMATE_CAP)
+        ])
+        with connection.cursor() as cur:
+            cur.execute("ANALYZE bookings_booking")
+
+        res = self._get("page_size=2&count=estimate")
+        self.assertEqual(res.status_code, 200)
+        self.assertFalse(res.data["count_exact"])
+        self.assertGreater(res.data["count"], ESTIMATE_CAP)
+
+    def test_planner_rows_accepts_both_explain_shapes(self):
+        qs = Booking.objects.all()
+        plan = '{"Plan": {"Node Type": "Seq Scan", "Plan Rows": 1234}}'
+        for text in (plan, f"[{plan}]"):  # psycopg 3 / a driver returning the raw JSON text
+            with mock.patch.object(type(qs), "explain", return_value=text):
+                self.assertEqual(_planner_rows(qs), 1234)
+
+    def test_invalid_count_mode(self):
+        res = self._get("count=bogus")
+        self.assertEqual(res.status_code, 400)
+        self.assertEqual(res.data["error"]["code"], "VALIDATION_ERROR")
@@ -0,0 +1,67 @@
+from datetime import timedelta
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from django.contrib.auth import get_user_model
+
+from apps.resources.models import Resource
+from apps.bookings.models import Booking, BookingStatus
+
+User = get_user_model()
+
+
+class BookingCursorPaginationTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="u@u.com", password="StrongPass123", full_name="U")
+        self.client.post("/auth/register/", {"email": "t@t.com", "password": "StrongPass123", "full_name": "T"}, format="json")
+        login = self.client.post("/auth/login/", {"email": "t@t.com", "password": "StrongPass123"}, format="json")
+        self.token = login.data["access_token"]
+
+        self.resource = Resource.objects.create(name="Room A", owner=self.user)
+        now = timezone.now()
+        self.ids = []
+        for i in range(5):
+            # two bookings share start_at -> tie broken by created_at, id
+            start = now + timedelta(hours=1 + i // 2)
+            b = Booking.objects.create(
+                resource=self.resource,
+                user=self.user,
+                start_at=start,
+                end_at=start + timedelta(minutes=30),
+                status=BookingStatus.ACTIVE,
+            )
+            self.ids.append(str(b.id))
+
+    def _get(self, query):
+        return self.client.get(f"/bookings/?{query}", HTTP_AUTHORIZATION=f"Bearer {self.token}")
+
+    def test_cursor_pages_match_list_order(self):
+        seen, cursor = [], ""
+        while True:
+            res = self._get(f"page_size=2&cursor={cursor}")
+            self.assertEqual(res.status_code, 200)
+            self.assertNotIn("count", res.data)
+            seen += [row["id"] for row in res.data["results"]]
+            cursor = res.data["next_cursor"]
+            if not cursor:
+                break
+
+        offset_order = [row["id"] for row in self._get("page_size=50").data["results"]]
+        self.assertEqual(seen, offset_order)
+        self.assertEqual(sorted(seen), sorted(self.ids))
+
+    def test_cursor_mode_skips_count(self):
+        # auth + page query only (no COUNT)
+        with self.assertNumQueries(2):
+            res = self._get("page_size=2&cursor=")
+        self.assertEqual(res.status_code, 200)
+        self.assertIsNotNone(res.data["next_cursor"])
+
+    def test_resource_cursor_rejected_for_bookings(self):
+        Resource.objects.create(name="Room B", owner=self.user)
+        res = self.client.get("/resources/?page_size=1&cursor=", HTTP_AUTHORIZATION=f"Bearer {self.token}")
+        self.assertEqual(res.status_code, 200)
+        resource_cursor = res.data["next_cursor"]
+
+        res = self._get(f"page_size=2&cursor={resource_cursor}")
+        self.assertEqual(res.status_code, 400)
+        self.assertEqual(res.data["error"]["code"], "VALIDATION_ERROR")
@@ -0,0 +1,70 @@
+from unittest import mock
+
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from django.test import SimpleTestCase, override_settings
+
+from common import db_pool
+
+collected = []
+
+
+def collect_hook(sample):
+    collected.append(sample)
+
+
+class _FakePool:
+    def __init__(self, stats):
+        self.stats = stats
+
+    def pop_stats(self):
+        stats, self.stats = self.stats, {k: v for k, v in self.stats.items() if k.startswith("pool_")}
+        return stats
+
+
+@override_settings(DB_POOL_STATS_HOOKS=[f"{__name__}.collect_hook"], DB_POOL_STATS_INTERVAL=60)
+class PoolStatsTests(SimpleTestCase):
+    def setUp(self):
+        collected.clear()
+        db_pool._last_report = float("-inf")
+        pool = _FakePool({
+            "pool_min": 2, "pool_max": 4, "pool_size": 4, "pool_available": 1,
+            "requests_waiting": 2, "requests_num": 50, "requests_queued": 7,
+            "requests_wait_ms": 120, "requests_errors": 1,
+        })
+        patches = [
+            mock.patch.object(connection, "pool", pool, create=True),
+            mock.patch.object(db_pool, "pooled_aliases", return_value=["default"]),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def test_sample_reports_saturation_and_waits(self):
+        sample = db_pool.sample_pool("default")
+        self.assertEqual(sample["in_use"], 3)
+        self.assertEqual(sample["saturation"], 0.75)
+        self.assertEqual(sample["queued"], 7)
+        self.assertEqual(sample["wait_ms"], 120)
+        self.assertEqual(sample["timeouts"], 1)
+
+        # counters restart after each sample, gauges don't
+        sample = db_pool.sample_pool("default")
+        self.assertEqual(sample["queued"], 0)
+        self.assertEqual(sample["in_use"], 3)
+
+    def test_hooks_called_once_per_interval(self):
+        db_pool.maybe_report_pool_stats()
+        db_pool.maybe_report_pool_stats()
+        self.assertEqual(len(collected), 1)
+        self.assertEqual(collected[0]["alias"], "default")
+
+    def test_log_hook_warns_when_saturated(self):
+        with self.assertLogs("common.db_pool", level="WARNING"):
+            db_pool.log_pool_stats(db_pool.sample_pool("default"))
+
+
+class PoolStatsMiddlewareTests(SimpleTestCase):
+    def test_not_used_without_pool(self):
+        with self.assertRaises(MiddlewareNotUsed):
+            db_pool.PoolStatsMiddleware(lambda request: None)
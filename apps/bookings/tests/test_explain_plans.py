@@ -0,0 +1,113 @@
+import re
+import uuid
+from datetime import timedelta
+from unittest import skipUnless
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.bookings.models import Booking, BookingStatus
+from apps.bookings.selectors import BOOKING_LIST_ORDERING, list_bookings
+from apps.bookings.serializers import BOOKING_LIST_FIELDS
+from apps.resources.models import Resource
+from apps.resources.selectors import RESOURCE_LIST_ORDERING, list_resources
+from common.pagination import _keyset_queryset, encode_cursor
+
+User = get_user_model()
+
+
+@skipUnless(connection.vendor == "postgresql", "EXPLAIN plans are checked on Postgres")
+class SelectorPlanTests(TestCase):
+    """
+    Every hot selector must be served by an index under the default planner
+    settings: the seed is large enough (1000 resources, 40k bookings) that a seq
+    scan + sort loses to the index whenever one can serve the query.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        users = [User.objects.create_user(email=f"p{i}@p.com", password="x", full_name="P") for i in range(5)]
+        cls.user = users[0]
+        resources = Resource.objects.bulk_create(
+            [Resource(name=f"Room {i}", owner=users[i % 5]) for i in range(1000)]
+        )
+        cls.resource = resources[0]
+        t0 = timezone.now().replace(minute=0, second=0, microsecond=0) - timedelta(days=10)
+        Booking.objects.bulk_create([
+            Booking(
+                resource=r, user=users[(i + j) % 5],
+                start_at=t0 + timedelta(hours=2 * j), end_at=t0 + timedelta(hours=2 * j + 1),
+                status=BookingStatus.CANCELLED if j % 10 == 0 else BookingStatus.ACTIVE,
+            )
+            for i, r in enumerate(resources) for j in range(40)
+        ], batch_size=5000)
+        with connection.cursor() as cur:
+            cur.execute("ANALYZE bookings_booking")
+            cur.execute("ANALYZE resources_resource")
+
+    def assertIndexPlan(self, qs, index_name: str):
+        plan = qs.explain()
+        self.assertNotIn("Seq Scan", plan, plan)
+        self.assertNotRegex(plan, r"(?m)^\s*(->\s*)?(Incremental )?Sort\b", plan)
+        self.assertIn(index_name, plan, plan)
+
+    def assertIndexCond(self, qs, column: str):
+        """The keyset bound must start the index range scan, not just filter its rows."""
+        plan = qs.explain()
+        conds = re.findall(r"Index Cond: (.*)", plan)
+        self.assertTrue(any(column in cond for cond in conds), plan)
+
+    def _page(self, **filters):
+        return list_bookings(**filters).values(*BOOKING_LIST_FIELDS)[:51]
+
+    def test_list_page(self):
+        self.assertIndexPlan(self._page(), "booking_list_covering_idx")
+
+    def test_list_keyset_page(self):
+        now = timezone.now()
+        cursor = encode_cursor(ordering=BOOKING_LIST_ORDERING, values=[now, now, uuid.uuid4()])
+        qs = _keyset_queryset(
+            list_bookings().values(*BOOKING_LIST_FIELDS), ordering=BOOKING_LIST_ORDERING, cursor=cursor
+        )[:51]
+        self.assertIndexPlan(qs, "booking_list_covering_idx")
+        self.assertIndexCond(qs, "start_at")
+
+    def test_resource_keyset_page(self):
+        cursor = encode_cursor(ordering=RESOURCE_LIST_ORDERING, values=["Room 25", timezone.now(), uuid.uuid4()])
+        qs = _keyset_queryset(
+            list_resources(), ordering=RESOURCE_LIST_ORDERING, cursor=cursor
+        )[:21]
+        self.assertIndexPlan(qs, "resource_name_keyset_idx")
+        self.assertIndexCond(qs, "name")
+
+    def test_list_by_resource(self):
+        self.assertIndexPlan(self._page(resource_id=str(self.resource.id)), "booking_resource_list_idx")
+
+    def test_list_by_user(self):
+        self.assertIndexPlan(self._page(user_id=str(self.user.id)), "booking_user_list_idx")
+
+    def test_has_overlap(self):
+        start = timezone.now()
+        qs = Booking.objects.filter(
+            resource_id=self.resource.id, status=BookingStatus.ACTIVE,
+            start_at__lt=start + timedelta(hours=1), end_at__gt=start,
+        )
+        self.assertIndexPlan(qs.values("pk")[:1], "booking_active_overlap_idx")
+
+    def test_free_slots_busy_intervals(self):
+        start = timezone.now()
+        qs = (
+            Booking.objects.filter(
+                resource_id=self.resource.id, status=BookingStatus.ACTIVE,
+                start_at__lt=start + timedelta(days=7), end_at__gt=start,
+            )
+            .order_by("start_at")
+            .values_list("start_at", "end_at")
+        )
+        self.assertIndexPlan(qs, "booking_active_overlap_idx")
+
+    def test_admin_changelist(self):
+        qs = Booking.objects.filter(created_at__gte=timezone.now() - timedelta(days=1)).order_by("-created_at")[:100]
+        self.assertIndexPlan(qs, "booking_created_at_idx")
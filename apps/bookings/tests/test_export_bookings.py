@@ -0,0 +1,65 @@
+import csv
+import io
+import json
+from datetime import timedelta
+
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from django.contrib.auth import get_user_model
+
+from apps.resources.models import Resource
+from apps.bookings.models import Booking, BookingStatus
+
+User = get_user_model()
+
+
+class BookingExportTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="u@u.com", password="StrongPass123", full_name="U")
+        self.client.post("/auth/register/", {"email": "t@t.com", "password": "StrongPass123", "full_name": "T"}, format="json")
+        login = self.client.post("/auth/login/", {"email": "t@t.com", "password": "StrongPass123"}, format="json")
+        self.token = login.data["access_token"]
+
+        resource = Resource.objects.create(name="Room A", owner=self.user)
+        now = timezone.now()
+        for i in range(120):  # more than the 50 row page cap
+            Booking.objects.create(
+                resource=resource,
+                user=self.user,
+                start_at=now + timedelta(hours=i + 1),
+                end_at=now + timedelta(hours=i + 2),
+                status=BookingStatus.CANCELLED if i % 4 == 0 else BookingStatus.ACTIVE,
+            )
+
+    def _get(self, query):
+        return self.client.get(f"/bookings/export/?{query}", HTTP_AUTHORIZATION=f"Bearer {self.token}")
+
+    def test_ndjson_streams_all_rows(self):
+        res = self._get("format=ndjson")
+        self.assertEqual(res.status_code, 200)
+        self.assertTrue(res.streaming)
+        self.assertEqual(res["Content-Type"], "application/x-ndjson")
+
+        rows = [json.loads(line) for line in b"".join(res.streaming_content).decode().splitlines()]
+        self.assertEqual(len(rows), 120)
+
+        listed = self.client.get("/bookings/?page_size=5", HTTP_AUTHORIZATION=f"Bearer {self.token}").data["results"]
+        self.assertEqual(rows[:5], listed)
+
+    def test_csv_with_filters(self):
+        res = self._get("format=csv&status=cancelled")
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res["Content-Type"], "text/csv")
+
+        rows = list(csv.DictReader(io.StringIO(b"".join(res.streaming_content).decode())))
+        self.assertEqual(len(rows), 30)
+        self.assertTrue(all(r["status"] == "cancelled" for r in rows))
+
+    def test_invalid_format(self):
+        res = self._get("format=xml")
+        self.assertEqual(res.status_code, 400)
+        self.assertEqual(res.json()["error"]["code"], "VALIDATION_ERROR")
+
+    def test_requires_auth(self):
+        res = self.client.get("/bookings/export/")
+        self.assertIn(res.status_code, (401, 403))
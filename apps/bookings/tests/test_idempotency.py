@@ -0,0 +1,123 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from apps.bookings import services
+from apps.bookings.models import Booking, BookingStatus, IdempotencyKey
+from apps.resources.models import Resource
+from common.testing import assert_query_budget
+
+User = get_user_model()
+
+
+class IdempotencyKeyTests(APITestCase):
+    def setUp(self):
+        self.client.post("/auth/register/", {"email": "i@i.com", "password": "StrongPass123", "full_name": "I"}, format="json")
+        login = self.client.post("/auth/login/", {"email": "i@i.com", "password": "StrongPass123"}, format="json")
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {login.data['access_token']}")
+        self.user = User.objects.get(email="i@i.com")
+        self.room = Resource.objects.create(name="Room A", owner=self.user)
+        start = timezone.now() + timedelta(days=1)
+        self.payload = {"resource_id": str(self.room.id), "start_at": start.isoformat(),
+                        "end_at": (start + timedelta(hours=1)).isoformat()}
+
+    def _create(self, key, payload=None):
+        return self.client.post("/bookings/", payload or self.payload, format="json", headers={"Idempotency-Key": key})
+
+    def test_retry_replays_first_response(self):
+        first = self._create("k-1")
+        self.assertEqual(first.status_code, 201)
+
+        with assert_query_budget(self, queries=1):  # the key lookup only: no locks, no overlap query
+            with mock.patch("apps.bookings.views.create_booking") as create:
+                retry = self._create("k-1")
+        create.assert_not_called()
+
+        self.assertEqual(retry.status_code, 201)
+        self.assertEqual(retry.content, first.content)
+        self.assertEqual(retry["Idempotent-Replayed"], "true")
+        self.assertEqual(Booking.objects.count(), 1)
+
+    def test_new_key_runs_again(self):
+        self.assertEqual(self._create("k-1").status_code, 201)
+        self.assertEqual(self._create("k-2").status_code, 400)  # overlaps the first booking
+
+    def test_key_reused_for_different_request(self):
+        self._create("k-1")
+        other = {**self.payload, "end_at": (timezone.now() + timedelta(days=2)).isoformat()}
+        res = self._create("k-1", other)
+        self.assertEqual(res.status_code, 400)
+        self.assertEqual(res.data["error"]["code"], "VALIDATION_ERROR")
+
+    def test_in_flight_duplicate(self):
+        IdempotencyKey.objects.create(
+            user=self.user, key="k-1", request_hash="x" * 64,
+            created_at=timezone.now(), expires_at=timezone.now() + timedelta(days=1),
+        )
+        with mock.patch("apps.bookings.idempotency.request_hash", return_value="x" * 64):
+            res = self._create("k-1")
+        self.assertEqual(res.status_code, 409)
+        self.assertEqual(res.data["error"]["code"], "CONFLICT")
+
+    @override_settings(IDEMPOTENCY_IN_FLIGHT_TIMEOUT=0)
+    def test_abandoned_claim_is_taken_over(self):
+        IdempotencyKey.objects.create(
+            user=self.user, key="k-1", request_hash="x" * 64,
+            created_at=timezone.now() - timedelta(seconds=1), expires_at=timezone.now() + timedelta(days=1),
+        )
+        self.assertEqual(self._create("k-1").status_code, 201)
+
+    def test_transient_errors_are_not_stored(self):
+        with mock.patch("apps.bookings.views.create_booking", side_effect=services.ResourceBusy("busy")):
+            self.assertEqual(self._create("k-1").status_code, 409)
+        self.assertFalse(IdempotencyKey.objects.exists())
+        self.assertEqual(self._create("k-1").status_code, 201)
+
+    def test_slow_request_does_not_overwrite_taken_over_claim(self):
+        def taken_over(*args, **kwargs):
+            # the in-flight timeout passed and another request claimed the key
+            IdempotencyKey.objects.filter(key="k-1").update(created_at=timezone.now() + timedelta(seconds=1))
+            return services.create_booking(*args, **kwargs)
+
+        with mock.patch("apps.bookings.views.create_booking", side_effect=taken_over):
+            self.assertEqual(self._create("k-1").status_code, 201)
+        record = IdempotencyKey.objects.get(key="k-1")
+        self.assertIsNone(record.status_code)  # still the new owner's in-flight claim
+
+        def taken_over_then_busy(*args, **kwargs):
+            IdempotencyKey.objects.filter(key="k-2").update(created_at=timezone.now() + timedelta(seconds=1))
+            raise services.ResourceBusy("busy")
+
+        with mock.patch("apps.bookings.views.create_booking", side_effect=taken_over_then_busy):
+            self.assertEqual(self._create("k-2").status_code, 409)
+        self.assertTrue(IdempotencyKey.objects.filter(key="k-2").exists())  # not released
+
+    def test_cancel_replay(self):
+        booking = Booking.objects.create(
+            resource=self.room, user=self.user, status=BookingStatus.ACTIVE,
+            start_at=timezone.now() + timedelta(days=3), end_at=timezone.now() + timedelta(days=3, hours=1),
+        )
+        url = f"/bookings/{booking.id}/cancel/"
+        first = self.client.patch(url, headers={"Idempotency-Key": "c-1"})
+        retry = self.client.patch(url, headers={"Idempotency-Key": "c-1"})
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(retry.content, first.content)
+        # without the key the retry is the confusing "already cancelled" error
+        self.assertEqual(self.client.patch(url).status_code, 400)
+
+    def test_purge_expired(self):
+        self._create("k-1")
+        IdempotencyKey.objects.create(
+            user=self.user, key="old", request_hash="x" * 64, status_code=201, response_body=b"{}",
+            created_at=timezone.now() - timedelta(days=2), expires_at=timezone.now() - timedelta(days=1),
+        )
+        out = StringIO()
+        call_command("purge_idempotency_keys", batch_size=1, stdout=out)
+        self.assertIn("deleted 1", out.getvalue())
+        self.assertEqual(list(IdempotencyKey.objects.values_list("key", flat=True)), ["k-1"])
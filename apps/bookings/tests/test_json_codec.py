@@ -0,0 +1,92 @@
+import decimal
+import uuid
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from unittest import skipUnless
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, override_settings
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework import renderers
+from rest_framework.test import APITestCase
+
+from apps.bookings.models import Booking, BookingStatus
+from apps.bookings.serializers import booking_list_row
+from apps.resources.models import Resource
+from common import json_codec
+from common.renderers import JSONRenderer
+
+User = get_user_model()
+
+PAYLOAD = {
+    "id": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+    "utc": datetime(2026, 2, 9, 10, 0, tzinfo=dt_timezone.utc),
+    "micro": datetime(2026, 2, 9, 10, 0, 0, 123456, tzinfo=dt_timezone.utc),
+    "offset": datetime(2026, 2, 9, 15, 0, tzinfo=dt_timezone(timedelta(hours=5))),
+    "naive": datetime(2026, 2, 9, 10, 0),
+    "day": date(2026, 2, 9),
+    "price": decimal.Decimal("12.50"),
+    "lazy": gettext_lazy("Invalid input"),
+    "text": "Xona\u2028\u2029 o‘zbek",
+    "nested": [{"a": 1, "b": None, "c": True, "d": 0.25}],
+}
+
+
+@skipUnless(json_codec.orjson, "orjson not installed")
+class JsonCodecTests(SimpleTestCase):
+    def test_same_bytes_as_drf(self):
+        drf = renderers.JSONRenderer().render(PAYLOAD)
+        self.assertEqual(json_codec.dumps_orjson(PAYLOAD), drf)
+        self.assertEqual(json_codec.dumps_stdlib(PAYLOAD), drf)
+        self.assertIn(b'"utc":"2026-02-09T10:00:00Z"', drf)
+        self.assertIn(b"Xona\\u2028\\u2029", drf)
+
+    def test_orjson_refusal_falls_back(self):
+        self.assertEqual(json_codec.dumps_orjson({1: "a", "big": 2 ** 70}), b'{"1":"a","big":1180591620717411303424}')
+
+    def test_renderer_keeps_indent_and_none(self):
+        self.assertEqual(JSONRenderer().render(None), b"")
+        pretty = JSONRenderer().render({"a": 1}, "application/json; indent=2")
+        self.assertEqual(pretty, b'{\n  "a": 1\n}')
+
+    def test_loads(self):
+        self.assertEqual(json_codec.loads(b'{"a":[1,"x"]}'), {"a": [1, "x"]})
+        for backend in (json_codec.BACKEND_ORJSON, json_codec.BACKEND_STDLIB):
+            with override_settings(JSON_BACKEND=backend), self.assertRaises(ValueError):
+                json_codec.loads(b'{"a": NaN}')
+
+
+class JsonBackendResponseTests(APITestCase):
+    def setUp(self):
+        self.client.post("/auth/register/", {"email": "j@j.com", "password": "StrongPass123", "full_name": "J"}, format="json")
+        login = self.client.post("/auth/login/", {"email": "j@j.com", "password": "StrongPass123"}, format="json")
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {login.data['access_token']}")
+        user = User.objects.get(email="j@j.com")
+        room = Resource.objects.create(name="Room A", owner=user)
+        start = timezone.now() + timedelta(days=1)
+        for i in range(3):
+            Booking.objects.create(resource=room, user=user, start_at=start + timedelta(hours=i),
+                                   end_at=start + timedelta(hours=i + 1), status=BookingStatus.ACTIVE)
+
+    def test_backends_render_identical_responses(self):
+        bodies = {}
+        for backend in (json_codec.BACKEND_ORJSON, json_codec.BACKEND_STDLIB):
+            with override_settings(JSON_BACKEND=backend):
+                page = self.client.get("/bookings/")
+                export = self.client.get("/bookings/export/?format=ndjson")
+                bodies[backend] = (page.content, b"".join(export.streaming_content))
+        self.assertEqual(bodies[json_codec.BACKEND_ORJSON], bodies[json_codec.BACKEND_STDLIB])
+
+    def test_export_rows_match_formatted_rows(self):
+        lines = b"".join(self.client.get("/bookings/export/?format=ndjson").streaming_content).splitlines()
+        rows = Booking.objects.order_by("-start_at", "-id").values(
+            "id", "resource_id", "user_id", "start_at", "end_at", "status", "created_at"
+        )
+        self.assertEqual(
+            sorted(lines),
+            sorted(renderers.JSONRenderer().render(booking_list_row(row)) for row in rows),
+        )
+
+    def test_invalid_json_body(self):
+        res = self.client.post("/bookings/", data=b'{"resource_id": ', content_type="application/json")
+        self.assertEqual(res.status_code, 400)
@@ -75,3 +75,35 @@ class BookingListTests(APITestCase):
         )
         self.assertEqual(res.status_code, 400)
         self.assertEqual(res.data["error"]["code"], "VALIDATION_ERROR")
+
+
+class BookingUserFilterTests(APITestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(email="u@u.com", password="StrongPass123", full_name="U")
+        self.client.post("/auth/register/", {"email": "t@t.com", "password": "StrongPass123", "full_name": "T"}, format="json")
+        login = self.client.post("/auth/login/", {"email": "t@t.com", "password": "StrongPass123"}, format="json")
+        self.token = login.data["access_token"]
+        self.other = User.objects.get(email="t@t.com")
+
+        self.resource = Resource.objects.create(name="Room A", owner=self.owner)
+        now = timezone.now()
+        for user, hours in ((self.owner, 1), (self.other, 3)):
+            Booking.objects.create(
+                resource=self.resource,
+                user=user,
+                start_at=now + timedelta(hours=hours),
+                end_at=now + timedelta(hours=hours + 1),
+                status=BookingStatus.ACTIVE,
+            )
+
+    def test_filter_by_user(self):
+        res = self.client.get(f"/bookings/?user={self.other.id}", HTTP_AUTHORIZATION=f"Bearer {self.token}")
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.data["count"], 1)
+        self.assertEqual(res.data["results"][0]["user_id"], str(self.other.id))
+
+    def test_invalid_user_id(self):
+        for url in ("/bookings/?user=garbage", "/bookings/export/?user=garbage"):
+            res = self.client.get(url, HTTP_AUTHORIZATION=f"Bearer {self.token}")
+            self.assertEqual(res.status_code, 400, url)
+            self.assertEqual(res.data["error"]["code"], "VALIDATION_ERROR")
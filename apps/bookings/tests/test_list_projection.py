@@ -0,0 +1,53 @@
+from datetime import timedelta
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from django.contrib.auth import get_user_model
+
+from apps.resources.models import Resource
+from apps.bookings.models import Booking, BookingStatus
+from apps.bookings.serializers import BOOKING_LIST_FIELDS, BookingListItemSerializer, booking_list_row
+
+User = get_user_model()
+
+
+class BookingListProjectionTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="u@u.com", password="StrongPass123", full_name="U")
+        self.client.post("/auth/register/", {"email": "t@t.com", "password": "StrongPass123", "full_name": "T"}, format="json")
+        login = self.client.post("/auth/login/", {"email": "t@t.com", "password": "StrongPass123"}, format="json")
+        self.token = login.data["access_token"]
+
+        resource = Resource.objects.create(name="Room A", owner=self.user)
+        now = timezone.now()
+        self.booking = Booking.objects.create(
+            resource=resource,
+            user=self.user,
+            start_at=now + timedelta(hours=1),
+            end_at=now + timedelta(hours=2),
+            status=BookingStatus.ACTIVE,
+        )
+        Booking.objects.create(
+            resource=resource,
+            user=self.user,
+            start_at=(now + timedelta(days=1)).replace(microsecond=0),
+            end_at=(now + timedelta(days=1, hours=1)).replace(microsecond=0),
+            status=BookingStatus.CANCELLED,
+            cancelled_at=now,
+        )
+
+    def test_row_formatter_matches_serializer(self):
+        for booking in Booking.objects.all():
+            row = Booking.objects.values(*BOOKING_LIST_FIELDS).get(id=booking.id)
+            self.assertEqual(booking_list_row(row), dict(BookingListItemSerializer(booking).data))
+
+    def test_list_does_not_join(self):
+        with CaptureQueriesContext(connection) as ctx:
+            res = self.client.get("/bookings/", HTTP_AUTHORIZATION=f"Bearer {self.token}")
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.data["count"], 2)
+        booking_queries = [q["sql"] for q in ctx.captured_queries if "bookings_booking" in q["sql"]]
+        self.assertEqual(len(booking_queries), 2)  # COUNT + page
+        self.assertFalse(any("JOIN" in sql for sql in booking_queries))
+        self.assertEqual(res.data["results"][0]["id"], str(self.booking.id))
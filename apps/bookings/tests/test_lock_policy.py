@@ -0,0 +1,208 @@
+import threading
+from datetime import timedelta
+from unittest import mock, skipUnless
+
+from django.contrib.auth import get_user_model
+from django.db import OperationalError, connection, transaction
+from django.test import TransactionTestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient, APITestCase
+
+from apps.bookings import services
+from apps.bookings.models import Booking, BookingStatus
+from apps.resources.models import Resource, ResourceDailyStats
+from common.db import LOCK_NOT_AVAILABLE
+
+User = get_user_model()
+
+
+class _PgLockError(Exception):
+    sqlstate = LOCK_NOT_AVAILABLE
+
+
+def _lock_not_available():
+    err = OperationalError("could not obtain lock on row in relation \"resources_resource\"")
+    err.__cause__ = _PgLockError()
+    return err
+
+
+def _payload(resource, start):
+    return {"resource_id": str(resource.id), "start_at": start.isoformat(),
+            "end_at": (start + timedelta(hours=1)).isoformat()}
+
+
+@override_settings(BOOKING_LOCK_POLICY="nowait", BOOKING_LOCK_RETRIES=2, BOOKING_LOCK_RETRY_AFTER=3)
+class LockPolicyTests(APITestCase):
+    def setUp(self):
+        self.client.post("/auth/register/", {"email": "l@l.com", "password": "StrongPass123", "full_name": "L"}, format="json")
+        login = self.client.post("/auth/login/", {"email": "l@l.com", "password": "StrongPass123"}, format="json")
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {login.data['access_token']}")
+        self.room = Resource.objects.create(name="Room A", owner=User.objects.get(email="l@l.com"))
+        self.start = timezone.now() + timedelta(days=1)
+        sleep = mock.patch.object(services.time, "sleep")
+        self.sleep = sleep.start()
+        self.addCleanup(sleep.stop)
+
+    def _contention(self, outcome):
+        return services.BOOKING_LOCK_CONTENTION.snapshot().get(f"{self.room.id}\x1f{outcome}", 0)
+
+    def test_retries_then_succeeds(self):
+        real = services._lock_resource
+        calls = iter([_lock_not_available()])
+
+        def flaky(resource_id, *, policy):
+            self.assertEqual(policy, "nowait")
+            err = next(calls, None)
+            if err is not None:
+                raise err
+            return real(resource_id, policy=policy)
+
+        retried = self._contention("retried")
+        with mock.patch.object(services, "_lock_resource", side_effect=flaky):
+            res = self.client.post("/bookings/", _payload(self.room, self.start), format="json")
+
+        self.assertEqual(res.status_code, 201)
+        self.assertEqual(self.sleep.call_count, 1)
+        self.assertEqual(self._contention("retried") - retried, 1)
+
+    def test_busy_after_retries(self):
+        rejected = self._contention("rejected")
+        with mock.patch.object(services, "_lock_resource", side_effect=_lock_not_available()) as lock:
+            res = self.client.post("/bookings/", _payload(self.room, self.start), format="json")
+
+        self.assertEqual(res.status_code, 409)
+        self.assertEqual(res["Retry-After"], "3")
+        self.assertEqual(res.data["error"]["code"], "RESOURCE_BUSY")
+        self.assertEqual(lock.call_count, 3)  # 1 + BOOKING_LOCK_RETRIES
+        self.assertEqual(self._contention("rejected") - rejected, 1)
+        self.assertFalse(Booking.objects.exists())
+
+    @override_settings(BOOKING_LOCK_BUSY_STATUS=429)
+    def test_busy_status_is_configurable(self):
+        with mock.patch.object(services, "_lock_resource", side_effect=_lock_not_available()):
+            res = self.client.post("/bookings/", _payload(self.room, self.start), format="json")
+        self.assertEqual(res.status_code, 429)
+
+    @override_settings(BOOKING_LOCK_POLICY="block")
+    def test_block_policy_does_not_retry(self):
+        with mock.patch.object(services, "_lock_resource", side_effect=_lock_not_available()) as lock:
+            res = self.client.post("/bookings/", _payload(self.room, self.start), format="json")
+        self.assertEqual(res.status_code, 409)
+        self.assertEqual(lock.call_count, 1)
+
+
+@skipUnless(connection.vendor == "postgresql", "row locks need Postgres")
+class LockPolicyPostgresTests(TransactionTestCase):
+    def setUp(self):
+        user = User.objects.create_user(email="pg@l.com", password="StrongPass123", full_name="P")
+        self.room = Resource.objects.create(name="Room A", owner=user)
+        self.client = APIClient()
+        self.client.force_authenticate(user)
+
+    def _post_while_locked(self):
+        locked, release = threading.Event(), threading.Event()
+
+        def holder():
+            with transaction.atomic():
+                Resource.objects.select_for_update().get(id=self.room.id)
+                locked.set()
+                release.wait(5)
+            connection.close()
+
+        thread = threading.Thread(target=holder)
+        thread.start()
+        locked.wait(5)
+        try:
+            return self.client.post("/bookings/", _payload(self.room, timezone.now() + timedelta(days=1)), format="json")
+        finally:
+            release.set()
+            thread.join()
+
+    @override_settings(BOOKING_LOCK_POLICY="nowait", BOOKING_LOCK_RETRIES=1, BOOKING_LOCK_RETRY_BACKOFF_MS=1)
+    def test_nowait(self):
+        self.assertEqual(self._post_while_locked().status_code, 409)
+
+    @override_settings(BOOKING_LOCK_POLICY="timeout", BOOKING_LOCK_TIMEOUT_MS=50, BOOKING_LOCK_RETRIES=0)
+    def test_lock_timeout(self):
+        res = self._post_while_locked()
+        self.assertEqual(res.status_code, 409)
+        self.assertIn("Retry-After", res)
+
+
+@skipUnless(connection.vendor == "postgresql", "row locks need Postgres")
+class LockOrderPostgresTests(TransactionTestCase):
+    """Every booking write locks the Resource row before the rollup rows (no lock-order deadlocks)."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(email="order@l.com", password="StrongPass123", full_name="O")
+        self.room = Resource.objects.create(name="Room A", owner=self.user)
+        self.booking = services.create_booking(
+            user=self.user, resource_id=str(self.room.id),
+            start_at=timezone.now() + timedelta(days=1), end_at=timezone.now() + timedelta(days=1, hours=1),
+        )
+
+    def test_cancel_waits_for_resource_before_locking_stats(self):
+        locked, release = threading.Event(), threading.Event()
+        errors = []
+
+        def holder():
+            with transaction.atomic():
+                Resource.objects.select_for_update().get(id=self.room.id)
+                locked.set()
+                release.wait(5)
+            connection.close()
+
+        def cancel():
+            try:
+                services.cancel_booking(user=self.user, booking_id=str(self.booking.id))
+            except Exception as e:  # noqa: BLE001 - reported by the assertion below
+                errors.append(e)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=holder), threading.Thread(target=cancel)]
+        threads[0].start()
+        locked.wait(5)
+        threads[1].start()
+        try:
+            threads[1].join(0.3)  # cancel is now blocked on the resource row
+            self.assertTrue(threads[1].is_alive())
+            with transaction.atomic():
+                # a create holding the resource lock would take this row next: it must be free
+                list(ResourceDailyStats.objects.select_for_update(nowait=True).filter(resource=self.room))
+        finally:
+            release.set()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(errors, [])
+        self.booking.refresh_from_db()
+        self.assertEqual(self.booking.status, BookingStatus.CANCELLED)
+
+    def test_concurrent_create_and_cancel(self):
+        start = self.booking.start_at
+        errors = []
+
+        def run(fn, **kwargs):
+            try:
+                fn(**kwargs)
+            except Exception as e:  # noqa: BLE001
+                errors.append(e)
+            finally:
+                connection.close()
+
+        threads = [
+            threading.Thread(target=run, args=(services.cancel_booking,),
+                             kwargs={"user": self.user, "booking_id": str(self.booking.id)}),
+            threading.Thread(target=run, args=(services.create_booking,), kwargs={
+                "user": self.user, "resource_id": str(self.room.id),
+                "start_at": start + timedelta(hours=2), "end_at": start + timedelta(hours=3),
+            }),
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(Booking.objects.filter(resource=self.room, status=BookingStatus.ACTIVE).count(), 1)
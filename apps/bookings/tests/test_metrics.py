@@ -0,0 +1,109 @@
+import json
+import os
+import tempfile
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from apps.resources.models import Resource
+from apps.users.jwt import jwt_decode
+from common.exceptions import AuthError
+from common.metrics import Counter, Histogram, Registry, REGISTRY
+
+User = get_user_model()
+
+
+def _sample(text: str, line_prefix: str) -> float:
+    for line in text.splitlines():
+        if line.startswith(line_prefix + " "):
+            return float(line.rsplit(" ", 1)[1])
+    return 0.0
+
+
+@override_settings(METRICS_TOKEN="scrape-token", METRICS_ALLOWED_IPS=[])
+class MetricsEndpointTests(APITestCase):
+    def setUp(self):
+        self.client.post("/auth/register/", {"email": "m@m.com", "password": "StrongPass123", "full_name": "M"}, format="json")
+        login = self.client.post("/auth/login/", {"email": "m@m.com", "password": "StrongPass123"}, format="json")
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {login.data['access_token']}")
+        self.room = Resource.objects.create(name="Room A", owner=User.objects.get(email="m@m.com"))
+        self.start = timezone.now() + timedelta(days=1)
+
+    def _book(self):
+        return self.client.post(
+            "/bookings/",
+            {"resource_id": str(self.room.id), "start_at": self.start.isoformat(),
+             "end_at": (self.start + timedelta(hours=1)).isoformat()},
+            format="json",
+        )
+
+    def _get_metrics(self, **extra):
+        # a fresh client: self.client's JWT credentials would override the scraper's header
+        return self.client_class().get("/metrics/", **extra)
+
+    def _scrape(self) -> str:
+        res = self._get_metrics(HTTP_AUTHORIZATION="Bearer scrape-token")
+        self.assertEqual(res.status_code, 200)
+        self.assertTrue(res["Content-Type"].startswith("text/plain; version=0.0.4"))
+        return res.content.decode()
+
+    def test_booking_metrics(self):
+        before = self._scrape()
+        self.assertEqual(self._book().status_code, 201)
+        self.assertEqual(self._book().status_code, 400)
+        after = self._scrape()
+
+        created = 'booking_create_seconds_count{engine="lock"}'
+        rejected = 'booking_overlap_rejections_total{source="create"}'
+        self.assertEqual(_sample(after, created) - _sample(before, created), 2)
+        self.assertEqual(_sample(after, rejected) - _sample(before, rejected), 1)
+        self.assertIn("# TYPE booking_create_seconds histogram", after)
+        self.assertIn('http_response_size_bytes_count{method="POST",route="bookings/"}', after)
+
+    def test_jwt_failures_counted(self):
+        key = 'jwt_verify_failures_total{reason="format"}'
+        before = _sample(self._scrape(), key)
+        with self.assertRaises(AuthError):
+            jwt_decode("not-a-jwt")
+        self.assertEqual(_sample(self._scrape(), key) - before, 1)
+
+    def test_requires_token(self):
+        self.assertEqual(self.client.get("/metrics/").status_code, 404)  # the client's JWT is not the token
+        self.assertEqual(self._get_metrics(HTTP_AUTHORIZATION="Bearer wrong").status_code, 404)
+
+    @override_settings(METRICS_TOKEN="", METRICS_ALLOWED_IPS=["10.0.0.1"])
+    def test_hidden_from_other_addresses(self):
+        self.assertEqual(self.client.get("/metrics/").status_code, 404)
+        self.assertEqual(self.client.get("/metrics/", REMOTE_ADDR="10.0.0.1").status_code, 200)
+
+    @override_settings(METRICS_TOKEN="")
+    def test_closed_by_default(self):
+        self.assertEqual(self._get_metrics(HTTP_AUTHORIZATION="Bearer ").status_code, 404)
+
+
+class MultiprocessTests(SimpleTestCase):
+    def test_snapshots_are_summed(self):
+        registry = Registry()
+        hits = registry.register(Counter("hits_total", "hits", ["source"]))
+        latency = registry.register(Histogram("work_seconds", "work", buckets=(0.1, 1.0)))
+        hits.inc(source="create")
+        latency.observe(0.05)
+
+        with tempfile.TemporaryDirectory() as directory, override_settings(METRICS_MULTIPROC_DIR=directory):
+            # another worker's snapshot
+            with open(os.path.join(directory, "metrics-999999.json"), "w") as f:
+                json.dump({"hits_total": {"create": 2}, "work_seconds": {"": [[0, 1, 0], 0.5]}}, f)
+            text = registry.render()
+
+        self.assertIn('hits_total{source="create"} 3', text)
+        self.assertIn('work_seconds_bucket{le="0.1"} 1', text)
+        self.assertIn('work_seconds_bucket{le="1"} 2', text)
+        self.assertIn("work_seconds_count 2", text)
+        self.assertIn("work_seconds_sum 0.55", text)
+
+    def test_register_returns_existing(self):
+        first = REGISTRY.register(Counter("reregistered_total", "x"))
+        self.assertIs(REGISTRY.register(Counter("reregistered_total", "x")), first)
@@ -0,0 +1,84 @@
+import json
+import os
+import pstats
+import tempfile
+import time
+
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from common import profiling
+from common.profiling import PROFILE_ID_HEADER, TOKEN_HEADER, sign_profile_token
+
+User = get_user_model()
+
+
+class ProfilerMiddlewareTests(APITestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = tmp.name
+        override = override_settings(PROFILING_DIR=self.dir, PROFILING_SAMPLE_RATES={})
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def _login(self, email, *, staff):
+        self.client.post("/auth/register/", {"email": email, "password": "StrongPass123", "full_name": "P"}, format="json")
+        User.objects.filter(email=email).update(is_staff=staff)
+        login = self.client.post("/auth/login/", {"email": email, "password": "StrongPass123"}, format="json")
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {login.data['access_token']}")
+
+    def test_signed_header_writes_pstats(self):
+        res = self.client.get("/bookings/", headers={TOKEN_HEADER: sign_profile_token("/bookings/")})
+        self.assertEqual(res.status_code, 200)
+        path = os.path.join(self.dir, res[PROFILE_ID_HEADER])
+        self.assertTrue(res[PROFILE_ID_HEADER].endswith(".pstats"))
+        self.assertGreater(pstats.Stats(path).total_calls, 0)
+
+    def test_token_is_bound_to_path_and_expiry(self):
+        res = self.client.get("/bookings/", headers={TOKEN_HEADER: sign_profile_token("/resources/")})
+        self.assertNotIn(PROFILE_ID_HEADER, res)
+        res = self.client.get("/bookings/", headers={TOKEN_HEADER: sign_profile_token("/bookings/", ttl=-1)})
+        self.assertNotIn(PROFILE_ID_HEADER, res)
+        self.assertEqual(os.listdir(self.dir), [])
+
+    def test_query_flag_needs_staff(self):
+        self._login("user@p.com", staff=False)
+        self.assertNotIn(PROFILE_ID_HEADER, self.client.get("/bookings/?_profile=cprofile"))
+
+        self._login("staff@p.com", staff=True)
+        res = self.client.get("/bookings/?_profile=sample")
+        self.assertTrue(res[PROFILE_ID_HEADER].endswith(".speedscope.json"))
+        with open(os.path.join(self.dir, res[PROFILE_ID_HEADER])) as f:
+            profile = json.load(f)["profiles"][0]
+        self.assertEqual(profile["type"], "sampled")
+        self.assertEqual(len(profile["samples"]), len(profile["weights"]))
+
+    def test_sample_rates(self):
+        with override_settings(PROFILING_SAMPLE_RATES={"/bookings/": 1.0}, PROFILING_SAMPLE_MODE="cprofile"):
+            self.assertIn(PROFILE_ID_HEADER, self.client.get("/bookings/"))
+            self.assertNotIn(PROFILE_ID_HEADER, self.client.get("/resources/"))
+
+    def test_concurrent_cprofile_falls_back_to_sampler(self):
+        # another request's cProfile capture is running in this process
+        with profiling._CPROFILE_LOCK:
+            res = self.client.get("/bookings/", headers={TOKEN_HEADER: sign_profile_token("/bookings/")})
+        self.assertEqual(res.status_code, 200)
+        self.assertTrue(res[PROFILE_ID_HEADER].endswith(".speedscope.json"))
+
+        res = self.client.get("/bookings/", headers={TOKEN_HEADER: sign_profile_token("/bookings/")})
+        self.assertTrue(res[PROFILE_ID_HEADER].endswith(".pstats"))  # released after the capture
+
+    def test_old_and_excess_profiles_are_pruned(self):
+        for i, age in enumerate((10, 20, 30, 10 * 86400)):
+            path = os.path.join(self.dir, f"old-{i}.pstats")
+            open(path, "w").close()
+            os.utime(path, (time.time() - age,) * 2)
+        open(os.path.join(self.dir, "notes.txt"), "w").close()  # not a profile: left alone
+
+        with override_settings(PROFILING_MAX_FILES=3, PROFILING_MAX_AGE=86400):
+            res = self.client.get("/bookings/", headers={TOKEN_HEADER: sign_profile_token("/bookings/")})
+        self.assertEqual(
+            sorted(os.listdir(self.dir)), sorted([res[PROFILE_ID_HEADER], "old-0.pstats", "old-1.pstats", "notes.txt"])
+        )
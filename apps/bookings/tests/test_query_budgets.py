@@ -0,0 +1,100 @@
+from datetime import timedelta
+
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from django.contrib.auth import get_user_model
+
+from apps.resources.models import Resource
+from apps.bookings.models import Booking, BookingStatus
+from common.testing import assert_query_budget
+
+User = get_user_model()
+
+
+class QueryBudgetTests(APITestCase):
+    """
+    Query (and JOIN) budgets of the hot endpoints, auth cache warm.
+    Raise a budget only together with the change that needs the extra query.
+    """
+
+    def setUp(self):
+        self.client.post("/auth/register/", {"email": "q@q.com", "password": "StrongPass123", "full_name": "Q"}, format="json")
+        login = self.client.post("/auth/login/", {"email": "q@q.com", "password": "StrongPass123"}, format="json")
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {login.data['access_token']}")
+        self.user = User.objects.get(email="q@q.com")
+
+        self.room = Resource.objects.create(name="Room A", owner=self.user)
+        self.start = timezone.now() + timedelta(days=1)
+        self.booking = Booking.objects.create(
+            resource=self.room,
+            user=self.user,
+            start_at=self.start,
+            end_at=self.start + timedelta(hours=1),
+            status=BookingStatus.ACTIVE,
+        )
+        self.client.get(f"/resources/{self.room.id}/")  # warm the auth cache
+
+    def test_booking_list(self):
+        with assert_query_budget(self, queries=2, joins=0):  # COUNT + page
+            self.assertEqual(self.client.get("/bookings/").status_code, 200)
+        with assert_query_budget(self, queries=1, joins=0):  # keyset page
+            self.assertEqual(self.client.get("/bookings/?cursor=").status_code, 200)
+        with assert_query_budget(self, queries=3, joins=0):  # + ETag validator
+            self.assertEqual(self.client.get(f"/bookings/?resource={self.room.id}").status_code, 200)
+
+    def test_booking_create(self):
+        payload = {
+            "resource_id": str(self.room.id),
+            "start_at": (self.start + timedelta(hours=2)).isoformat(),
+            "end_at": (self.start + timedelta(hours=3)).isoformat(),
+        }
+        # savepoint + resource lock + overlap check + insert + version bump + stats upsert
+        # + occupancy refresh (select + upsert) + release
+        with assert_query_budget(self, queries=9, joins=0):
+            self.assertEqual(self.client.post("/bookings/", payload, format="json").status_code, 201)
+
+    def test_booking_cancel(self):
+        # savepoint + booking lock + update + version bump + stats upsert
+        # + occupancy refresh (select + upsert) + release
+        with assert_query_budget(self, queries=8, joins=1):
+            self.assertEqual(self.client.patch(f"/bookings/{self.booking.id}/cancel/").status_code, 200)
+
+    def test_resource_reads(self):
+        with assert_query_budget(self, queries=2, joins=0):
+            self.assertEqual(self.client.get("/resources/").status_code, 200)
+        with assert_query_budget(self, queries=1, joins=0):
+            self.assertEqual(self.client.get(f"/resources/{self.room.id}/").status_code, 200)
+
+
+class RequestTimingTests(APITestCase):
+    def setUp(self):
+        self.client.post("/auth/register/", {"email": "t@t.com", "password": "StrongPass123", "full_name": "T"}, format="json")
+        login = self.client.post("/auth/login/", {"email": "t@t.com", "password": "StrongPass123"}, format="json")
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {login.data['access_token']}")
+        self.room = Resource.objects.create(name="Room A", owner=User.objects.get(email="t@t.com"))
+
+    @override_settings(SERVER_TIMING=True)
+    def test_server_timing_header(self):
+        start = timezone.now() + timedelta(days=1)
+        res = self.client.post(
+            "/bookings/",
+            {"resource_id": str(self.room.id), "start_at": start.isoformat(),
+             "end_at": (start + timedelta(hours=1)).isoformat()},
+            format="json",
+        )
+        self.assertEqual(res.status_code, 201)
+        metrics = {part.split(";")[0] for part in res["Server-Timing"].split(", ")}
+        self.assertTrue({"db", "lock", "auth", "serialize", "total"} <= metrics)
+        self.assertIn('queries"', res["Server-Timing"])
+
+    @override_settings(SERVER_TIMING=False)
+    def test_structured_log_line(self):
+        with self.assertLogs("common.request_timing", level="INFO") as logs:
+            res = self.client.get("/bookings/")
+        self.assertNotIn("Server-Timing", res)
+        timing = logs.records[-1].timing
+        self.assertEqual(timing["path"], "/bookings/")
+        self.assertEqual(timing["status"], 200)
+        self.assertGreaterEqual(timing["queries"], 2)
+        self.assertIn("serialize_ms", timing)
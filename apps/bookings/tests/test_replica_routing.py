@@ -0,0 +1,150 @@
+import warnings
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import connections
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from django.contrib.auth import get_user_model
+
+from apps.resources.models import Resource
+from apps.bookings.models import Booking, BookingStatus
+from common.db_routing import read_db
+
+User = get_user_model()
+
+REPLICA = "replica"
+
+
+def _reset_connection_settings():
+    # ConnectionHandler caches settings.DATABASES; open connections are kept
+    connections._settings = None
+    connections.__dict__.pop("settings", None)
+
+
+@override_settings(DATABASE_REPLICAS=[REPLICA], READ_YOUR_WRITES_WINDOW=30)
+class ReplicaRoutingTests(APITestCase):
+    """
+    Anything read from the replica is visibly stale (it stays empty).
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        # A separate, never-replicated database: a replica with infinite lag. Added for
+        # this class only: the runner never sees the alias (no test database, no checks),
+        # and `databases` names it only from here on. The router keeps migrations off
+        # replicas, so the schema is created here, before the class-wide transaction
+        # (SQLite can't run DDL inside it).
+        default = connections.settings["default"]
+        cls._databases = override_settings(DATABASES={
+            **connections.settings,
+            REPLICA: {
+                **default,
+                "ENGINE": "django.db.backends.sqlite3",
+                "NAME": ":memory:",
+                "TEST": {**default["TEST"], "NAME": None, "MIRROR": None},
+            },
+        })
+        with warnings.catch_warnings():
+            # "can lead to unexpected behavior": the connection settings are reset below
+            warnings.filterwarnings("ignore", message="Overriding setting DATABASES")
+            cls._databases.enable()
+        _reset_connection_settings()
+        cls.databases = {"default", REPLICA}
+        with connections[REPLICA].schema_editor() as editor:
+            for model in (User, Resource, Booking):
+                editor.create_model(model)
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        connections[REPLICA].close()
+        del connections[REPLICA]
+        del cls.databases
+        cls._databases.disable()
+        _reset_connection_settings()
+
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create_user(email="o@o.com", password="StrongPass123", full_name="O")
+        self.room = Resource.objects.create(name="Room A", owner=self.owner)
+        self.start = timezone.now() + timedelta(days=1)
+        Booking.objects.create(
+            resource=self.room,
+            user=self.owner,
+            start_at=self.start,
+            end_at=self.start + timedelta(hours=1),
+            status=BookingStatus.ACTIVE,
+        )
+        self.token_a = self._login("a@a.com")
+        self.token_b = self._login("b@b.com")
+
+    def _login(self, email: str) -> str:
+        self.client.post("/auth/register/", {"email": email, "password": "StrongPass123", "full_name": "X"}, format="json")
+        return self.client.post("/auth/login/", {"email": email, "password": "StrongPass123"}, format="json").data["access_token"]
+
+    def _list(self, token: str):
+        res = self.client.get(f"/bookings/?resource={self.room.id}", HTTP_AUTHORIZATION=f"Bearer {token}")
+        self.assertEqual(res.status_code, 200)
+        return res
+
+    def _book(self, token: str, hours: int):
+        return self.client.post(
+            "/bookings/",
+            {
+                "resource_id": str(self.room.id),
+                "start_at": (self.start + timedelta(hours=hours)).isoformat(),
+                "end_at": (self.start + timedelta(hours=hours + 1)).isoformat(),
+            },
+            format="json",
+            HTTP_AUTHORIZATION=f"Bearer {token}",
+        )
+
+    def test_selectors_read_replica(self):
+        self.assertEqual(self._list(self.token_a).data["count"], 0)  # stale replica
+        res = self.client.get(f"/resources/{self.room.id}/", HTTP_AUTHORIZATION=f"Bearer {self.token_a}")
+        self.assertEqual(res.status_code, 400)  # not replicated yet
+        start = (self.start + timedelta(hours=5)).isoformat().replace("+00:00", "Z")
+        end = (self.start + timedelta(hours=6)).isoformat().replace("+00:00", "Z")
+        res = self.client.get(
+            f"/resources/available/?start_at={start}&end_at={end}", HTTP_AUTHORIZATION=f"Bearer {self.token_a}"
+        )
+        self.assertEqual(res.data["results"], [])  # free on the primary, absent on the replica
+
+    def test_writer_reads_own_writes(self):
+        self.assertEqual(self._book(self.token_a, 2).status_code, 201)
+
+        self.assertEqual(self._list(self.token_a).data["count"], 2)  # pinned to primary
+        self.assertEqual(self._list(self.token_b).data["count"], 0)  # other users: replica
+
+    @override_settings(READ_YOUR_WRITES_WINDOW=0)
+    def test_window_zero_disables_pinning(self):
+        self.assertEqual(self._book(self.token_a, 2).status_code, 201)
+        self.assertEqual(self._list(self.token_a).data["count"], 0)
+
+    def test_services_use_primary(self):
+        # overlap check + lock read the primary, which has the conflicting booking
+        res = self._book(self.token_a, 0)
+        self.assertEqual(res.status_code, 400)
+        self.assertEqual(res.data["error"]["code"], "BUSINESS_RULE_VIOLATION")
+
+        # unsafe requests read the primary too (the resource only exists there)
+        res = self.client.patch(
+            f"/resources/{self.room.id}/",
+            {"name": "Room B"},
+            format="json",
+            HTTP_AUTHORIZATION=f"Bearer {self._owner_token()}",
+        )
+        self.assertEqual(res.status_code, 200)
+        self.room.refresh_from_db()
+        self.assertEqual(self.room.name, "Room B")
+
+    def _owner_token(self) -> str:
+        return self.client.post("/auth/login/", {"email": "o@o.com", "password": "StrongPass123"}, format="json").data["access_token"]
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_no_replicas_reads_primary(self):
+        self.assertEqual(read_db(), "default")
+        self.assertEqual(self._list(self.token_a).data["count"], 1)
@@ -1,7 +1,19 @@
+from django.conf import settings
 from django.urls import path
-from .views import BookingCollectionView, BookingCancelView
+from .views import (
+    AsyncBookingCollectionView,
+    BookingCollectionView,
+    BookingBulkCreateView,
+    BookingExportView,
+    BookingCancelView,
+)
+
+# GET served by the async view under ASGI (settings.ASYNC_READ_VIEWS), POST stays on DRF
+collection_view = AsyncBookingCollectionView if settings.ASYNC_READ_VIEWS else BookingCollectionView
 
 urlpatterns = [
-    path("", BookingCollectionView.as_view()),
+    path("", collection_view.as_view()),
+    path("bulk/", BookingBulkCreateView.as_view()),
+    path("export/", BookingExportView.as_view()),
     path("<uuid:booking_id>/cancel/", BookingCancelView.as_view()),
 ]
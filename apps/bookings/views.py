@@ -1,57 +1,86 @@
+from django.http import StreamingHttpResponse
+from rest_framework.negotiation import DefaultContentNegotiation
+from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
 from rest_framework.response import Response
 
-from common.responses import error_response
+from common.responses import error_payload, error_response
 from common.exceptions import AppError, ValidationError
-from common.pagination import paginate_queryset
+from common.formatting import format_datetime
+from common.async_views import AsyncAPIView, json_response
+from common.conditional import make_etag, not_modified, set_validators
+from common.pagination import apaginate, paginate, parse_paging
+from common.request_timing import timed
 
-from .selectors import list_bookings
-from .services import create_booking
-from .serializers import BookingListItemSerializer, BookingCreateSerializer
+from apps.resources.selectors import aget_resource_versions, get_resource_versions
+from .selectors import BOOKING_LIST_ORDERING, list_bookings
+from .services import create_booking, create_bookings_bulk
+from .serializers import (
+    BOOKING_LIST_FIELDS,
+    BookingListItemSerializer,
+    BookingCreateSerializer,
+    BookingBulkCreateSerializer,
+    booking_list_row,
+)
 from .services import cancel_booking
+from .export import EXPORT_FORMATS, stream_bookings
+from .idempotency import idempotent
+
+
+def _archived(params) -> bool:
+    return params.get("archived") in ("1", "true")
+
+
+def _booking_list_qs(params):
+    return list_bookings(
+        resource_id=params.get("resource"),
+        user_id=params.get("user"),
+        date_from=params.get("date_from"),
+        date_to=params.get("date_to"),
+        status=params.get("status"),
+        archived=_archived(params),
+    ).values(*BOOKING_LIST_FIELDS)
+
+
+@timed("serialize")
+def _booking_list_body(paged: dict) -> dict:
+    # page meta depends on the mode: {page_size, next_cursor} for ?cursor=,
+    # otherwise {count, page, page_size, total_pages, ...} per ?count=
+    return {**paged, "results": [booking_list_row(row) for row in paged["results"]]}
+
+
+def _booking_list_etag(versions: dict | None) -> str | None:
+    return make_etag("bookings", versions["bookings_version"]) if versions else None
 
 
 class BookingCollectionView(APIView):
     """
-    GET  /bookings      -> list + filters + pagination
-    POST /bookings      -> create booking (overlap-protected)
+    GET  /bookings      -> list + filters (?resource=&user=&date_from=&date_to=&status=) + pagination (?page=&count=exact|estimate|none or keyset ?cursor=)
+                           ?archived=true lists the archive (bookings ended before the archive cutoff)
+                           ?resource= lists carry an ETag (304 on If-None-Match)
+    POST /bookings      -> create booking (overlap-protected, optional Idempotency-Key)
     """
 
     def get(self, request):
-        try:
-            resource_id = request.query_params.get("resource")
-            date_from = request.query_params.get("date_from")
-            date_to = request.query_params.get("date_to")
-            status = request.query_params.get("status")
-
-            page = int(request.query_params.get("page", "1"))
-            page_size = int(request.query_params.get("page_size", "10"))
-
-            qs = list_bookings(
-                resource_id=resource_id,
-                date_from=date_from,
-                date_to=date_to,
-                status=status,
-            )
-            paged = paginate_queryset(qs, page=page, page_size=page_size)
+        resource_id = request.query_params.get("resource")
+        # validator is read before the page: a concurrent write can only make the ETag stale, never too new
+        etag = _booking_list_etag(get_resource_versions(resource_id=resource_id) if resource_id else None)
+        response = not_modified(request, etag=etag) if etag else None
+        if response is not None:
+            return response
 
+        try:
+            paging = parse_paging(request.query_params)
+            paged = paginate(_booking_list_qs(request.query_params), paging=paging, ordering=BOOKING_LIST_ORDERING)
         except ValueError:
             return error_response(ValidationError("page and page_size must be integers"))
         except AppError as e:
             return error_response(e)
 
-        ser = BookingListItemSerializer(paged["results"], many=True)
-        return Response(
-            {
-                "count": paged["count"],
-                "page": paged["page"],
-                "page_size": paged["page_size"],
-                "total_pages": paged["total_pages"],
-                "results": ser.data,
-            },
-            status=200,
-        )
+        response = Response(_booking_list_body(paged), status=200)
+        return set_validators(response, etag=etag) if etag else response
 
+    @idempotent
     def post(self, request):
         ser = BookingCreateSerializer(data=request.data)
         if not ser.is_valid():
@@ -69,10 +98,119 @@ class BookingCollectionView(APIView):
         return Response(out.data, status=201)
 
 
+class AsyncBookingCollectionView(AsyncAPIView):
+    """
+    ASGI twin of BookingCollectionView: GET on the async ORM, POST delegated.
+    """
+    sync_view = BookingCollectionView
+    require_auth = False
+
+    async def get(self, request):
+        resource_id = request.GET.get("resource")
+        etag = _booking_list_etag(await aget_resource_versions(resource_id=resource_id) if resource_id else None)
+        response = not_modified(request, etag=etag) if etag else None
+        if response is not None:
+            return response
+
+        try:
+            paging = parse_paging(request.GET)
+            paged = await apaginate(_booking_list_qs(request.GET), paging=paging, ordering=BOOKING_LIST_ORDERING)
+        except ValueError:
+            raise ValidationError("page and page_size must be integers")
+
+        response = json_response(_booking_list_body(paged), 200)
+        return set_validators(response, etag=etag) if etag else response
+
+
+class BookingBulkCreateView(APIView):
+    """
+    POST /bookings/bulk  -> create many bookings at once
+    body: {"mode": "all_or_nothing" | "best_effort", "bookings": [{resource_id, start_at, end_at}, ...]}
+    """
+
+    def post(self, request):
+        ser = BookingBulkCreateSerializer(data=request.data)
+        if not ser.is_valid():
+            return Response(
+                {"error": {"code": "VALIDATION_ERROR", "message": "Invalid input", "details": ser.errors}},
+                status=400,
+            )
+
+        mode = ser.validated_data["mode"]
+        try:
+            results = create_bookings_bulk(
+                user=request.user,
+                items=ser.validated_data["bookings"],
+                all_or_nothing=(mode == BookingBulkCreateSerializer.MODE_ALL_OR_NOTHING),
+            )
+        except AppError as e:
+            return error_response(e)
+
+        out = []
+        for r in results:
+            if "booking" in r:
+                out.append({"index": r["index"], "status": "created",
+                            "booking": BookingListItemSerializer(r["booking"]).data})
+            else:
+                out.append({"index": r["index"], "status": "failed", "error": error_payload(r["error"])})
+
+        created = sum(1 for r in out if r["status"] == "created")
+        return Response(
+            {
+                "mode": mode,
+                "created": created,
+                "failed": len(out) - created,
+                "results": out,
+            },
+            status=201 if mode == BookingBulkCreateSerializer.MODE_ALL_OR_NOTHING else 200,
+        )
+
+
+class _IgnoreFormatParamNegotiation(DefaultContentNegotiation):
+    """
+    `?format=` selects the export encoding here, not a DRF renderer;
+    (error) responses always use the first renderer (JSON).
+    """
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        return renderers[0], renderers[0].media_type
+
+
+class BookingExportView(APIView):
+    """
+    GET /bookings/export/?format=ndjson|csv&resource=&user=&date_from=&date_to=&status=&archived=
+    Streams every matching booking (same filters as the list, no page size cap).
+    """
+    permission_classes = [IsAuthenticated]
+    content_negotiation_class = _IgnoreFormatParamNegotiation
+
+    def get(self, request):
+        fmt = request.query_params.get("format", "ndjson")
+        try:
+            if fmt not in EXPORT_FORMATS:
+                raise ValidationError("Invalid format", details={"format": "|".join(EXPORT_FORMATS)})
+
+            qs = list_bookings(
+                resource_id=request.query_params.get("resource"),
+                user_id=request.query_params.get("user"),
+                date_from=request.query_params.get("date_from"),
+                date_to=request.query_params.get("date_to"),
+                status=request.query_params.get("status"),
+                archived=_archived(request.query_params),
+            )
+        except AppError as e:
+            return error_response(e)
+
+        response = StreamingHttpResponse(stream_bookings(qs, fmt=fmt), content_type=EXPORT_FORMATS[fmt])
+        response["Content-Disposition"] = f'attachment; filename="bookings.{fmt}"'
+        return response
+
+
 class BookingCancelView(APIView):
     """
-    PATCH /bookings/{id}/cancel
+    PATCH /bookings/{id}/cancel   (optional Idempotency-Key)
     """
+    @idempotent
     def patch(self, request, booking_id: str):
         try:
             booking = cancel_booking(user=request.user, booking_id=booking_id)
@@ -83,7 +221,7 @@ class BookingCancelView(APIView):
             {
                 "id": str(booking.id),
                 "status": booking.status,
-                "cancelled_at": booking.cancelled_at.isoformat().replace("+00:00", "Z") if booking.cancelled_at else None,
+                "cancelled_at": format_datetime(booking.cancelled_at),
             },
             status=200,
         )
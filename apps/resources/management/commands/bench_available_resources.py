@@ -0,0 +1,57 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from common.benchmarks import explain, format_stats, measure
+from common.dates import parse_dt
+from common.pagination import paginate_keyset
+from apps.resources.models import Resource
+from apps.resources.selectors import RESOURCE_LIST_ORDERING, list_available_resources
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark GET /resources/available/ (NOT EXISTS anti-join + keyset pages). "
+        "Prints query plans and latency; seed first with seed_bench_data."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--start-at", help="ISO datetime (default: next full hour + 1 day)")
+        parser.add_argument("--hours", type=float, default=1.0)
+        parser.add_argument("--owner", default=None)
+        parser.add_argument("--page-size", type=int, default=50)
+        parser.add_argument("--pages", type=int, default=20, help="depth of the cursor walk")
+        parser.add_argument("--iterations", type=int, default=30)
+
+    def handle(self, *args, **opts):
+        start = opts["start_at"]
+        if not start:
+            start = (timezone.now() + timedelta(days=1)).replace(minute=0, second=0, microsecond=0).isoformat()
+        end = (parse_dt(start, "start_at") + timedelta(hours=opts["hours"])).isoformat()
+        ordering = RESOURCE_LIST_ORDERING
+
+        qs = list_available_resources(start_at=start, end_at=end, owner_id=opts["owner"])
+        self.stdout.write(f"resources in table: {Resource.objects.count()}")
+        self.stdout.write(f"window: {start} .. {end}")
+
+        def first_page():
+            return paginate_keyset(qs, ordering=ordering, cursor=None, page_size=opts["page_size"])
+
+        self.stdout.write(format_stats("first page", measure(first_page, iterations=opts["iterations"])))
+
+        # walk N pages, then time the page at that depth
+        cursor = None
+        for _ in range(opts["pages"]):
+            page = paginate_keyset(qs, ordering=ordering, cursor=cursor, page_size=opts["page_size"])
+            if not page["next_cursor"]:
+                break
+            cursor = page["next_cursor"]
+
+        def deep_page():
+            return paginate_keyset(qs, ordering=ordering, cursor=cursor, page_size=opts["page_size"])
+
+        self.stdout.write(format_stats(f"page #{opts['pages']} (cursor)", measure(deep_page, iterations=opts["iterations"])))
+
+        self.stdout.write("\nEXPLAIN first page:")
+        self.stdout.write(explain(qs.order_by(*ordering)[: opts["page_size"] + 1]))
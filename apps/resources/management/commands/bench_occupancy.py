@@ -0,0 +1,68 @@
+import random
+import uuid
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+
+from common.benchmarks import format_stats, measure
+from apps.resources.occupancy import GRANULARITIES, MASK_BYTES, SLOTS_PER_DAY, heatmap
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark occupancy.heatmap on a synthetic resources x days grid (no database), "
+        "per granularity, against a per-cell loop over the booked intervals."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--resources", type=int, default=1000)
+        parser.add_argument("--days", type=int, default=90)
+        parser.add_argument("--bookings-per-day", type=int, default=6)
+        parser.add_argument("--iterations", type=int, default=10)
+        parser.add_argument("--seed", type=int, default=1)
+
+    def handle(self, *args, **opts):
+        rnd = random.Random(opts["seed"])
+        day_from = date(2026, 1, 1)
+        resource_ids = [uuid.UUID(int=rnd.getrandbits(128)) for _ in range(opts["resources"])]
+
+        rows, intervals = [], {}
+        for resource_id in resource_ids:
+            for d in range(opts["days"]):
+                day = day_from + timedelta(days=d)
+                mask, spans = 0, []
+                for _ in range(opts["bookings_per_day"]):
+                    first = rnd.randrange(SLOTS_PER_DAY)
+                    last = min(SLOTS_PER_DAY, first + rnd.randint(1, 8))
+                    mask |= ((1 << (last - first)) - 1) << first
+                    spans.append((first, last))
+                rows.append((resource_id, day, mask.to_bytes(MASK_BYTES, "little")))
+                intervals[(resource_id, d)] = spans
+
+        cells = opts["resources"] * opts["days"] * SLOTS_PER_DAY
+        self.stdout.write(f"grid: {opts['resources']} resources x {opts['days']} days = {cells} slots")
+
+        for granularity, width in GRANULARITIES.items():
+            def run():
+                return heatmap(resource_ids, rows, day_from=day_from, days=opts["days"], granularity=granularity)
+
+            label = f"heatmap {granularity}min ({opts['resources'] * opts['days'] * SLOTS_PER_DAY // width} cells)"
+            self.stdout.write(format_stats(label, measure(run, iterations=opts["iterations"], warmup=1)))
+
+        # baseline: what the endpoint would do without bitmaps (interval loop per cell)
+        width = GRANULARITIES[60]
+
+        def interval_loop():
+            out = []
+            for resource_id in resource_ids:
+                row = []
+                for d in range(opts["days"]):
+                    busy = [False] * SLOTS_PER_DAY
+                    for first, last in intervals[(resource_id, d)]:
+                        for slot in range(first, last):
+                            busy[slot] = True
+                    row.extend(sum(busy[c:c + width]) for c in range(0, SLOTS_PER_DAY, width))
+                out.append(row)
+            return out
+
+        self.stdout.write(format_stats("interval loop 60min (baseline)", measure(interval_loop, iterations=1, warmup=0)))
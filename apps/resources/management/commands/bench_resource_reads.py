@@ -0,0 +1,97 @@
+import time
+import tracemalloc
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.resources.models import Resource
+from apps.resources.selectors import RESOURCE_LIST_ORDERING, list_resources
+from apps.resources.serializers import RESOURCE_FIELDS, resource_row
+from apps.users.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        "Resource list throughput: select_related('owner') model instances (the old path) vs "
+        "values(*RESOURCE_FIELDS)+resource_row (rows/sec and peak memory). "
+        "Synthetic rows by default, --db reads the resources table."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", type=int, nargs="+", default=[50, 10_000])
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--db", action="store_true", help="include the query (join + instances vs values())")
+
+    def handle(self, *args, **opts):
+        for size in opts["sizes"]:
+            if opts["db"]:
+                instance_path = lambda: [  # noqa: E731
+                    _instance_row(r) for r in
+                    Resource.objects.select_related("owner").order_by(*RESOURCE_LIST_ORDERING)[:size]
+                ]
+                projection_path = lambda: [resource_row(row) for row in list_resources()[:size]]  # noqa: E731
+            else:
+                db_rows = _synthetic(size)
+                instance_path = lambda: [_instance_row(r) for r in _from_db(db_rows)]  # noqa: E731
+                projection_path = lambda: [  # noqa: E731
+                    resource_row(dict(zip(RESOURCE_FIELDS, (rid, name, owner_id, created_at))))
+                    for (rid, name, owner_id, created_at, *_), _ in db_rows
+                ]
+
+            # both paths must produce identical JSON
+            assert instance_path() == projection_path()
+
+            self.stdout.write(f"\npage size {size}{' (db)' if opts['db'] else ''}")
+            for label, fn in (("instances", instance_path), ("projection", projection_path)):
+                rows_per_sec, peak = _run(fn, size=size, repeat=opts["repeat"])
+                self.stdout.write(f"  {label:<12} {rows_per_sec:>14,.0f} rows/s   peak {peak / 1024:>10,.1f} KiB")
+
+
+def _instance_row(r: Resource) -> dict:
+    # the formatting the views repeated before resource_row()
+    return {
+        "id": str(r.id),
+        "name": r.name,
+        "owner_id": str(r.owner_id),
+        "created_at": r.created_at.isoformat().replace("+00:00", "Z"),
+    }
+
+
+def _run(fn, *, size: int, repeat: int) -> tuple[float, int]:
+    size = len(fn()) or 1  # warmup; --db tables may hold fewer rows than asked for
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    elapsed = time.perf_counter() - t0
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size * repeat / elapsed, peak
+
+
+_RESOURCE_COLUMNS = ["id", "name", "owner_id", "created_at", "updated_at", "version", "bookings_version"]
+_USER_COLUMNS = [f.attname for f in User._meta.concrete_fields]
+
+
+def _synthetic(size: int) -> list[tuple]:
+    """Raw DB rows of the old join: (resource columns, owner columns)."""
+    now = timezone.now()
+    rows = []
+    for i in range(size):
+        owner_id = uuid.uuid4()
+        owner = {name: None for name in _USER_COLUMNS}
+        owner.update(id=owner_id, email=f"owner{i}@bench.local", full_name="Owner", password="!",
+                     is_active=True, is_staff=False, is_superuser=False, created_at=now)
+        rows.append(((uuid.uuid4(), f"Room {i}", owner_id, now, now, 1, 0), tuple(owner.values())))
+    return rows
+
+
+def _from_db(rows: list[tuple]):
+    # what select_related("owner") does per row: two model instances, the owner cached on the resource
+    for resource_values, owner_values in rows:
+        resource = Resource.from_db("default", _RESOURCE_COLUMNS, resource_values)
+        resource.owner = User.from_db("default", _USER_COLUMNS, owner_values)
+        yield resource
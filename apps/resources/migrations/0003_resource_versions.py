@@ -0,0 +1,26 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resources', '0002_resource_name_keyset_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resource',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='resource',
+            name='version',
+            field=models.PositiveIntegerField(default=1),
+        ),
+        migrations.AddField(
+            model_name='resource',
+            name='bookings_version',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+    ]
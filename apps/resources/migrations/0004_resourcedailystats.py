@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:34
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resources', '0003_resource_versions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResourceDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('bookings', models.IntegerField(default=0)),
+                ('cancellations', models.IntegerField(default=0)),
+                ('booked_minutes', models.IntegerField(default=0)),
+                ('resource', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='resources.resource')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('resource', 'day'), name='resource_daily_stats_uniq')],
+            },
+        ),
+    ]
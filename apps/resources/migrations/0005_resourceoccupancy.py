@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:37
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resources', '0004_resourcedailystats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResourceOccupancy',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('slots', models.BinaryField(max_length=12)),
+                ('resource', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='resources.resource')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('resource', 'day'), name='resource_occupancy_uniq')],
+            },
+        ),
+    ]
@@ -1,5 +1,6 @@
 import uuid
 from django.db import models
+from django.db.models import F
 from django.conf import settings
 
 
@@ -18,10 +19,91 @@ class Resource(models.Model):
     )
 
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    # HTTP validators (ETag) for conditional GET:
+    # version          -> GET /resources/{id}/, bumped by every save() (services, admin, shell)
+    # bookings_version -> GET /bookings/?resource={id}, bumped by every booking write
+    #                    (after commit for constraint-engine inserts: they never lock this row)
+    version = models.PositiveIntegerField(default=1)
+    bookings_version = models.PositiveBigIntegerField(default=0)
 
     class Meta:
         ordering = ["-created_at"]
         unique_together = [("owner", "name")]  # optional: owner ichida nom takrorlanmasin
+        indexes = [
+            # keyset pagination order (list + available search)
+            models.Index(fields=["name", "-created_at", "id"], name="resource_name_keyset_idx"),
+        ]
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            # in SQL: concurrent saves can't hand out the same ETag for different content
+            self.version = F("version") + 1
+            if kwargs.get("update_fields") is not None:
+                kwargs["update_fields"] = {*kwargs["update_fields"], "version"}
+        super().save(*args, **kwargs)
+        if not isinstance(self.version, int):
+            self.refresh_from_db(fields=["version"])
 
     def __str__(self):
         return self.name
+
+
+class ResourceDailyStats(models.Model):
+    """
+    Per-resource, per-day rollup for the owner dashboard (GET /resources/{id}/stats/).
+    Kept current by the booking services inside their transactions (resources.stats);
+    `manage.py rebuild_resource_stats` recomputes it from the bookings.
+
+    day: calendar day in settings.TIME_ZONE
+    bookings:       bookings starting that day (cancelled ones included)
+    cancellations:  of those, how many were cancelled
+    booked_minutes: minutes of that day covered by ACTIVE bookings (multi-day bookings are split)
+    Plain (signed) integers: a cancel of a booking older than the rollup must not fail the cancel.
+    """
+    resource = models.ForeignKey(
+        Resource,
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    day = models.DateField()
+
+    bookings = models.IntegerField(default=0)
+    cancellations = models.IntegerField(default=0)
+    booked_minutes = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            # upsert target + the (resource, day range) index of the stats endpoint
+            models.UniqueConstraint(fields=["resource", "day"], name="resource_daily_stats_uniq"),
+        ]
+
+    def __str__(self):
+        return f"{self.resource_id} {self.day}"
+
+
+class ResourceOccupancy(models.Model):
+    """
+    Per-resource, per-day occupancy bitmap behind GET /resources/occupancy/ (resources.occupancy).
+
+    slots: 96 bits, one per 15-minute slot of the day (settings.TIME_ZONE), little-endian
+           12 bytes; bit i set = an ACTIVE booking intersects [00:00 + 15*i min, +15 min).
+    Refreshed by the booking services inside their transactions; rebuilt together with
+    ResourceDailyStats by `manage.py rebuild_resource_stats`.
+    """
+    resource = models.ForeignKey(
+        Resource,
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    day = models.DateField()
+    slots = models.BinaryField(max_length=12)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["resource", "day"], name="resource_occupancy_uniq"),
+        ]
+
+    def __str__(self):
+        return f"{self.resource_id} {self.day}"
@@ -0,0 +1,197 @@
+"""
+Occupancy bitmaps for calendar heatmaps (GET /resources/occupancy/).
+
+MIN_DURATION is 15 minutes, so a resource-day is 96 slots: one Python int mask,
+stored as 12 little-endian bytes in ResourceOccupancy. A booking becomes a run
+of set bits per day; a day's mask is the OR of its bookings' masks.
+
+refresh() recomputes the touched days from the ACTIVE bookings (one SELECT + one
+upsert), so cancels need no bit bookkeeping: two bookings may share a slot when
+they don't start/end on a 15-minute boundary. The read must come after every
+concurrent write of those days: the lock engine, bulk and cancel paths call it
+holding the Resource row lock; the constraint engine (no resource lock) passes
+lock_days=True, which locks the day rows first (same-day inserts queue, others don't).
+
+heatmap() never looks at intervals: the masks of all resources × days are laid
+out in one bytearray and each cell is a popcount, done per byte with
+bytes.translate (C loops over the whole grid); whole days add the byte counts
+with SWAR arithmetic on one big int. See `manage.py bench_occupancy`.
+"""
+import math
+from collections import defaultdict
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.bookings.models import Booking, BookingArchive, BookingStatus
+from .models import ResourceOccupancy
+from .stats import day_spans
+
+SLOT_MINUTES = 15
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+MASK_BYTES = SLOTS_PER_DAY // 8
+
+# cell width in minutes -> slots per cell
+GRANULARITIES = {15: 1, 30: 2, 60: 4, 120: 8, 1440: SLOTS_PER_DAY}
+
+
+def booking_masks(start_at, end_at) -> list[tuple]:
+    """[start_at, end_at) -> [(day, mask), ...]; a slot is set if the booking intersects it."""
+    masks = []
+    for day, start, end in day_spans(start_at, end_at):
+        first = int(start // SLOT_MINUTES)
+        last = min(SLOTS_PER_DAY, math.ceil(end / SLOT_MINUTES))  # 25-hour (DST) days are clipped
+        if last > first:
+            masks.append((day, ((1 << (last - first)) - 1) << first))
+    return masks
+
+
+def _day_bounds(first_day, last_day) -> tuple:
+    tz = timezone.get_default_timezone()
+    lo = datetime.combine(first_day, time.min, tzinfo=tz).astimezone(dt_timezone.utc)
+    hi = datetime.combine(last_day + timedelta(days=1), time.min, tzinfo=tz).astimezone(dt_timezone.utc)
+    return lo, hi
+
+
+def refresh(bookings, *, lock_days: bool = False) -> None:
+    """
+    Recompute the days touched by `bookings` (just written) from the ACTIVE bookings.
+    lock_days: the caller holds no Resource row lock; lock the day rows before reading.
+    """
+    days: dict = defaultdict(set)
+    for b in bookings:
+        days[b.resource_id].update(day for day, _ in booking_masks(b.start_at, b.end_at))
+    if not days:
+        return
+
+    masks = {(resource_id, day): 0 for resource_id, ds in sorted(days.items()) for day in sorted(ds)}
+    if lock_days:
+        _lock_days(list(masks))
+    window = Q()
+    for resource_id, ds in days.items():
+        lo, hi = _day_bounds(min(ds), max(ds))
+        window |= Q(resource_id=resource_id, start_at__lt=hi, end_at__gt=lo)
+    rows = (
+        Booking.objects.filter(window, status=BookingStatus.ACTIVE)
+        .values_list("resource_id", "start_at", "end_at")
+    )
+    for resource_id, start_at, end_at in rows:
+        for day, mask in booking_masks(start_at, end_at):
+            key = (resource_id, day)
+            if key in masks:
+                masks[key] |= mask
+
+    ResourceOccupancy.objects.bulk_create(
+        [
+            ResourceOccupancy(resource_id=resource_id, day=day, slots=mask.to_bytes(MASK_BYTES, "little"))
+            for (resource_id, day), mask in masks.items()
+        ],
+        update_conflicts=True,
+        unique_fields=["resource", "day"],
+        update_fields=["slots"],
+    )
+
+
+def _lock_days(keys: list) -> None:
+    """
+    Row-lock the (resource_id, day) rows in key order, creating the missing ones.
+    A concurrent writer of the same day waits here until it commits, so the
+    bookings read afterwards (a new READ COMMITTED snapshot) include its booking.
+    """
+    empty = bytes(MASK_BYTES)
+    ResourceOccupancy.objects.bulk_create(
+        [ResourceOccupancy(resource_id=resource_id, day=day, slots=empty) for resource_id, day in keys],
+        ignore_conflicts=True,
+    )
+    window = Q()
+    for resource_id, day in keys:
+        window |= Q(resource_id=resource_id, day=day)
+    list(ResourceOccupancy.objects.select_for_update().filter(window).order_by("resource_id", "day").values_list("pk"))
+
+
+def rebuild(resource_ids: list) -> int:
+    """
+    Recompute the bitmaps of `resource_ids` from Booking + BookingArchive; returns rows written.
+    Same locking contract as stats.rebuild.
+    """
+    masks: dict = defaultdict(int)
+    for model in (Booking, BookingArchive):
+        rows = (
+            model.objects.filter(resource_id__in=resource_ids, status=BookingStatus.ACTIVE)
+            .values_list("resource_id", "start_at", "end_at")
+            .iterator(chunk_size=5000)
+        )
+        for resource_id, start_at, end_at in rows:
+            for day, mask in booking_masks(start_at, end_at):
+                masks[(resource_id, day)] |= mask
+
+    ResourceOccupancy.objects.filter(resource_id__in=resource_ids).delete()
+    ResourceOccupancy.objects.bulk_create(
+        [
+            ResourceOccupancy(resource_id=resource_id, day=day, slots=mask.to_bytes(MASK_BYTES, "little"))
+            for (resource_id, day), mask in masks.items()
+        ],
+        batch_size=2000,
+    )
+    return len(masks)
+
+
+def _lane_tables(width: int) -> list[bytes]:
+    """For cells of `width` slots (1, 2, 4, 8): per lane of a byte, byte -> popcount of that lane."""
+    lane_mask = (1 << width) - 1
+    return [
+        bytes(((b >> (lane * width)) & lane_mask).bit_count() for b in range(256))
+        for lane in range(8 // width)
+    ]
+
+
+_TABLES = {width: _lane_tables(width) for width in GRANULARITIES.values() if width <= 8}
+
+
+def _day_counts(byte_counts: bytes) -> bytes:
+    """
+    Per-byte popcounts (<= 8) -> per-day sums (<= 96): SWAR adds over the grid as one int,
+    bytes into 16-bit lanes, those into 32-bit lanes, then the three lanes of each day.
+    """
+    n = len(byte_counts)
+    x = int.from_bytes(byte_counts, "little")
+    m16 = int.from_bytes(b"\xff\x00" * (n // 2), "little")
+    x = (x & m16) + ((x >> 8) & m16)
+    m32 = int.from_bytes(b"\xff\xff\x00\x00" * (n // 4), "little")
+    x = (x & m32) + ((x >> 16) & m32)
+    day = int.from_bytes(b"\xff" * 4 + b"\x00" * (MASK_BYTES - 4), "little")
+    m_day = int.from_bytes(day.to_bytes(MASK_BYTES, "little") * (n // MASK_BYTES), "little")
+    x = (x & m_day) + ((x >> 32) & m_day) + ((x >> 64) & m_day)
+    return x.to_bytes(n, "little")[::MASK_BYTES]
+
+
+def heatmap(resource_ids: list, rows, *, day_from, days: int, granularity: int) -> list[bytes]:
+    """
+    resources × cells matrix: one row per resource id (input order), each row a bytes
+    of days * cells_per_day values = occupied slots in that cell (0..slots per cell).
+
+    rows: (resource_id, day, slots bytes); days without a row are free.
+    """
+    width = GRANULARITIES[granularity]
+    row_bytes = days * MASK_BYTES
+    index = {resource_id: i for i, resource_id in enumerate(resource_ids)}
+
+    grid = bytearray(len(resource_ids) * row_bytes)
+    for resource_id, day, slots in rows:
+        offset = index[resource_id] * row_bytes + (day - day_from).days * MASK_BYTES
+        grid[offset:offset + MASK_BYTES] = slots
+
+    if width == SLOTS_PER_DAY:
+        counts = _day_counts(grid.translate(_TABLES[8][0]))
+        per_row = days
+    else:
+        tables = _TABLES[width]
+        lanes = len(tables)
+        cells = bytearray(len(grid) * lanes)
+        for lane, table in enumerate(tables):
+            cells[lane::lanes] = grid.translate(table)  # little-endian: lane 0 = earliest slots
+        counts = bytes(cells)
+        per_row = row_bytes * lanes
+
+    return [counts[i * per_row:(i + 1) * per_row] for i in range(len(resource_ids))]
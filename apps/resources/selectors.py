@@ -1,17 +1,186 @@
-from django.db.models import QuerySet
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import BooleanField, Exists, OuterRef, QuerySet
+from django.db.models.expressions import RawSQL
+
+from common.dates import parse_day, parse_dt
+from common.db import is_postgres
+from common.db_routing import read_db
 from common.exceptions import ValidationError
-from .models import Resource
+from common.ids import parse_uuid
+from apps.bookings.models import Booking, BookingStatus
+from .models import Resource, ResourceDailyStats, ResourceOccupancy
+from .serializers import RESOURCE_FIELDS
+from .occupancy import GRANULARITIES, SLOTS_PER_DAY
+
+
+STATS_MAX_DAYS = 366
+
+# list order; "id" makes the key unique so it doubles as the keyset cursor key
+RESOURCE_LIST_ORDERING = ("name", "-created_at", "id")
 
 
 def list_resources(*, owner_id: str | None = None) -> QuerySet:
-    qs = Resource.objects.select_related("owner").all()
+    """Rows as dicts of RESOURCE_FIELDS (format with resource_row); no owner join."""
+    qs = Resource.objects.using(read_db()).values(*RESOURCE_FIELDS)
     if owner_id:
         qs = qs.filter(owner_id=owner_id)
-    return qs.order_by("name", "-created_at")
+    return qs.order_by(*RESOURCE_LIST_ORDERING)
 
 
 def get_resource(*, resource_id: str) -> Resource:
+    """Model instance for the write paths (update/delete) and permission checks."""
     try:
-        return Resource.objects.select_related("owner").get(id=resource_id)
+        return Resource.objects.using(read_db()).get(id=resource_id)
     except Resource.DoesNotExist:
         raise ValidationError("Resource not found", details={"resource_id": resource_id})
+
+
+# GET /resources/{id}/: the response fields + the conditional GET validators
+RESOURCE_DETAIL_FIELDS = (*RESOURCE_FIELDS, "version", "updated_at")
+
+
+def get_resource_row(*, resource_id: str) -> dict:
+    try:
+        return Resource.objects.using(read_db()).values(*RESOURCE_DETAIL_FIELDS).get(id=resource_id)
+    except Resource.DoesNotExist:
+        raise ValidationError("Resource not found", details={"resource_id": resource_id})
+
+
+async def aget_resource_row(*, resource_id: str) -> dict:
+    try:
+        return await Resource.objects.using(read_db()).values(*RESOURCE_DETAIL_FIELDS).aget(id=resource_id)
+    except Resource.DoesNotExist:
+        raise ValidationError("Resource not found", details={"resource_id": resource_id})
+
+
+RESOURCE_VERSION_FIELDS = ("version", "updated_at", "bookings_version")
+
+
+def get_resource_versions(*, resource_id: str) -> dict | None:
+    """
+    Conditional GET validators: one primary-key lookup, no joins.
+    None for an unknown/malformed id -> the caller takes its normal (error) path.
+    """
+    try:
+        return Resource.objects.using(read_db()).values(*RESOURCE_VERSION_FIELDS).get(id=resource_id)
+    except (Resource.DoesNotExist, DjangoValidationError):
+        return None
+
+
+async def aget_resource_versions(*, resource_id: str) -> dict | None:
+    try:
+        return await Resource.objects.using(read_db()).values(*RESOURCE_VERSION_FIELDS).aget(id=resource_id)
+    except (Resource.DoesNotExist, DjangoValidationError):
+        return None
+
+
+def list_available_resources(
+    *,
+    start_at: str | None,
+    end_at: str | None,
+    owner_id: str | None = None,
+) -> QuerySet:
+    """
+    Resources with no ACTIVE booking intersecting [start_at, end_at).
+
+    Single anti-join: WHERE NOT EXISTS (overlapping active booking of this resource).
+    Each probe is an index lookup, so with keyset pagination Postgres walks the
+    resources in order and stops as soon as a page of free ones is found.
+    """
+    start = parse_dt(start_at, "start_at")
+    end = parse_dt(end_at, "end_at")
+    if not start or not end:
+        raise ValidationError("start_at and end_at are required")
+    if start >= end:
+        raise ValidationError("start_at must be < end_at")
+
+    busy = Booking.objects.filter(
+        resource_id=OuterRef("pk"),
+        status=BookingStatus.ACTIVE,
+        start_at__lt=end,
+        end_at__gt=start,
+    )
+    if is_postgres():
+        # same predicate as a range overlap -> lets the planner use the GiST index
+        # behind the bookings_no_active_overlap exclusion constraint
+        busy = busy.filter(
+            RawSQL(
+                "tstzrange(start_at, end_at, '[)') && tstzrange(%s, %s, '[)')",
+                (start, end),
+                output_field=BooleanField(),
+            )
+        )
+
+    qs = Resource.objects.using(read_db()).filter(~Exists(busy))
+    if owner_id:
+        qs = qs.filter(owner_id=parse_uuid(owner_id, "owner"))
+    return qs.values(*RESOURCE_FIELDS)
+
+
+def list_daily_stats(*, resource_id, date_from: str | None, date_to: str | None):
+    """
+    Rollup rows of [date_from, date_to] (days, inclusive), ordered by day.
+    Reads ResourceDailyStats only (one index range scan), never Booking.
+    Returns (day_from, day_to, rows); days without bookings have no row.
+    """
+    df = parse_day(date_from, "from")
+    dt = parse_day(date_to, "to")
+    if not df or not dt:
+        raise ValidationError("from and to are required", details={"from": date_from, "to": date_to})
+    if df > dt:
+        raise ValidationError("from must be <= to")
+    if (dt - df).days + 1 > STATS_MAX_DAYS:
+        raise ValidationError("Time range is too large", details={"max_days": STATS_MAX_DAYS})
+
+    rows = (
+        ResourceDailyStats.objects.using(read_db())
+        .filter(resource_id=resource_id, day__gte=df, day__lte=dt)
+        .order_by("day")
+        .values("day", "bookings", "cancellations", "booked_minutes")
+    )
+    return df, dt, list(rows)
+
+
+def get_occupancy_grid(
+    *,
+    owner_id: str | None,
+    date_from: str | None,
+    date_to: str | None,
+    granularity: int,
+    max_cells: int,
+):
+    """
+    Inputs of occupancy.heatmap for the resources of `owner_id` (all when empty), in list order.
+    Two queries: the resources, then their bitmap rows of [date_from, date_to].
+    Returns (day_from, day_to, resources, rows).
+    """
+    if granularity not in GRANULARITIES:
+        raise ValidationError("Invalid granularity", details={"granularity": sorted(GRANULARITIES)})
+    df = parse_day(date_from, "from")
+    dt = parse_day(date_to, "to")
+    if not df or not dt:
+        raise ValidationError("from and to are required", details={"from": date_from, "to": date_to})
+    if df > dt:
+        raise ValidationError("from must be <= to")
+    days = (dt - df).days + 1
+    if days > STATS_MAX_DAYS:
+        raise ValidationError("Time range is too large", details={"max_days": STATS_MAX_DAYS})
+
+    cells_per_resource = days * SLOTS_PER_DAY // GRANULARITIES[granularity]
+    max_resources = max(1, max_cells // cells_per_resource)
+    try:
+        resources = list(list_resources(owner_id=owner_id)[: max_resources + 1])
+    except DjangoValidationError:
+        raise ValidationError("Invalid owner id", details={"owner": owner_id})
+    if len(resources) > max_resources:
+        raise ValidationError(
+            "Heatmap is too large; narrow the range, coarsen granularity or filter by owner",
+            details={"max_cells": max_cells},
+        )
+
+    rows = (
+        ResourceOccupancy.objects.using(read_db())
+        .filter(resource_id__in=[r["id"] for r in resources], day__gte=df, day__lte=dt)
+        .values_list("resource_id", "day", "slots")
+    )
+    return df, dt, resources, list(rows)
@@ -1,5 +1,7 @@
 from rest_framework import serializers
 
+from common.formatting import format_datetime
+
 
 class ResourceCreateSerializer(serializers.Serializer):
     name = serializers.CharField(max_length=255)
@@ -14,3 +16,22 @@ class ResourceOutSerializer(serializers.Serializer):
     name = serializers.CharField()
     owner_id = serializers.UUIDField()
     created_at = serializers.DateTimeField()
+
+
+# Projection read path: `.values(*RESOURCE_FIELDS)` rows formatted by resource_row()
+# give exactly the JSON of ResourceOutSerializer; shared by list, detail, create and update.
+RESOURCE_FIELDS = ("id", "name", "owner_id", "created_at")
+
+
+def resource_row(row: dict) -> dict:
+    return {
+        "id": str(row["id"]),
+        "name": row["name"],
+        "owner_id": str(row["owner_id"]),
+        "created_at": format_datetime(row["created_at"]),
+    }
+
+
+def resource_out(resource) -> dict:
+    """resource_row() of a model instance (create/update responses)."""
+    return resource_row({name: getattr(resource, name) for name in RESOURCE_FIELDS})
@@ -1,3 +1,4 @@
+
 from common.exceptions import ValidationError, PermissionDenied
 from .models import Resource
 
@@ -18,25 +19,29 @@ def _is_admin(user) -> bool:
     return bool(getattr(user, "is_staff", False) or getattr(user, "is_superuser", False))
 
 
-def update_resource(*, actor, resource: Resource, name: str) -> Resource:
+def ensure_can_manage(*, actor, resource: Resource, action: str) -> None:
+    """Owner or admin only."""
     if not (_is_admin(actor) or str(resource.owner_id) == str(actor.id)):
-        raise PermissionDenied("You don't have permission to update this resource.")
+        raise PermissionDenied(f"You don't have permission to {action} this resource.")
+
+
+def update_resource(*, actor, resource: Resource, name: str) -> Resource:
+    ensure_can_manage(actor=actor, resource=resource, action="update")
 
     name = (name or "").strip()
     if not name:
         raise ValidationError("name is required")
 
-    if Resource.objects.filter(owner=resource.owner, name=name).exclude(id=resource.id).exists():
+    if Resource.objects.filter(owner_id=resource.owner_id, name=name).exclude(id=resource.id).exists():
         raise ValidationError("Resource with this name already exists", details={"name": name})
 
     resource.name = name
-    resource.save(update_fields=["name"])
+    resource.save(update_fields=["name", "updated_at"])  # bumps version (new ETag)
     return resource
 
 
 def delete_resource(*, actor, resource: Resource) -> None:
-    if not (_is_admin(actor) or str(resource.owner_id) == str(actor.id)):
-        raise PermissionDenied("You don't have permission to delete this resource.")
+    ensure_can_manage(actor=actor, resource=resource, action="delete")
 
     resource.delete()
 
@@ -0,0 +1,126 @@
+"""
+ResourceDailyStats maintenance.
+
+The booking services call record_created / record_cancelled inside their own
+transactions: one upsert statement per write, rows are incremented in the DB
+(INSERT ... ON CONFLICT DO UPDATE SET x = x + excluded.x), so concurrent writers
+never overwrite each other's counts. rebuild() recomputes resources from scratch.
+"""
+from collections import defaultdict
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+
+from django.db import connection
+from django.utils import timezone
+
+from apps.bookings.models import Booking, BookingArchive, BookingStatus
+from .models import ResourceDailyStats
+
+# (resource_id, day) -> [bookings, cancellations, booked_minutes]
+Deltas = dict[tuple, list[int]]
+
+_COUNTERS = ("bookings", "cancellations", "booked_minutes")
+
+
+def day_spans(start_at, end_at) -> list[tuple]:
+    """
+    [start_at, end_at) split at local midnights -> [(day, start_minute, end_minute), ...],
+    minutes counted from that day's local midnight.
+    """
+    tz = timezone.get_default_timezone()
+    start, end = start_at.astimezone(dt_timezone.utc), end_at.astimezone(dt_timezone.utc)
+    day = start_at.astimezone(tz).date()
+    pieces = []
+    while start < end:
+        # compared/subtracted in UTC: aware arithmetic within one zone ignores DST shifts
+        midnight = datetime.combine(day, time.min, tzinfo=tz).astimezone(dt_timezone.utc)
+        next_midnight = datetime.combine(day + timedelta(days=1), time.min, tzinfo=tz).astimezone(dt_timezone.utc)
+        piece_end = min(end, next_midnight)
+        pieces.append((
+            day,
+            (start - midnight).total_seconds() / 60,
+            (piece_end - midnight).total_seconds() / 60,
+        ))
+        start, day = piece_end, day + timedelta(days=1)
+    return pieces
+
+
+def day_minutes(start_at, end_at) -> list[tuple]:
+    """[start_at, end_at) split at local midnights -> [(day, minutes), ...]."""
+    return [(day, round(end - start)) for day, start, end in day_spans(start_at, end_at)]
+
+
+def _add(deltas: Deltas, *, resource_id, start_at, end_at, bookings=0, cancellations=0, minutes_sign=0) -> None:
+    first_day = start_at.astimezone(timezone.get_default_timezone()).date()
+    row = deltas[(resource_id, first_day)]
+    row[0] += bookings
+    row[1] += cancellations
+    if minutes_sign:
+        for day, minutes in day_minutes(start_at, end_at):
+            deltas[(resource_id, day)][2] += minutes_sign * minutes
+
+
+def record_created(bookings) -> None:
+    deltas: Deltas = defaultdict(lambda: [0, 0, 0])
+    for b in bookings:
+        _add(deltas, resource_id=b.resource_id, start_at=b.start_at, end_at=b.end_at, bookings=1, minutes_sign=1)
+    apply(deltas)
+
+
+def record_cancelled(booking) -> None:
+    deltas: Deltas = defaultdict(lambda: [0, 0, 0])
+    _add(deltas, resource_id=booking.resource_id, start_at=booking.start_at, end_at=booking.end_at,
+         cancellations=1, minutes_sign=-1)
+    apply(deltas)
+
+
+def apply(deltas: Deltas) -> None:
+    """One upsert for all (resource, day) rows; counters are added to the stored values."""
+    if not deltas:
+        return
+    table = ResourceDailyStats._meta.db_table
+    resource_field = ResourceDailyStats._meta.get_field("resource")
+    day_field = ResourceDailyStats._meta.get_field("day")
+
+    params = []
+    for (resource_id, day), counters in deltas.items():
+        params += [
+            resource_field.get_db_prep_save(resource_id, connection),
+            day_field.get_db_prep_save(day, connection),
+            *counters,
+        ]
+    values = ", ".join(["(%s, %s, %s, %s, %s)"] * len(deltas))
+    updates = ", ".join(f"{name} = {table}.{name} + excluded.{name}" for name in _COUNTERS)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {table} (resource_id, day, {', '.join(_COUNTERS)}) VALUES {values} "
+            f"ON CONFLICT (resource_id, day) DO UPDATE SET {updates}",
+            params,
+        )
+
+
+def rebuild(resource_ids: list) -> int:
+    """
+    Recompute the rows of `resource_ids` from Booking + BookingArchive; returns rows written.
+    Call inside a transaction that holds the resources' row locks (no booking writes meanwhile).
+    """
+    deltas: Deltas = defaultdict(lambda: [0, 0, 0])
+    for model in (Booking, BookingArchive):
+        rows = (
+            model.objects.filter(resource_id__in=resource_ids)
+            .values_list("resource_id", "start_at", "end_at", "status")
+            .iterator(chunk_size=5000)
+        )
+        for resource_id, start_at, end_at, status in rows:
+            active = status == BookingStatus.ACTIVE
+            _add(deltas, resource_id=resource_id, start_at=start_at, end_at=end_at,
+                 bookings=1, cancellations=0 if active else 1, minutes_sign=1 if active else 0)
+
+    ResourceDailyStats.objects.filter(resource_id__in=resource_ids).delete()
+    ResourceDailyStats.objects.bulk_create(
+        [
+            ResourceDailyStats(resource_id=resource_id, day=day, bookings=b, cancellations=c, booked_minutes=m)
+            for (resource_id, day), (b, c, m) in deltas.items()
+        ],
+        batch_size=2000,
+    )
+    return len(deltas)
@@ -0,0 +1,106 @@
+import json
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.test import AsyncRequestFactory
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from django.contrib.auth import get_user_model
+
+from apps.resources.models import Resource
+from apps.resources.views import AsyncResourceCollectionView, AsyncResourceDetailView
+from apps.bookings.models import Booking, BookingStatus
+from apps.bookings.views import AsyncBookingCollectionView
+from common.async_views import AsyncAPIView
+
+User = get_user_model()
+
+
+class AsyncReadViewTests(APITestCase):
+    """
+    Async views are called directly (urls pick them only when ASYNC_READ_VIEWS is on);
+    every body must match the DRF view's byte for byte.
+    """
+
+    def setUp(self):
+        self.client.post("/auth/register/", {"email": "a@a.com", "password": "StrongPass123", "full_name": "A"}, format="json")
+        login = self.client.post("/auth/login/", {"email": "a@a.com", "password": "StrongPass123"}, format="json")
+        self.token = login.data["access_token"]
+        self.auth = {"HTTP_AUTHORIZATION": f"Bearer {self.token}"}
+        self.headers = {"Authorization": f"Bearer {self.token}"}
+        self.user = User.objects.get(email="a@a.com")
+
+        self.resources = [Resource.objects.create(name=f"Room {i}", owner=self.user) for i in range(3)]
+        now = timezone.now()
+        for i in range(3):
+            Booking.objects.create(
+                resource=self.resources[0],
+                user=self.user,
+                start_at=now + timedelta(hours=2 * i + 1),
+                end_at=now + timedelta(hours=2 * i + 2),
+                status=BookingStatus.ACTIVE,
+            )
+        self.factory = AsyncRequestFactory()
+
+    async def _async_get(self, view, path, auth=True, **kwargs):
+        request = self.factory.get(path, headers=self.headers if auth else {})
+        return await view.as_view()(request, **kwargs)
+
+    async def _sync_async(self, path):
+        return await sync_to_async(self.client.get)(path, **self.auth)
+
+    async def test_resource_list_matches_sync(self):
+        for query in ("", "?page_size=2&count=none", "?page_size=2&cursor="):
+            res = await self._async_get(AsyncResourceCollectionView, f"/resources/{query}")
+            expected = await self._sync_async(f"/resources/{query}")
+            self.assertEqual(res.status_code, 200)
+            self.assertEqual(res.content, expected.content)
+
+    async def test_resource_detail_matches_sync(self):
+        rid = self.resources[1].id
+        res = await self._async_get(AsyncResourceDetailView, f"/resources/{rid}/", resource_id=rid)
+        expected = await self._sync_async(f"/resources/{rid}/")
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.content, expected.content)
+
+    async def test_booking_list_matches_sync(self):
+        path = f"/bookings/?resource={self.resources[0].id}&page_size=2&count=estimate"
+        res = await self._async_get(AsyncBookingCollectionView, path)
+        expected = await self._sync_async(path)
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.content, expected.content)
+        self.assertEqual(json.loads(res.content)["count"], 3)
+
+    async def test_errors_use_app_error_format(self):
+        res = await self._async_get(AsyncBookingCollectionView, "/bookings/?page=x")
+        self.assertEqual(res.status_code, 400)
+        self.assertEqual(json.loads(res.content)["error"]["code"], "VALIDATION_ERROR")
+
+        missing = "00000000-0000-0000-0000-000000000000"
+        res = await self._async_get(AsyncResourceDetailView, f"/resources/{missing}/", resource_id=missing)
+        self.assertEqual(res.status_code, 400)
+        self.assertEqual(json.loads(res.content)["error"]["message"], "Resource not found")
+
+    async def test_requires_auth(self):
+        res = await self._async_get(AsyncResourceCollectionView, "/resources/", auth=False)
+        self.assertEqual(res.status_code, 403)
+
+    async def test_writes_are_delegated_to_drf_view(self):
+        request = self.factory.post(
+            "/resources/",
+            data=json.dumps({"name": "Room new"}),
+            content_type="application/json",
+            headers=self.headers,
+        )
+        res = await AsyncResourceCollectionView.as_view()(request)
+        res.render()
+        self.assertEqual(res.status_code, 201)
+        self.assertEqual(json.loads(res.content)["name"], "Room new")
+
+    async def test_missing_get_is_method_not_allowed(self):
+        class WriteOnlyView(AsyncAPIView):
+            sync_view = AsyncResourceCollectionView.sync_view
+
+        res = await self._async_get(WriteOnlyView, "/resources/")
+        self.assertEqual(res.status_code, 405)
+        self.assertNotIn("GET", res["Allow"])
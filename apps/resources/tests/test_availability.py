@@ -0,0 +1,78 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+from urllib.parse import urlencode
+
+from rest_framework.test import APITestCase
+from django.contrib.auth import get_user_model
+
+from apps.resources.models import Resource
+from apps.bookings.models import Booking, BookingStatus
+
+User = get_user_model()
+
+
+class ResourceAvailabilityTests(APITestCase):
+    def setUp(self):
+        self.client.post("/auth/register/", {"email": "a@a.com", "password": "StrongPass123", "full_name": "A"}, format="json")
+        login = self.client.post("/auth/login/", {"email": "a@a.com", "password": "StrongPass123"}, format="json")
+        self.token = login.data["access_token"]
+
+        self.user = User.objects.get(email="a@a.com")
+        self.resource = Resource.objects.create(name="Room A", owner=self.user)
+        self.day = datetime(2030, 1, 7, tzinfo=dt_timezone.utc)
+
+        for start_h, end_h, status in [
+            (9, 10, BookingStatus.ACTIVE),
+            (9.5, 11, BookingStatus.ACTIVE),  # overlaps previous (legacy data) -> merged
+            (11.1, 12, BookingStatus.ACTIVE),  # leaves a 6 minute gap -> too short
+            (14, 15, BookingStatus.CANCELLED),  # cancelled -> free
+        ]:
+            Booking.objects.create(
+                resource=self.resource,
+                user=self.user,
+                start_at=self.day + timedelta(hours=start_h),
+                end_at=self.day + timedelta(hours=end_h),
+                status=status,
+            )
+
+    def _get(self, **params):
+        params.setdefault("from", (self.day + timedelta(hours=8)).isoformat())
+        params.setdefault("to", (self.day + timedelta(hours=18)).isoformat())
+        return self.client.get(
+            f"/resources/{self.resource.id}/availability/?{urlencode(params)}",
+            HTTP_AUTHORIZATION=f"Bearer {self.token}",
+        )
+
+    def test_free_slots(self):
+        res = self._get()
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(
+            res.data["slots"],
+            [
+                {"start_at": "2030-01-07T08:00:00Z", "end_at": "2030-01-07T09:00:00Z"},
+                {"start_at": "2030-01-07T12:00:00Z", "end_at": "2030-01-07T18:00:00Z"},
+            ],
+        )
+
+    def test_min_duration_filters_gaps(self):
+        res = self._get(min_duration=90)
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(len(res.data["slots"]), 1)
+        self.assertEqual(res.data["slots"][0]["start_at"], "2030-01-07T12:00:00Z")
+
+    def test_single_booking_query(self):
+        # auth + resource lookup + one interval query
+        with self.assertNumQueries(3):
+            res = self._get()
+        self.assertEqual(res.status_code, 200)
+
+    def test_min_duration_below_minimum_fails(self):
+        res = self._get(min_duration=5)
+        self.assertEqual(res.status_code, 400)
+        self.assertEqual(res.data["error"]["code"], "VALIDATION_ERROR")
+
+    def test_range_required(self):
+        res = self.client.get(
+            f"/resources/{self.resource.id}/availability/",
+            HTTP_AUTHORIZATION=f"Bearer {self.token}",
+        )
+        self.assertEqual(res.status_code, 400)
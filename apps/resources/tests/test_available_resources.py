@@ -0,0 +1,104 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+from urllib.parse import urlencode
+
+from rest_framework.test import APITestCase
+from django.contrib.auth import get_user_model
+
+from apps.resources.models import Resource
+from apps.bookings.models import Booking, BookingStatus
+
+User = get_user_model()
+
+
+class AvailableResourcesTests(APITestCase):
+    def setUp(self):
+        self.client.post("/auth/register/", {"email": "a@a.com", "password": "StrongPass123", "full_name": "A"}, format="json")
+        login = self.client.post("/auth/login/", {"email": "a@a.com", "password": "StrongPass123"}, format="json")
+        self.token = login.data["access_token"]
+
+        self.user = User.objects.get(email="a@a.com")
+        self.other = User.objects.create_user(email="o@o.com", password="StrongPass123", full_name="O")
+        self.start = datetime(2030, 1, 7, 10, tzinfo=dt_timezone.utc)
+        self.end = self.start + timedelta(hours=1)
+
+        self.rooms = {name: Resource.objects.create(name=name, owner=self.user) for name in "ABCDE"}
+        self.foreign = Resource.objects.create(name="F", owner=self.other)
+
+        def book(room, start, end, status=BookingStatus.ACTIVE):
+            Booking.objects.create(resource=room, user=self.user, start_at=start, end_at=end, status=status)
+
+        book(self.rooms["A"], self.start - timedelta(minutes=30), self.start + timedelta(minutes=15))  # busy
+        book(self.rooms["B"], self.end, self.end + timedelta(hours=1))  # adjacent -> free
+        book(self.rooms["C"], self.start, self.end, status=BookingStatus.CANCELLED)  # cancelled -> free
+        book(self.rooms["D"], self.start + timedelta(minutes=20), self.start + timedelta(minutes=40))  # busy
+
+    def _get(self, **params):
+        params.setdefault("start_at", self.start.isoformat())
+        params.setdefault("end_at", self.end.isoformat())
+        return self.client.get(
+            f"/resources/available/?{urlencode(params)}",
+            HTTP_AUTHORIZATION=f"Bearer {self.token}",
+        )
+
+    def test_only_free_resources(self):
+        res = self._get()
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual([r["name"] for r in res.data["results"]], ["B", "C", "E", "F"])
+        self.assertIsNone(res.data["next_cursor"])
+
+    def test_owner_filter(self):
+        res = self._get(owner=str(self.other.id))
+        self.assertEqual([r["name"] for r in res.data["results"]], ["F"])
+
+    def test_invalid_owner(self):
+        res = self._get(owner="garbage")
+        self.assertEqual(res.status_code, 400)
+        self.assertEqual(res.data["error"]["code"], "VALIDATION_ERROR")
+
+    def test_cursor_walks_all_pages(self):
+        names, cursor = [], ""
+        while True:
+            res = self._get(page_size=1, cursor=cursor)
+            self.assertEqual(res.status_code, 200)
+            names += [r["name"] for r in res.data["results"]]
+            cursor = res.data["next_cursor"]
+            if not cursor:
+                break
+        self.assertEqual(names, ["B", "C", "E", "F"])
+
+    def test_tampered_cursor_rejected(self):
+        cursor = self._get(page_size=1).data["next_cursor"]
+        res = self._get(page_size=1, cursor=cursor[:-2] + "xx")
+        self.assertEqual(res.status_code, 400)
+        self.assertEqual(res.data["error"]["code"], "VALIDATION_ERROR")
+
+    def test_invalid_range(self):
+        res = self._get(start_at=self.end.isoformat(), end_at=self.start.isoformat())
+        self.assertEqual(res.status_code, 400)
+
+
+class KeysetPaginationTests(APITestCase):
+    def test_mixed_direction_ordering_with_ties(self):
+        from common.pagination import paginate_keyset
+
+        # same name for several rows -> ties broken by -created_at, then id
+        expected = []
+        for i in range(7):
+            owner = User.objects.create_user(email=f"k{i}@k.com", password="StrongPass123", full_name="K")
+            expected.append(Resource.objects.create(name="Room" if i % 2 else "Hall", owner=owner).id)
+        # identical created_at for some rows -> only id decides
+        first = Resource.objects.get(id=expected[0])
+        Resource.objects.filter(id__in=expected[:4]).update(created_at=first.created_at)
+
+        ordering = ("name", "-created_at", "id")
+        qs = Resource.objects.all()
+        seen, cursor = [], None
+        while True:
+            page = paginate_keyset(qs, ordering=ordering, cursor=cursor, page_size=2)
+            seen += [r.id for r in page["results"]]
+            cursor = page["next_cursor"]
+            if not cursor:
+                break
+
+        self.assertEqual(seen, list(qs.order_by(*ordering).values_list("id", flat=True)))
+        self.assertEqual(sorted(seen), sorted(expected))
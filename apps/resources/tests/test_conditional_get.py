@@ -0,0 +1,115 @@
+from datetime import timedelta
+
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from django.contrib.auth import get_user_model
+
+from apps.resources.models import Resource
+
+User = get_user_model()
+
+
+class ConditionalGetTests(APITestCase):
+    def setUp(self):
+        self.client.post("/auth/register/", {"email": "c@c.com", "password": "StrongPass123", "full_name": "C"}, format="json")
+        login = self.client.post("/auth/login/", {"email": "c@c.com", "password": "StrongPass123"}, format="json")
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {login.data['access_token']}")
+        self.user = User.objects.get(email="c@c.com")
+        self.room = Resource.objects.create(name="Room A", owner=self.user)
+        self.start = timezone.now() + timedelta(days=1)
+
+    def _book(self, hour: int):
+        res = self.client.post(
+            "/bookings/",
+            {
+                "resource_id": str(self.room.id),
+                "start_at": (self.start + timedelta(hours=hour)).isoformat(),
+                "end_at": (self.start + timedelta(hours=hour, minutes=30)).isoformat(),
+            },
+            format="json",
+        )
+        self.assertEqual(res.status_code, 201)
+        return res.data["id"]
+
+    def test_resource_detail_not_modified(self):
+        url = f"/resources/{self.room.id}/"
+        res = self.client.get(url)
+        self.assertEqual(res.status_code, 200)
+        etag = res["ETag"]
+        self.assertIn("Last-Modified", res)
+
+        # steady state: one primary-key lookup (auth is cached), no body
+        with self.assertNumQueries(1):
+            res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, 304)
+        self.assertEqual(res["ETag"], etag)
+        self.assertEqual(res.content, b"")
+
+    def test_resource_update_changes_etag(self):
+        url = f"/resources/{self.room.id}/"
+        etag = self.client.get(url)["ETag"]
+
+        res = self.client.patch(url, {"name": "Room B"}, format="json")
+        self.assertEqual(res.status_code, 200)
+
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.data["name"], "Room B")
+        self.assertNotEqual(res["ETag"], etag)
+
+    def test_any_save_changes_etag(self):
+        # admin / shell edits don't go through update_resource
+        url = f"/resources/{self.room.id}/"
+        etag = self.client.get(url)["ETag"]
+
+        self.room.name = "Room C"
+        self.room.save()
+        self.assertEqual(self.room.version, 2)
+
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.data["name"], "Room C")
+
+    def test_booking_list_not_modified_until_write(self):
+        self._book(1)
+        url = f"/bookings/?resource={self.room.id}"
+        res = self.client.get(url)
+        self.assertEqual(res.status_code, 200)
+        etag = res["ETag"]
+
+        # steady state: only the validator lookup, no COUNT / page query
+        with self.assertNumQueries(1):
+            res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, 304)
+
+        booking_id = self._book(2)
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.data["count"], 2)
+        etag = res["ETag"]
+
+        res = self.client.patch(f"/bookings/{booking_id}/cancel/")
+        self.assertEqual(res.status_code, 200)
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, 200)
+        self.assertNotEqual(res["ETag"], etag)
+
+    def test_bulk_create_changes_list_etag(self):
+        url = f"/bookings/?resource={self.room.id}"
+        etag = self.client.get(url)["ETag"]
+        res = self.client.post(
+            "/bookings/bulk/",
+            {"bookings": [{
+                "resource_id": str(self.room.id),
+                "start_at": (self.start + timedelta(hours=5)).isoformat(),
+                "end_at": (self.start + timedelta(hours=6)).isoformat(),
+            }]},
+            format="json",
+        )
+        self.assertEqual(res.status_code, 201)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_unfiltered_list_has_no_etag(self):
+        res = self.client.get("/bookings/")
+        self.assertEqual(res.status_code, 200)
+        self.assertNotIn("ETag", res)
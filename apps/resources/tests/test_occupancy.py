@@ -0,0 +1,125 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from apps.resources.models import Resource, ResourceOccupancy
+from apps.bookings.models import Booking, BookingStatus
+from apps.resources import occupancy
+from apps.resources.occupancy import booking_masks
+from common.testing import assert_query_budget
+
+User = get_user_model()
+
+
+class ResourceOccupancyTests(APITestCase):
+    def setUp(self):
+        self.client.post("/auth/register/", {"email": "o@o.com", "password": "StrongPass123", "full_name": "O"}, format="json")
+        login = self.client.post("/auth/login/", {"email": "o@o.com", "password": "StrongPass123"}, format="json")
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {login.data['access_token']}")
+        self.owner = User.objects.get(email="o@o.com")
+        self.room = Resource.objects.create(name="Room A", owner=self.owner)
+        self.day = (timezone.now() + timedelta(days=1)).date()
+        self.midnight = datetime.combine(self.day, datetime.min.time(), tzinfo=dt_timezone.utc)
+
+    def _book(self, start_minute, end_minute, resource=None):
+        res = self.client.post(
+            "/bookings/",
+            {"resource_id": str((resource or self.room).id),
+             "start_at": (self.midnight + timedelta(minutes=start_minute)).isoformat(),
+             "end_at": (self.midnight + timedelta(minutes=end_minute)).isoformat()},
+            format="json",
+        )
+        self.assertEqual(res.status_code, 201)
+        return res.data["id"]
+
+    def _mask(self):
+        row = ResourceOccupancy.objects.get(resource=self.room, day=self.day)
+        return int.from_bytes(bytes(row.slots), "little")
+
+    def _heatmap(self, granularity=60, days=1, owner=None):
+        url = (f"/resources/occupancy/?from={self.day.isoformat()}"
+               f"&to={(self.day + timedelta(days=days - 1)).isoformat()}&granularity={granularity}")
+        return self.client.get(url + (f"&owner={owner}" if owner else ""))
+
+    def test_create_and_cancel_maintain_bitmap(self):
+        # 10:00-10:20 and 10:20-10:45 share the 10:15 slot
+        first = self._book(600, 620)
+        self._book(620, 645)
+        self.assertEqual(self._mask(), 0b111 << 40)
+
+        self.client.patch(f"/bookings/{first}/cancel/")
+        self.assertEqual(self._mask(), 0b11 << 41)  # the shared slot stays set
+
+    def test_heatmap(self):
+        self._book(600, 660)                    # 10:00-11:00
+        self._book(23 * 60 + 30, 24 * 60 + 30)  # 23:30 -> 00:30 next day
+        other = Resource.objects.create(name="Room B", owner=self.owner)
+
+        with assert_query_budget(self, queries=2):  # resources + bitmap rows
+            res = self._heatmap(days=2)
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.data["cells_per_day"], 24)
+        rows = {r["id"]: r for r in res.data["resources"]}
+        cells = rows[str(self.room.id)]["cells"]
+        self.assertEqual(len(cells), 48)
+        self.assertEqual((cells[10], cells[23], cells[24]), (4, 2, 2))
+        self.assertEqual(sum(cells), 8)
+        self.assertEqual(rows[str(self.room.id)]["occupied_minutes"], 120)
+        self.assertEqual(rows[str(other.id)]["cells"], [0] * 48)
+
+        res = self._heatmap(granularity=1440, days=2)
+        self.assertEqual(res.data["resources"][0]["cells"], [6, 2])
+        res = self._heatmap(granularity=15)
+        self.assertEqual([i for i, c in enumerate(res.data["resources"][0]["cells"]) if c], [40, 41, 42, 43, 94, 95])
+
+    def test_owner_filter_and_validation(self):
+        stranger = User.objects.create_user(email="s@s.com", password="StrongPass123")
+        Resource.objects.create(name="Elsewhere", owner=stranger)
+        res = self._heatmap(owner=self.owner.id)
+        self.assertEqual([r["name"] for r in res.data["resources"]], ["Room A"])
+
+        self.assertEqual(self._heatmap(granularity=45).status_code, 400)
+        self.assertEqual(self._heatmap(granularity="hour").status_code, 400)
+        self.assertEqual(self._heatmap(owner="not-a-uuid").status_code, 400)
+        self.assertEqual(self.client.get("/resources/occupancy/?from=2026-01-01").status_code, 400)
+        with override_settings(OCCUPANCY_MAX_CELLS=30):
+            self.assertEqual(self._heatmap(granularity=60).status_code, 400)  # 2 resources x 24 cells
+            self.assertEqual(self._heatmap(granularity=60, owner=self.owner.id).status_code, 200)
+
+    def test_rebuild_matches_incremental(self):
+        first = self._book(600, 620)
+        self._book(620, 645)
+        self._book(23 * 60, 25 * 60)
+        self.client.patch(f"/bookings/{first}/cancel/")
+        incremental = {
+            (r.day, bytes(r.slots)) for r in ResourceOccupancy.objects.filter(resource=self.room)
+        }
+
+        ResourceOccupancy.objects.all().delete()
+        call_command("rebuild_resource_stats", stdout=StringIO())
+        rebuilt = {(r.day, bytes(r.slots)) for r in ResourceOccupancy.objects.filter(resource=self.room)}
+        self.assertEqual(rebuilt, incremental)
+
+    def test_refresh_with_day_locks(self):
+        # the constraint engine's path: day rows are created + locked before the read
+        self._book(600, 620)
+        booking = Booking.objects.create(
+            resource=self.room, user=self.owner, status=BookingStatus.ACTIVE,
+            start_at=self.midnight + timedelta(minutes=23 * 60), end_at=self.midnight + timedelta(minutes=25 * 60),
+        )
+        occupancy.refresh([booking], lock_days=True)
+        self.assertEqual(self._mask(), (0b11 << 40) | (0b1111 << 92))
+        next_day = ResourceOccupancy.objects.get(resource=self.room, day=self.day + timedelta(days=1))
+        self.assertEqual(int.from_bytes(bytes(next_day.slots), "little"), 0b1111)
+
+    def test_booking_masks(self):
+        start = datetime(2026, 3, 1, 23, 50, tzinfo=dt_timezone.utc)
+        self.assertEqual(
+            booking_masks(start, start + timedelta(minutes=40)),
+            [(start.date(), 1 << 95), (start.date() + timedelta(days=1), 0b11)],
+        )
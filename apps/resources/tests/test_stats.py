@@ -0,0 +1,104 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from apps.resources.models import Resource, ResourceDailyStats
+from apps.resources.stats import day_minutes
+from common.testing import assert_query_budget
+
+User = get_user_model()
+
+
+class ResourceStatsTests(APITestCase):
+    def setUp(self):
+        self.client.post("/auth/register/", {"email": "o@o.com", "password": "StrongPass123", "full_name": "O"}, format="json")
+        login = self.client.post("/auth/login/", {"email": "o@o.com", "password": "StrongPass123"}, format="json")
+        self.token = login.data["access_token"]
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.token}")
+        self.room = Resource.objects.create(name="Room A", owner=User.objects.get(email="o@o.com"))
+        # tomorrow 22:00 UTC -> 2h that day + 1h the next
+        self.day = (timezone.now() + timedelta(days=1)).date()
+        self.start = datetime.combine(self.day, datetime.min.time(), tzinfo=dt_timezone.utc) + timedelta(hours=22)
+
+    def _book(self, start, hours):
+        res = self.client.post(
+            "/bookings/",
+            {"resource_id": str(self.room.id), "start_at": start.isoformat(),
+             "end_at": (start + timedelta(hours=hours)).isoformat()},
+            format="json",
+        )
+        self.assertEqual(res.status_code, 201)
+        return res.data["id"]
+
+    def _stats(self, days=3):
+        return self.client.get(
+            f"/resources/{self.room.id}/stats/?from={self.day.isoformat()}"
+            f"&to={(self.day + timedelta(days=days - 1)).isoformat()}"
+        )
+
+    def _rows(self, *, skip_empty=False):
+        rows = {
+            s.day: (s.bookings, s.cancellations, s.booked_minutes)
+            for s in ResourceDailyStats.objects.filter(resource=self.room)
+        }
+        return {day: c for day, c in rows.items() if any(c)} if skip_empty else rows
+
+    def test_create_and_cancel_update_rollup(self):
+        booking_id = self._book(self.start, 3)
+        self._book(self.start - timedelta(hours=12), 1)
+        next_day = self.day + timedelta(days=1)
+        self.assertEqual(self._rows(), {self.day: (2, 0, 180), next_day: (0, 0, 60)})
+
+        self.client.patch(f"/bookings/{booking_id}/cancel/")
+        self.assertEqual(self._rows(), {self.day: (2, 1, 60), next_day: (0, 0, 0)})
+
+    def test_stats_endpoint(self):
+        self._book(self.start, 3)
+        self._book(self.start - timedelta(hours=12), 1)
+
+        with assert_query_budget(self, queries=2):  # resource + rollup range, no Booking query
+            res = self._stats()
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.data["totals"], {
+            "bookings": 2, "cancellations": 0, "booked_minutes": 240,
+            "occupancy_pct": round(240 * 100 / (3 * 1440), 2),
+            "bookings_per_day": 0.67, "cancellation_rate": 0.0,
+        })
+        self.assertEqual([d["date"] for d in res.data["days"]],
+                         [(self.day + timedelta(days=i)).isoformat() for i in range(3)])
+        self.assertEqual(res.data["days"][0]["occupancy_pct"], 12.5)
+        self.assertEqual(res.data["days"][2]["bookings"], 0)
+
+    def test_only_owner_or_admin(self):
+        self.client.post("/auth/register/", {"email": "x@x.com", "password": "StrongPass123", "full_name": "X"}, format="json")
+        login = self.client.post("/auth/login/", {"email": "x@x.com", "password": "StrongPass123"}, format="json")
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {login.data['access_token']}")
+        self.assertEqual(self._stats().status_code, 403)
+
+    def test_range_validation(self):
+        self.assertEqual(self.client.get(f"/resources/{self.room.id}/stats/?from=2026-01-01").status_code, 400)
+        self.assertEqual(self.client.get(f"/resources/{self.room.id}/stats/?from=2026-13-01&to=2026-12-01").status_code, 400)
+        self.assertEqual(self._stats(days=400).status_code, 400)
+
+    def test_rebuild_matches_incremental(self):
+        first = self._book(self.start, 3)
+        self._book(self.start - timedelta(hours=12), 1)
+        self.client.patch(f"/bookings/{first}/cancel/")
+        incremental = self._rows(skip_empty=True)  # cancellation leaves a 0/0/0 row behind
+
+        ResourceDailyStats.objects.all().delete()
+        out = StringIO()
+        call_command("rebuild_resource_stats", batch_size=1, stdout=out)
+        self.assertIn("for 1 resources", out.getvalue())
+        self.assertEqual(self._rows(), incremental)  # rebuild writes no empty rows
+
+    def test_day_minutes_split(self):
+        start = datetime(2026, 3, 1, 23, 30, tzinfo=dt_timezone.utc)
+        self.assertEqual(
+            day_minutes(start, start + timedelta(hours=25)),
+            [(start.date(), 30), (start.date() + timedelta(days=1), 1440), (start.date() + timedelta(days=2), 30)],
+        )
@@ -1,7 +1,27 @@
+from django.conf import settings
 from django.urls import path
-from .views import ResourceCollectionView, ResourceDetailView
+from .views import (
+    AsyncResourceCollectionView,
+    AsyncResourceDetailView,
+    ResourceCollectionView,
+    ResourceAvailableView,
+    ResourceDetailView,
+    ResourceOccupancyView,
+    ResourceAvailabilityView,
+    ResourceStatsView,
+)
+
+# GET served by the async views under ASGI (settings.ASYNC_READ_VIEWS), writes stay on DRF
+if settings.ASYNC_READ_VIEWS:
+    collection_view, detail_view = AsyncResourceCollectionView, AsyncResourceDetailView
+else:
+    collection_view, detail_view = ResourceCollectionView, ResourceDetailView
 
 urlpatterns = [
-    path("", ResourceCollectionView.as_view()),
-    path("<uuid:resource_id>/", ResourceDetailView.as_view()),
+    path("", collection_view.as_view()),
+    path("available/", ResourceAvailableView.as_view()),
+    path("occupancy/", ResourceOccupancyView.as_view()),
+    path("<uuid:resource_id>/", detail_view.as_view()),
+    path("<uuid:resource_id>/availability/", ResourceAvailabilityView.as_view()),
+    path("<uuid:resource_id>/stats/", ResourceStatsView.as_view()),
 ]
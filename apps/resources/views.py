@@ -1,56 +1,61 @@
+from datetime import timedelta
+
+from django.conf import settings
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 
 from common.responses import error_response
 from common.exceptions import AppError, ValidationError
-from common.pagination import paginate_queryset
+from common.formatting import format_datetime
+from common.async_views import AsyncAPIView, json_response
+from common.conditional import make_etag, not_modified, set_validators
+from common.pagination import apaginate, paginate, paginate_keyset, parse_paging
+from common.request_timing import timed
+
+from .occupancy import GRANULARITIES, SLOT_MINUTES, SLOTS_PER_DAY, heatmap
+from .serializers import ResourceCreateSerializer, ResourceUpdateSerializer, resource_out, resource_row
+from .services import create_resource, ensure_can_manage, update_resource, delete_resource
+from .selectors import (
+    RESOURCE_LIST_ORDERING,
+    aget_resource_row,
+    get_occupancy_grid,
+    get_resource,
+    get_resource_row,
+    list_available_resources,
+    list_daily_stats,
+    list_resources,
+)
+from apps.bookings.selectors import list_free_slots
+from apps.bookings.services import MIN_DURATION
 
-from .serializers import ResourceCreateSerializer, ResourceUpdateSerializer
-from .services import create_resource, update_resource, delete_resource
-from .selectors import list_resources, get_resource
+
+@timed("serialize")
+def _resource_list_body(paged: dict) -> dict:
+    # page meta depends on the mode: {page_size, next_cursor} for ?cursor=,
+    # otherwise {count, page, page_size, total_pages, ...} per ?count=
+    return {**paged, "results": [resource_row(row) for row in paged["results"]]}
 
 
 class ResourceCollectionView(APIView):
     """
-    GET  /resources/?owner=<uuid>&page=&page_size=
+    GET  /resources/?owner=<uuid>&page=&page_size=&count=exact|estimate|none
+    GET  /resources/?owner=<uuid>&cursor=&page_size=   (keyset mode, constant cost per page)
     POST /resources/
     """
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
         try:
-            owner_id = request.query_params.get("owner")
-            page = int(request.query_params.get("page", "1"))
-            page_size = int(request.query_params.get("page_size", "10"))
-
-            qs = list_resources(owner_id=owner_id)
-            paged = paginate_queryset(qs, page=page, page_size=page_size)
+            paging = parse_paging(request.query_params)
+            qs = list_resources(owner_id=request.query_params.get("owner"))
+            paged = paginate(qs, paging=paging, ordering=RESOURCE_LIST_ORDERING)
         except ValueError:
             return error_response(ValidationError("page and page_size must be integers"))
         except AppError as e:
             return error_response(e)
 
-        results = [
-            {
-                "id": str(r.id),
-                "name": r.name,
-                "owner_id": str(r.owner_id),
-                "created_at": r.created_at.isoformat().replace("+00:00", "Z"),
-            }
-            for r in paged["results"]
-        ]
-
-        return Response(
-            {
-                "count": paged["count"],
-                "page": paged["page"],
-                "page_size": paged["page_size"],
-                "total_pages": paged["total_pages"],
-                "results": results,
-            },
-            status=200,
-        )
+        return Response(_resource_list_body(paged), status=200)
 
     def post(self, request):
         ser = ResourceCreateSerializer(data=request.data)
@@ -65,14 +70,59 @@ class ResourceCollectionView(APIView):
         except AppError as e:
             return error_response(e)
 
+        return Response(resource_out(resource), status=201)
+
+
+class AsyncResourceCollectionView(AsyncAPIView):
+    """
+    ASGI twin of ResourceCollectionView: GET on the async ORM, POST delegated.
+    """
+    sync_view = ResourceCollectionView
+
+    async def get(self, request):
+        try:
+            paging = parse_paging(request.GET)
+            qs = list_resources(owner_id=request.GET.get("owner"))
+            paged = await apaginate(qs, paging=paging, ordering=RESOURCE_LIST_ORDERING)
+        except ValueError:
+            raise ValidationError("page and page_size must be integers")
+
+        return _resource_list_body(paged), 200
+
+
+class ResourceAvailableView(APIView):
+    """
+    GET /resources/available/?start_at=&end_at=&owner=&cursor=&page_size=
+    Resources free for the whole [start_at, end_at) window (keyset paginated).
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        try:
+            page_size = int(request.query_params.get("page_size", "10"))
+            qs = list_available_resources(
+                start_at=request.query_params.get("start_at"),
+                end_at=request.query_params.get("end_at"),
+                owner_id=request.query_params.get("owner"),
+            )
+            paged = paginate_keyset(
+                qs,
+                ordering=RESOURCE_LIST_ORDERING,
+                cursor=request.query_params.get("cursor"),
+                page_size=page_size,
+            )
+        except ValueError:
+            return error_response(ValidationError("page_size must be an integer"))
+        except AppError as e:
+            return error_response(e)
+
         return Response(
             {
-                "id": str(resource.id),
-                "name": resource.name,
-                "owner_id": str(resource.owner_id),
-                "created_at": resource.created_at.isoformat().replace("+00:00", "Z"),
+                "page_size": paged["page_size"],
+                "next_cursor": paged["next_cursor"],
+                "results": [resource_row(row) for row in paged["results"]],
             },
-            status=201,
+            status=200,
         )
 
 
@@ -86,19 +136,17 @@ class ResourceDetailView(APIView):
 
     def get(self, request, resource_id: str):
         try:
-            r = get_resource(resource_id=resource_id)
+            row = get_resource_row(resource_id=resource_id)
         except AppError as e:
             return error_response(e)
 
-        return Response(
-            {
-                "id": str(r.id),
-                "name": r.name,
-                "owner_id": str(r.owner_id),
-                "created_at": r.created_at.isoformat().replace("+00:00", "Z"),
-            },
-            status=200,
-        )
+        etag = make_etag("resource", row["version"])
+        response = not_modified(request, etag=etag, last_modified=row["updated_at"])
+        if response is not None:
+            return response
+
+        response = Response(resource_row(row), status=200)
+        return set_validators(response, etag=etag, last_modified=row["updated_at"])
 
     def patch(self, request, resource_id: str):
         ser = ResourceUpdateSerializer(data=request.data)
@@ -114,21 +162,188 @@ class ResourceDetailView(APIView):
         except AppError as e:
             return error_response(e)
 
+        return Response(resource_out(r), status=200)
+
+    def delete(self, request, resource_id: str):
+        try:
+            r = get_resource(resource_id=resource_id)
+            delete_resource(actor=request.user, resource=r)
+        except AppError as e:
+            return error_response(e)
+
+        return Response(status=204)
+
+
+class AsyncResourceDetailView(AsyncAPIView):
+    """
+    ASGI twin of ResourceDetailView: GET on the async ORM, PATCH/DELETE delegated.
+    """
+    sync_view = ResourceDetailView
+
+    async def get(self, request, resource_id: str):
+        row = await aget_resource_row(resource_id=resource_id)
+
+        etag = make_etag("resource", row["version"])
+        response = not_modified(request, etag=etag, last_modified=row["updated_at"])
+        if response is not None:
+            return response
+
+        response = json_response(resource_row(row), 200)
+        return set_validators(response, etag=etag, last_modified=row["updated_at"])
+
+
+class ResourceAvailabilityView(APIView):
+    """
+    GET /resources/{id}/availability/?from=&to=&min_duration=<minutes>
+    Free slots of a resource (gaps between ACTIVE bookings).
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, resource_id: str):
+        try:
+            default_minutes = int(MIN_DURATION.total_seconds() // 60)
+            min_minutes = int(request.query_params.get("min_duration", default_minutes))
+            if min_minutes < default_minutes:
+                raise ValidationError(
+                    "min_duration is too short",
+                    details={"min_duration_minutes": default_minutes},
+                )
+
+            r = get_resource(resource_id=resource_id)
+            slots = list_free_slots(
+                resource_id=r.id,
+                date_from=request.query_params.get("from"),
+                date_to=request.query_params.get("to"),
+                min_duration=timedelta(minutes=min_minutes),
+            )
+        except ValueError:
+            return error_response(ValidationError("min_duration must be an integer"))
+        except AppError as e:
+            return error_response(e)
+
         return Response(
             {
-                "id": str(r.id),
-                "name": r.name,
-                "owner_id": str(r.owner_id),
-                "created_at": r.created_at.isoformat().replace("+00:00", "Z"),
+                "resource_id": str(r.id),
+                "min_duration_minutes": min_minutes,
+                "slots": [
+                    {
+                        "start_at": format_datetime(start_at),
+                        "end_at": format_datetime(end_at),
+                    }
+                    for start_at, end_at in slots
+                ],
             },
             status=200,
         )
 
-    def delete(self, request, resource_id: str):
+
+MINUTES_PER_DAY = 24 * 60
+
+
+def _occupancy_pct(booked_minutes: int, days: int) -> float:
+    return round(booked_minutes * 100 / (MINUTES_PER_DAY * days), 2)
+
+
+def _stats_body(resource_id, day_from, day_to, rows: list[dict]) -> dict:
+    # dense series: days without a rollup row had no bookings
+    by_day = {row["day"]: row for row in rows}
+    days = []
+    day = day_from
+    while day <= day_to:
+        row = by_day.get(day, {"bookings": 0, "cancellations": 0, "booked_minutes": 0})
+        days.append({
+            "date": day.isoformat(),
+            "bookings": row["bookings"],
+            "cancellations": row["cancellations"],
+            "booked_minutes": row["booked_minutes"],
+            "occupancy_pct": _occupancy_pct(row["booked_minutes"], 1),
+        })
+        day += timedelta(days=1)
+
+    bookings = sum(d["bookings"] for d in days)
+    cancellations = sum(d["cancellations"] for d in days)
+    booked_minutes = sum(d["booked_minutes"] for d in days)
+    return {
+        "resource_id": str(resource_id),
+        "from": day_from.isoformat(),
+        "to": day_to.isoformat(),
+        "totals": {
+            "bookings": bookings,
+            "cancellations": cancellations,
+            "booked_minutes": booked_minutes,
+            "occupancy_pct": _occupancy_pct(booked_minutes, len(days)),
+            "bookings_per_day": round(bookings / len(days), 2),
+            "cancellation_rate": round(cancellations / bookings, 4) if bookings else 0.0,
+        },
+        "days": days,
+    }
+
+
+class ResourceStatsView(APIView):
+    """
+    GET /resources/{id}/stats/?from=YYYY-MM-DD&to=YYYY-MM-DD   (owner or admin)
+    Occupancy, bookings per day and cancellation rate from the ResourceDailyStats rollup.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, resource_id: str):
         try:
             r = get_resource(resource_id=resource_id)
-            delete_resource(actor=request.user, resource=r)
+            ensure_can_manage(actor=request.user, resource=r, action="view stats of")
+            day_from, day_to, rows = list_daily_stats(
+                resource_id=r.id,
+                date_from=request.query_params.get("from"),
+                date_to=request.query_params.get("to"),
+            )
         except AppError as e:
             return error_response(e)
 
-        return Response(status=204)
+        return Response(_stats_body(r.id, day_from, day_to, rows), status=200)
+
+
+@timed("serialize")
+def _occupancy_body(day_from, day_to, resources: list[dict], rows: list, granularity: int) -> dict:
+    days = (day_to - day_from).days + 1
+    matrix = heatmap([r["id"] for r in resources], rows, day_from=day_from, days=days, granularity=granularity)
+    return {
+        "from": day_from.isoformat(),
+        "to": day_to.isoformat(),
+        "granularity": granularity,
+        "cells_per_day": SLOTS_PER_DAY // GRANULARITIES[granularity],
+        "slots_per_cell": GRANULARITIES[granularity],
+        "resources": [
+            {
+                "id": str(r["id"]),
+                "name": r["name"],
+                "occupied_minutes": sum(cells) * SLOT_MINUTES,
+                "cells": list(cells),
+            }
+            for r, cells in zip(resources, matrix)
+        ],
+    }
+
+
+class ResourceOccupancyView(APIView):
+    """
+    GET /resources/occupancy/?owner=<uuid>&from=YYYY-MM-DD&to=YYYY-MM-DD&granularity=15|30|60|120|1440
+    Heatmap: per resource, one cell per `granularity` minutes of [from, to] holding the
+    number of occupied 15-minute slots in it (0..slots_per_cell), from ResourceOccupancy.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        try:
+            granularity = int(request.query_params.get("granularity", "60"))
+            day_from, day_to, resources, rows = get_occupancy_grid(
+                owner_id=request.query_params.get("owner"),
+                date_from=request.query_params.get("from"),
+                date_to=request.query_params.get("to"),
+                granularity=granularity,
+                max_cells=settings.OCCUPANCY_MAX_CELLS,
+            )
+        except ValueError:
+            return error_response(ValidationError("granularity must be an integer"))
+        except AppError as e:
+            return error_response(e)
+
+        return Response(_occupancy_body(day_from, day_to, resources, rows, granularity), status=200)
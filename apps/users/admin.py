@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import User
+from .models import User, RefreshToken
 
 
 @admin.register(User)
@@ -7,3 +7,10 @@ class UserAdmin(admin.ModelAdmin):
     list_display = ("email", "full_name", "is_staff", "created_at")
     search_fields = ("email", "full_name")
     ordering = ("-created_at",)
+
+
+@admin.register(RefreshToken)
+class RefreshTokenAdmin(admin.ModelAdmin):
+    list_display = ("user", "family", "created_at", "expires_at", "revoked_at")
+    search_fields = ("user__email",)
+    ordering = ("-created_at",)
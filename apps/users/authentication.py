@@ -1,36 +1,133 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
 from rest_framework.authentication import BaseAuthentication
 from django.contrib.auth import get_user_model
 from common.exceptions import AuthError
-from .jwt import jwt_decode
+from common.request_timing import timed
+from .cache import acache_user, aget_cached_user, cache_user, get_cached_user
+from .jwt import TOKEN_TYPE_ACCESS, jwt_decode
 
 User = get_user_model()
 
 
+class _VerifiedTokenCache:
+    """
+    Bounded LRU: sha256(token) -> payload of a token whose signature was already verified.
+    Saves the HMAC + base64 + JSON work of jwt_decode for tokens seen before.
+    Expired entries are never served (the caller falls back to jwt_decode, which rejects them).
+    """
+
+    def __init__(self):
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def get(self, key: bytes) -> dict | None:
+        with self._lock:
+            payload = self._data.get(key)
+            if payload is None:
+                return None
+            exp = payload.get("exp")
+            if exp is not None and int(time.time()) >= int(exp):
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return payload
+
+    def put(self, key: bytes, payload: dict) -> None:
+        maxsize = getattr(settings, "JWT_CACHE_SIZE", 4096)
+        if maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = payload
+            self._data.move_to_end(key)
+            while len(self._data) > maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+verified_tokens = _VerifiedTokenCache()
+
+
+def decode_token(token: str) -> dict:
+    key = verified_tokens.key(token)
+    payload = verified_tokens.get(key)
+    if payload is None:
+        payload = jwt_decode(token)
+        verified_tokens.put(key, payload)
+    return payload
+
+
 class JWTAuthentication(BaseAuthentication):
     """
     Authorization: Bearer <token>
     token payload: { "sub": "<user_id>", "exp": <unix>, "iat": <unix> }
+
+    Verified payloads and active users are cached (see _VerifiedTokenCache, users.cache),
+    so a repeated token costs no DB query.
     """
 
     def authenticate(self, request):
+        with timed("auth"):
+            user_id = self._token_user_id(request)
+            if user_id is None:
+                return None  # anonymous
+
+            user = get_cached_user(user_id)
+            if user is None:
+                try:
+                    user = User.objects.get(id=user_id, is_active=True)
+                except User.DoesNotExist:
+                    raise AuthError("User not found")
+                cache_user(user)
+
+        return (user, None)
+
+    async def aauthenticate(self, request):
+        """
+        Same contract as authenticate(), for async views (plain Django HttpRequest is fine).
+        """
+        with timed("auth"):
+            user_id = self._token_user_id(request)
+            if user_id is None:
+                return None  # anonymous
+
+            user = await aget_cached_user(user_id)
+            if user is None:
+                try:
+                    user = await User.objects.aget(id=user_id, is_active=True)
+                except User.DoesNotExist:
+                    raise AuthError("User not found")
+                await acache_user(user)
+
+        return (user, None)
+
+    @staticmethod
+    def _token_user_id(request):
         auth = request.headers.get("Authorization", "")
         if not auth:
-            return None  # anonymous
+            return None
 
         parts = auth.split()
         if len(parts) != 2 or parts[0].lower() != "bearer":
             raise AuthError("Invalid Authorization header. Use 'Bearer <token>'.")
 
         token = parts[1]
-        payload = jwt_decode(token)
+        payload = decode_token(token)
+        if payload.get("typ", TOKEN_TYPE_ACCESS) != TOKEN_TYPE_ACCESS:
+            raise AuthError("Invalid token type")
 
         user_id = payload.get("sub")
         if not user_id:
             raise AuthError("Token payload missing 'sub'")
-
-        try:
-            user = User.objects.get(id=user_id, is_active=True)
-        except User.DoesNotExist:
-            raise AuthError("User not found")
-
-        return (user, None)
+        return user_id
@@ -0,0 +1,77 @@
+"""
+Short-lived cache of authenticated users, so steady-state JWT auth runs no query.
+
+Backend: the Django cache named by settings.AUTH_USER_CACHE_ALIAS (shared across
+workers, e.g. Redis), or a per-process LocMemCache when it's not set.
+Entries are dropped on User save/delete (see signals.py); writes that bypass
+signals (queryset.update) are bounded by AUTH_USER_CACHE_TTL.
+
+The per-process cache is only invalidated in the worker that saved the user:
+the others keep serving the old row (e.g. a deactivated user) until the entry
+expires. Its TTL is therefore capped at AUTH_USER_LOCAL_CACHE_TTL (a few
+seconds); set AUTH_USER_CACHE_ALIAS when running more than one worker.
+
+The a*-variants are for async views: a configured (network) cache is awaited,
+the in-process LocMemCache is read inline (a dict lookup doesn't need a thread hop).
+"""
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+
+_local_cache = None
+
+
+def _ttl() -> int:
+    ttl = getattr(settings, "AUTH_USER_CACHE_TTL", 60)
+    if getattr(settings, "AUTH_USER_CACHE_ALIAS", None):
+        return ttl
+    return min(ttl, getattr(settings, "AUTH_USER_LOCAL_CACHE_TTL", 5))
+
+
+def _backend():
+    global _local_cache
+    alias = getattr(settings, "AUTH_USER_CACHE_ALIAS", None)
+    if alias:
+        return caches[alias]
+    if _local_cache is None:
+        _local_cache = LocMemCache("auth-users", {"OPTIONS": {"MAX_ENTRIES": 10_000}})
+    return _local_cache
+
+
+def _key(user_id) -> str:
+    return f"auth:user:{user_id}"
+
+
+def get_cached_user(user_id):
+    if _ttl() <= 0:
+        return None
+    return _backend().get(_key(user_id))
+
+
+def cache_user(user) -> None:
+    if _ttl() <= 0:
+        return
+    _backend().set(_key(user.id), user, _ttl())
+
+
+async def aget_cached_user(user_id):
+    if _ttl() <= 0:
+        return None
+    backend = _backend()
+    if backend is _local_cache:
+        return backend.get(_key(user_id))
+    return await backend.aget(_key(user_id))
+
+
+async def acache_user(user) -> None:
+    if _ttl() <= 0:
+        return
+    backend = _backend()
+    if backend is _local_cache:
+        backend.set(_key(user.id), user, _ttl())
+    else:
+        await backend.aset(_key(user.id), user, _ttl())
+
+
+def invalidate_user(user_id) -> None:
+    _backend().delete(_key(user_id))
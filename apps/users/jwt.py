@@ -6,6 +6,14 @@ import time
 
 from django.conf import settings
 from common.exceptions import AuthError
+from common.metrics import counter
+
+
+# "typ" claim; tokens issued before refresh tokens existed carry none -> access
+TOKEN_TYPE_ACCESS = "access"
+TOKEN_TYPE_REFRESH = "refresh"
+
+JWT_VERIFY_FAILURES = counter("jwt_verify_failures_total", "Rejected JWTs", ["reason"])
 
 
 def _b64url_encode(data: bytes) -> str:
@@ -39,6 +47,7 @@ def jwt_decode(token: str) -> dict:
     try:
         header_b64, payload_b64, sig_b64 = token.split(".")
     except ValueError:
+        JWT_VERIFY_FAILURES.inc(reason="format")
         raise AuthError("Invalid token format")
 
     signing_input = f"{header_b64}.{payload_b64}".encode("ascii")
@@ -49,6 +58,7 @@ def jwt_decode(token: str) -> dict:
     ).digest()
 
     if not hmac.compare_digest(_b64url_encode(expected_sig), sig_b64):
+        JWT_VERIFY_FAILURES.inc(reason="signature")
         raise AuthError("Invalid token signature")
 
     payload = json.loads(_b64url_decode(payload_b64).decode("utf-8"))
@@ -56,6 +66,7 @@ def jwt_decode(token: str) -> dict:
     # exp check
     exp = payload.get("exp")
     if exp is not None and int(time.time()) >= int(exp):
+        JWT_VERIFY_FAILURES.inc(reason="expired")
         raise AuthError("Token expired")
 
     return payload
@@ -0,0 +1,51 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.users.services import login_user, refresh_tokens
+
+User = get_user_model()
+
+BENCH_EMAIL = "bench-refresh@bench.local"
+BENCH_PASSWORD = "BenchPass123!"
+
+
+class Command(BaseCommand):
+    help = (
+        "CPU cost of renewing an access token: re-login (password hasher) vs /auth/refresh/. "
+        "Runs inside a rolled back transaction against the configured database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=20)
+
+    def handle(self, *args, **opts):
+        n = opts["iterations"]
+        with transaction.atomic():
+            User.objects.create_user(email=BENCH_EMAIL, password=BENCH_PASSWORD, full_name="Bench")
+
+            login_cpu, login_wall = _timed(lambda: login_user(BENCH_EMAIL, BENCH_PASSWORD), n)
+
+            token = login_user(BENCH_EMAIL, BENCH_PASSWORD)["refresh_token"]
+
+            def rotate():
+                nonlocal token
+                token = refresh_tokens(token)["refresh_token"]
+
+            refresh_cpu, refresh_wall = _timed(rotate, n)
+
+            transaction.set_rollback(True)
+
+        self.stdout.write(f"{'re-login':<10} cpu={login_cpu * 1000:9.3f}ms/op  wall={login_wall * 1000:9.3f}ms/op")
+        self.stdout.write(f"{'refresh':<10} cpu={refresh_cpu * 1000:9.3f}ms/op  wall={refresh_wall * 1000:9.3f}ms/op")
+        if refresh_cpu:
+            self.stdout.write(f"refresh uses {login_cpu / refresh_cpu:.0f}x less CPU than re-login")
+
+
+def _timed(fn, n: int) -> tuple[float, float]:
+    cpu0, wall0 = time.process_time(), time.perf_counter()
+    for _ in range(n):
+        fn()
+    return (time.process_time() - cpu0) / n, (time.perf_counter() - wall0) / n
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.users.models import RefreshToken
+from common.db import delete_in_batches
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete expired refresh tokens in small batches (short transactions, no long "
+        "table locks). Revoked tokens stay until they expire: reuse detection needs them. "
+        "Run from cron, e.g. daily."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args, **opts):
+        expired = RefreshToken.objects.filter(expires_at__lte=timezone.now())
+        total = delete_in_batches(expired, batch_size=opts["batch_size"])
+        self.stdout.write(f"deleted {total} expired refresh tokens")
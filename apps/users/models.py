@@ -56,3 +56,28 @@ class User(AbstractBaseUser, PermissionsMixin):
 
     def __str__(self):
         return self.email
+
+
+class RefreshToken(models.Model):
+    """
+    Issued refresh token. Only sha256(token) is stored (cheap to verify, useless if leaked).
+    family: every token rotated from the same login; presenting an already
+    rotated token again revokes the whole family (reuse detection).
+    Expired rows are deleted by `manage.py purge_refresh_tokens`.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)  # = "jti" claim
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="refresh_tokens",
+    )
+    family = models.UUIDField(db_index=True)
+    token_hash = models.CharField(max_length=64, unique=True)
+
+    expires_at = models.DateTimeField(db_index=True)  # purge_refresh_tokens
+    created_at = models.DateTimeField(auto_now_add=True)
+    revoked_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.user_id} {self.family} ({'revoked' if self.revoked_at else 'active'})"
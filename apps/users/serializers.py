@@ -10,3 +10,7 @@ class RegisterSerializer(serializers.Serializer):
 class LoginSerializer(serializers.Serializer):
     email = serializers.EmailField()
     password = serializers.CharField(write_only=True)
+
+
+class RefreshSerializer(serializers.Serializer):
+    refresh_token = serializers.CharField(write_only=True)
@@ -1,11 +1,21 @@
+import hashlib
 import time
+import uuid
+from datetime import datetime, timezone as dt_timezone
+
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
 from common.exceptions import ValidationError, AuthError
-from .jwt import jwt_encode
+from common.metrics import histogram
+from .jwt import TOKEN_TYPE_ACCESS, TOKEN_TYPE_REFRESH, jwt_encode, jwt_decode
+from .models import RefreshToken
 
 User = get_user_model()
 
+AUTH_LOGIN_SECONDS = histogram("auth_login_seconds", "login_user latency (password hashing included)")
+
 
 def register_user(email: str, password: str, full_name: str) -> User:
     email = (email or "").strip().lower()
@@ -21,6 +31,11 @@ def register_user(email: str, password: str, full_name: str) -> User:
 
 
 def login_user(email: str, password: str) -> dict:
+    with AUTH_LOGIN_SECONDS.time():
+        return _login(email, password)
+
+
+def _login(email: str, password: str) -> dict:
     email = (email or "").strip().lower()
     if not email or not password:
         raise ValidationError("email and password are required")
@@ -33,16 +48,84 @@ def login_user(email: str, password: str) -> dict:
     if not user.check_password(password):
         raise AuthError("Invalid credentials")
 
+    return _issue_tokens(user, family=uuid.uuid4())
+
+
+def refresh_tokens(refresh_token: str) -> dict:
+    """
+    Rotate a refresh token: the presented one is revoked and a new access/refresh
+    pair (same family) is issued. No password hashing involved.
+
+    Reuse detection: a token that was already rotated means it leaked (or the
+    client replayed it) -> the whole family is revoked and the call fails.
+    """
+    payload = jwt_decode(refresh_token)
+    if payload.get("typ") != TOKEN_TYPE_REFRESH:
+        raise AuthError("Invalid refresh token")
+
+    now = timezone.now()
+    with transaction.atomic():
+        try:
+            stored = (
+                RefreshToken.objects.select_for_update(of=("self",))
+                .select_related("user")
+                .get(token_hash=_token_hash(refresh_token))
+            )
+        except RefreshToken.DoesNotExist:
+            raise AuthError("Invalid refresh token")
+
+        reused = stored.revoked_at is not None
+        if reused:
+            RefreshToken.objects.filter(family=stored.family, revoked_at__isnull=True).update(revoked_at=now)
+        elif not stored.user.is_active:
+            raise AuthError("User not found")
+        else:
+            stored.revoked_at = now
+            stored.save(update_fields=["revoked_at"])
+            tokens = _issue_tokens(stored.user, family=stored.family)
+
+    # raised outside the atomic block so the family revocation is committed
+    if reused:
+        raise AuthError("Refresh token reuse detected")
+    return tokens
+
+
+def _token_hash(token: str) -> str:
+    # tokens are long random signed strings -> a fast digest is enough (no password hasher)
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def _issue_tokens(user, *, family) -> dict:
     now = int(time.time())
-    payload = {
+    access_token = jwt_encode({
         "sub": str(user.id),
+        "typ": TOKEN_TYPE_ACCESS,
         "iat": now,
         "exp": now + settings.JWT_ACCESS_TTL,
-    }
-    token = jwt_encode(payload)
+    })
+
+    jti = uuid.uuid4()
+    refresh_exp = now + settings.JWT_REFRESH_TTL
+    refresh_token = jwt_encode({
+        "sub": str(user.id),
+        "typ": TOKEN_TYPE_REFRESH,
+        "jti": str(jti),
+        "fam": str(family),
+        "iat": now,
+        "exp": refresh_exp,
+    })
+    RefreshToken.objects.create(
+        id=jti,
+        user=user,
+        family=family,
+        token_hash=_token_hash(refresh_token),
+        expires_at=datetime.fromtimestamp(refresh_exp, tz=dt_timezone.utc),
+    )
 
     return {
-        "access_token": token,
+        "access_token": access_token,
         "token_type": "Bearer",
         "expires_in": settings.JWT_ACCESS_TTL,
+        "refresh_token": refresh_token,
+        "refresh_expires_in": settings.JWT_REFRESH_TTL,
     }
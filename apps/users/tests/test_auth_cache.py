@@ -0,0 +1,74 @@
+import time
+from unittest import mock
+
+from django.test import override_settings
+from rest_framework.test import APIRequestFactory, APITestCase
+from django.contrib.auth import get_user_model
+
+from common.exceptions import AuthError
+from apps.users.authentication import JWTAuthentication, verified_tokens
+from apps.users.jwt import jwt_encode
+
+User = get_user_model()
+
+
+class JWTAuthCacheTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="a@a.com", password="StrongPass123", full_name="A")
+        now = int(time.time())
+        self.token = jwt_encode({"sub": str(self.user.id), "iat": now, "exp": now + 60})
+        self.auth = JWTAuthentication()
+        self.factory = APIRequestFactory()
+
+    def _authenticate(self, token=None):
+        request = self.factory.get("/", HTTP_AUTHORIZATION=f"Bearer {token or self.token}")
+        return self.auth.authenticate(request)
+
+    def test_steady_state_runs_no_query(self):
+        with self.assertNumQueries(1):
+            self._authenticate()
+        with self.assertNumQueries(0):
+            user, _ = self._authenticate()
+        self.assertEqual(user.id, self.user.id)
+
+    def test_deactivated_user_is_rejected(self):
+        self._authenticate()
+        self.user.is_active = False
+        self.user.save(update_fields=["is_active"])  # post_save drops the cache entry
+
+        with self.assertRaises(AuthError):
+            self._authenticate()
+
+    def test_cached_token_honours_exp(self):
+        self._authenticate()
+        later = time.time() + 120
+        with mock.patch("apps.users.authentication.time.time", return_value=later), \
+                mock.patch("apps.users.jwt.time.time", return_value=later):
+            with self.assertRaises(AuthError):
+                self._authenticate()
+
+    def test_bad_signature_not_cached(self):
+        forged = self.token[:-2] + ("aa" if not self.token.endswith("aa") else "bb")
+        for _ in range(2):
+            with self.assertRaises(AuthError):
+                self._authenticate(forged)
+
+    @override_settings(JWT_CACHE_SIZE=2)
+    def test_token_cache_is_bounded(self):
+        verified_tokens.clear()
+        for i in range(5):
+            token = jwt_encode({"sub": str(self.user.id), "iat": i, "exp": int(time.time()) + 60})
+            self._authenticate(token)
+        self.assertEqual(len(verified_tokens._data), 2)
+
+    @override_settings(AUTH_USER_CACHE_TTL=0)
+    def test_user_cache_can_be_disabled(self):
+        self._authenticate()
+        with self.assertNumQueries(1):
+            self._authenticate()
+
+    @override_settings(AUTH_USER_CACHE_TTL=60, AUTH_USER_CACHE_ALIAS=None, AUTH_USER_LOCAL_CACHE_TTL=5)
+    def test_per_process_cache_ttl_is_capped(self):
+        with mock.patch("apps.users.cache.LocMemCache.set") as cache_set:
+            self._authenticate()
+        self.assertEqual(cache_set.call_args.args[2], 5)
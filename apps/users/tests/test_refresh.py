@@ -0,0 +1,78 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.utils import timezone
+
+from rest_framework.test import APIRequestFactory, APITestCase
+
+from common.exceptions import AuthError
+from apps.users.authentication import JWTAuthentication
+from apps.users.models import RefreshToken
+
+
+class RefreshTokenTests(APITestCase):
+    def setUp(self):
+        self.client.post(
+            "/auth/register/",
+            {"email": "bekzod@mail.com", "password": "StrongPass123", "full_name": "Bekzod Ali"},
+            format="json",
+        )
+        res = self.client.post("/auth/login/", {"email": "bekzod@mail.com", "password": "StrongPass123"}, format="json")
+        self.tokens = res.data
+
+    def _refresh(self, token):
+        return self.client.post("/auth/refresh/", {"refresh_token": token}, format="json")
+
+    def test_login_returns_refresh_token(self):
+        self.assertIn("refresh_token", self.tokens)
+        self.assertIn("refresh_expires_in", self.tokens)
+
+    def test_refresh_rotates_without_password_hashing(self):
+        with mock.patch("django.contrib.auth.base_user.AbstractBaseUser.check_password") as check:
+            res = self._refresh(self.tokens["refresh_token"])
+        check.assert_not_called()
+        self.assertEqual(res.status_code, 200)
+        self.assertNotEqual(res.data["refresh_token"], self.tokens["refresh_token"])
+
+        res = self.client.get("/resources/", HTTP_AUTHORIZATION=f"Bearer {res.data['access_token']}")
+        self.assertEqual(res.status_code, 200)
+
+    def test_reuse_revokes_family(self):
+        rotated = self._refresh(self.tokens["refresh_token"]).data
+
+        res = self._refresh(self.tokens["refresh_token"])  # replay of the old token
+        self.assertEqual(res.status_code, 401)
+        self.assertEqual(res.data["error"]["message"], "Refresh token reuse detected")
+
+        # the legitimately rotated token is dead too
+        res = self._refresh(rotated["refresh_token"])
+        self.assertEqual(res.status_code, 401)
+        self.assertFalse(RefreshToken.objects.filter(revoked_at__isnull=True).exists())
+
+    def test_access_token_cannot_refresh(self):
+        res = self._refresh(self.tokens["access_token"])
+        self.assertEqual(res.status_code, 401)
+
+    def test_refresh_token_cannot_authenticate(self):
+        request = APIRequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {self.tokens['refresh_token']}")
+        with self.assertRaises(AuthError):
+            JWTAuthentication().authenticate(request)
+
+    def test_only_digest_is_stored(self):
+        stored = RefreshToken.objects.get()
+        self.assertEqual(len(stored.token_hash), 64)
+        self.assertNotIn(stored.token_hash, self.tokens["refresh_token"])
+
+    def test_purge_expired(self):
+        self._refresh(self.tokens["refresh_token"])  # the rotated token stays (revoked) for reuse detection
+        issued = RefreshToken.objects.first()
+        RefreshToken.objects.create(
+            user=issued.user, family=issued.family, token_hash="x" * 64,
+            expires_at=timezone.now() - timedelta(seconds=1),
+        )
+        out = StringIO()
+        call_command("purge_refresh_tokens", batch_size=1, stdout=out)
+        self.assertIn("deleted 1", out.getvalue())
+        self.assertEqual(RefreshToken.objects.count(), 2)
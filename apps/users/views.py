@@ -3,8 +3,9 @@ from rest_framework.response import Response
 
 from common.responses import error_response
 from common.exceptions import AppError
-from .serializers import RegisterSerializer, LoginSerializer
-from .services import register_user, login_user
+from common.formatting import format_datetime
+from .serializers import RegisterSerializer, LoginSerializer, RefreshSerializer
+from .services import register_user, login_user, refresh_tokens
 
 
 class RegisterView(APIView):
@@ -31,7 +32,7 @@ class RegisterView(APIView):
                 "id": str(user.id),
                 "email": user.email,
                 "full_name": user.full_name,
-                "created_at": user.created_at.isoformat().replace("+00:00", "Z"),
+                "created_at": format_datetime(user.created_at),
             },
             status=201)
 
@@ -57,3 +58,26 @@ class LoginView(APIView):
             return error_response(e)
 
         return Response(data, status=200)
+
+
+class RefreshView(APIView):
+    authentication_classes = []  # public (the refresh token is the credential)
+    permission_classes = []      # public
+
+    def post(self, request):
+        ser = RefreshSerializer(data=request.data)
+        if not ser.is_valid():
+            return Response(
+                {"error":
+                        {
+                            "code": "VALIDATION_ERROR", "message": "Invalid input", "details": ser.errors
+                        }
+                },
+                status=400)
+
+        try:
+            data = refresh_tokens(**ser.validated_data)
+        except AppError as e:
+            return error_response(e)
+
+        return Response(data, status=200)
@@ -0,0 +1,66 @@
+"""
+Native async read endpoints (served under ASGI, see config/asgi.py).
+
+AsyncAPIView is a small Django View, not a DRF APIView: DRF's request/response
+cycle is sync-only, so running it in an async worker costs a thread hop per request.
+GET/HEAD run as coroutines on the async ORM; every other method is handed to the
+regular DRF view (`sync_view`) in a worker thread, so writes keep one implementation.
+
+Django's async ORM still runs each query on a worker thread (there is no async DB
+driver yet); what the ASGI path saves is a whole thread per open connection, so
+many slow/idle clients no longer exhaust the WSGI worker pool. Measure with
+`manage.py bench_http_load`.
+
+Handlers return (payload, status) or a ready response (e.g. 304 Not Modified);
+AppError is rendered like error_response().
+"""
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse, HttpResponseBase
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+
+from apps.users.authentication import JWTAuthentication
+from common import json_codec
+from common.exceptions import AppError
+from common.request_timing import timed
+from common.responses import error_payload
+
+
+def json_response(payload, status: int = 200) -> HttpResponse:
+    # json_codec: byte-identical to common.renderers.JSONRenderer output
+    with timed("serialize"):
+        return HttpResponse(json_codec.dumps(payload), status=status, content_type="application/json")
+
+
+class AsyncAPIView(View):
+    sync_view = None          # DRF APIView class handling non-GET methods
+    require_auth = True       # IsAuthenticated semantics
+    sync_handler = None       # set by as_view()
+    view_is_async = True      # dispatch is a coroutine even when no `get` is defined
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        initkwargs.setdefault("sync_handler", sync_to_async(cls.sync_view.as_view()))
+        # JWT in a header, no session cookies -> csrf-exempt like DRF's APIView
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    async def dispatch(self, request, *args, **kwargs):
+        if request.method not in ("GET", "HEAD"):
+            return await self.sync_handler(request, *args, **kwargs)
+        if not hasattr(self, "get"):
+            return await self.http_method_not_allowed(request, *args, **kwargs)
+
+        try:
+            auth = await JWTAuthentication().aauthenticate(request)
+            if auth is None and self.require_auth:
+                return json_response({"detail": "Authentication credentials were not provided."}, 403)
+            if auth is not None:
+                request.user = auth[0]
+            result = await self.get(request, *args, **kwargs)
+        except AppError as e:
+            return json_response({"error": error_payload(e)}, e.status)
+
+        if isinstance(result, HttpResponseBase):
+            return result
+        payload, status = result
+        return json_response(payload, status)
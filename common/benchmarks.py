@@ -0,0 +1,56 @@
+"""
+Tiny timing helpers shared by the `bench_*` management commands.
+Benchmarks run against whatever database settings point to; seed it first
+with `python manage.py seed_bench_data`.
+"""
+import statistics
+import time
+
+from django.db import connections
+
+
+def percentile(sorted_samples: list[float], pct: float) -> float:
+    if not sorted_samples:
+        return 0.0
+    index = min(len(sorted_samples) - 1, round(pct / 100 * (len(sorted_samples) - 1)))
+    return sorted_samples[index]
+
+
+def summarize(samples: list[float]) -> dict:
+    """seconds -> milliseconds summary"""
+    samples = sorted(samples)
+    return {
+        "n": len(samples),
+        "mean_ms": statistics.fmean(samples) * 1000 if samples else 0.0,
+        "p50_ms": percentile(samples, 50) * 1000,
+        "p95_ms": percentile(samples, 95) * 1000,
+        "p99_ms": percentile(samples, 99) * 1000,
+        "max_ms": samples[-1] * 1000 if samples else 0.0,
+    }
+
+
+def measure(fn, *, iterations: int = 100, warmup: int = 5) -> dict:
+    for _ in range(warmup):
+        fn()
+
+    samples = []
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return summarize(samples)
+
+
+def format_stats(label: str, stats: dict) -> str:
+    return (
+        f"{label:<36} n={stats['n']:<6} mean={stats['mean_ms']:.3f}ms "
+        f"p50={stats['p50_ms']:.3f}ms p95={stats['p95_ms']:.3f}ms "
+        f"p99={stats['p99_ms']:.3f}ms max={stats['max_ms']:.3f}ms"
+    )
+
+
+def explain(qs, *, analyze: bool = True) -> str:
+    """EXPLAIN of a queryset; ANALYZE/BUFFERS only where the backend supports them."""
+    if connections[qs.db].vendor == "postgresql":
+        return qs.explain(analyze=analyze, buffers=analyze)
+    return qs.explain()
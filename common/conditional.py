@@ -0,0 +1,36 @@
+"""
+Conditional GET helpers (ETag / Last-Modified -> 304 Not Modified).
+
+Views look up a cheap validator first (a version column read by primary key),
+and only query + serialize the full representation when the client's copy is stale.
+"""
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+
+def make_etag(kind: str, version) -> str:
+    return f'"{kind}-{version}"'
+
+
+def not_modified(request, *, etag: str, last_modified=None):
+    """
+    -> 304 (or 412 for a failed If-Match / If-Unmodified-Since) when the client's
+    copy is current, else None. Works with DRF and plain Django requests.
+    """
+    response = get_conditional_response(
+        request,
+        etag=etag,
+        last_modified=int(last_modified.timestamp()) if last_modified else None,
+    )
+    if response is not None:
+        set_validators(response, etag=etag, last_modified=last_modified)
+    return response
+
+
+def set_validators(response, *, etag: str, last_modified=None):
+    response["ETag"] = etag
+    if last_modified:
+        response["Last-Modified"] = http_date(last_modified.timestamp())
+    # authenticated API data: never shared, always revalidated
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
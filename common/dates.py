@@ -0,0 +1,38 @@
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from common.exceptions import ValidationError
+
+
+def parse_dt(value: str | None, field_name: str):
+    """
+    ISO datetime query param -> aware datetime (None if empty).
+    Naive values are interpreted in the current timezone (UTC).
+    """
+    if not value:
+        return None
+    dt = parse_datetime(value)
+    if dt is None:
+        raise ValidationError(
+            "Invalid datetime format",
+            details={field_name: "Use ISO format, e.g. 2026-02-09T10:00:00Z"},
+        )
+    if timezone.is_naive(dt):
+        dt = timezone.make_aware(dt)
+    return dt
+
+
+def parse_day(value: str | None, field_name: str):
+    """YYYY-MM-DD query param -> date (None if empty)."""
+    if not value:
+        return None
+    try:
+        day = parse_date(value)
+    except ValueError:  # well formed but impossible, e.g. 2026-02-30
+        day = None
+    if day is None:
+        raise ValidationError(
+            "Invalid date format",
+            details={field_name: "Use YYYY-MM-DD, e.g. 2026-02-09"},
+        )
+    return day
@@ -0,0 +1,33 @@
+from django.db import connection
+
+
+# Postgres SQLSTATE codes we map to domain errors
+EXCLUSION_VIOLATION = "23P01"
+LOCK_NOT_AVAILABLE = "55P03"  # FOR UPDATE NOWAIT failed / lock_timeout expired
+
+
+def is_postgres(conn=None) -> bool:
+    return (conn or connection).vendor == "postgresql"
+
+
+def sqlstate(exc) -> str | None:
+    """
+    Django wraps driver errors; the original psycopg error is the __cause__.
+    psycopg 3 exposes `sqlstate`, psycopg2 exposes `pgcode`.
+    """
+    cause = getattr(exc, "__cause__", None)
+    return getattr(cause, "sqlstate", None) or getattr(cause, "pgcode", None)
+
+
+def delete_in_batches(qs, *, batch_size: int) -> int:
+    """
+    Delete the rows of `qs` by primary key, `batch_size` at a time; returns rows deleted.
+    Each batch is its own short transaction (autocommit): no long table locks, and
+    a cron purge of a big backlog doesn't hold one huge transaction open.
+    """
+    total = 0
+    while True:
+        pks = list(qs.values_list("pk", flat=True)[:batch_size])
+        if not pks:
+            return total
+        total += qs.model.objects.filter(pk__in=pks).delete()[0]
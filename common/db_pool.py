@@ -0,0 +1,127 @@
+"""
+Connection pool instrumentation.
+
+Pools are psycopg 3 pools configured through DATABASES[alias]["OPTIONS"]["pool"]
+(see config/settings.py, DB_POOL_* env vars). Every DB_POOL_STATS_INTERVAL seconds
+PoolStatsMiddleware samples each pool and calls the hooks in DB_POOL_STATS_HOOKS
+with one dict per pool:
+
+  {"alias", "size", "available", "in_use", "max", "saturation",   # gauges
+   "waiting", "requests", "queued", "wait_ms", "timeouts"}         # since last sample
+
+`saturation` = in_use / max; `queued`/`wait_ms` count requests that had to wait
+for a free connection. Hooks are dotted paths, e.g. a metrics exporter.
+"""
+import logging
+import threading
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger("common.db_pool")
+
+_report_lock = threading.Lock()
+_last_report = float("-inf")
+
+
+def pooled_aliases() -> list[str]:
+    return [
+        alias
+        for alias in connections
+        if connections.settings[alias].get("OPTIONS", {}).get("pool")
+    ]
+
+
+def sample_pool(alias: str) -> dict | None:
+    """Gauges + counters since the previous sample (psycopg_pool pop_stats)."""
+    pool = getattr(connections[alias], "pool", None)
+    if pool is None:
+        return None
+
+    stats = pool.pop_stats()
+    size = stats.get("pool_size", 0)
+    available = stats.get("pool_available", 0)
+    max_size = stats.get("pool_max", 0)
+    in_use = size - available
+    return {
+        "alias": alias,
+        "size": size,
+        "available": available,
+        "in_use": in_use,
+        "max": max_size,
+        "saturation": in_use / max_size if max_size else 0.0,
+        "waiting": stats.get("requests_waiting", 0),
+        "requests": stats.get("requests_num", 0),
+        "queued": stats.get("requests_queued", 0),
+        "wait_ms": stats.get("requests_wait_ms", 0),
+        "timeouts": stats.get("requests_errors", 0),
+    }
+
+
+def report_pool_stats() -> list[dict]:
+    samples = [s for s in (sample_pool(alias) for alias in pooled_aliases()) if s is not None]
+    for hook_path in getattr(settings, "DB_POOL_STATS_HOOKS", []):
+        hook = import_string(hook_path)
+        for sample in samples:
+            hook(sample)
+    return samples
+
+
+def maybe_report_pool_stats() -> None:
+    """report_pool_stats() at most once per DB_POOL_STATS_INTERVAL (per process)."""
+    global _last_report
+    now = time.monotonic()
+    if now - _last_report < getattr(settings, "DB_POOL_STATS_INTERVAL", 10):
+        return
+    if not _report_lock.acquire(blocking=False):
+        return  # another thread is reporting
+    try:
+        _last_report = now
+        report_pool_stats()
+    finally:
+        _report_lock.release()
+
+
+def log_pool_stats(sample: dict) -> None:
+    """Default hook: structured log line, WARNING once the pool is (nearly) exhausted."""
+    saturated = (
+        sample["saturation"] >= getattr(settings, "DB_POOL_SATURATION_WARN", 0.9)
+        or sample["waiting"] > 0
+        or sample["timeouts"] > 0
+    )
+    logger.log(
+        logging.WARNING if saturated else logging.INFO,
+        "db pool %s: %d/%d in use, %d waiting, %d queued (%d ms), %d timeouts",
+        sample["alias"], sample["in_use"], sample["max"], sample["waiting"],
+        sample["queued"], sample["wait_ms"], sample["timeouts"],
+        extra={"db_pool": sample},
+    )
+
+
+class PoolStatsMiddleware:
+    """Samples pools after responses; removed at startup when no alias is pooled."""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not pooled_aliases():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        response = self.get_response(request)
+        maybe_report_pool_stats()
+        return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        maybe_report_pool_stats()  # in-memory counters, no I/O
+        return response
@@ -0,0 +1,135 @@
+"""
+Primary / read-replica routing with read-your-writes stickiness.
+
+- Writes (save/update/delete, select_for_update) always go to the primary ("default").
+- Only the read selectors opt into replicas, via `.using(read_db())`;
+  everything else (services, auth, overlap checks) reads the primary as before.
+- read_db() returns the primary when:
+    * no replicas are configured (settings.DATABASE_REPLICAS),
+    * the request is not a safe method (its reads feed a write),
+    * the request already wrote, or
+    * the user wrote within settings.READ_YOUR_WRITES_WINDOW seconds
+      (pin kept in the default cache, so it's shared by all workers when that's Redis).
+- One replica is picked per request, so validators and pages read the same copy.
+"""
+import random
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+_request_state: ContextVar[dict | None] = ContextVar("db_routing_request", default=None)
+
+
+def _window() -> int:
+    return getattr(settings, "READ_YOUR_WRITES_WINDOW", 5)
+
+
+def _pin_key(user_id) -> str:
+    return f"db:pin:{user_id}"
+
+
+def _user_id(request):
+    user = getattr(request, "user", None)
+    if user is None or not getattr(user, "is_authenticated", False):
+        return None
+    return user.id
+
+
+def read_db() -> str:
+    """Alias for read-only selector queries (see module docstring)."""
+    replicas = getattr(settings, "DATABASE_REPLICAS", [])
+    if not replicas:
+        return DEFAULT_DB_ALIAS
+
+    state = _request_state.get()
+    if state is None:
+        # management commands, shell: no stickiness to honour
+        return random.choice(replicas)
+
+    if state["alias"] is None:
+        state["alias"] = DEFAULT_DB_ALIAS if _pinned(state) else random.choice(replicas)
+    elif state["wrote"]:
+        state["alias"] = DEFAULT_DB_ALIAS
+    return state["alias"]
+
+
+def _pinned(state: dict) -> bool:
+    request = state["request"]
+    if state["wrote"] or request.method not in SAFE_METHODS:
+        return True
+    # request.user is resolved by the view's authentication by the time a selector runs
+    user_id = _user_id(request)
+    return user_id is not None and _window() > 0 and cache.get(_pin_key(user_id)) is not None
+
+
+def _mark_write() -> None:
+    state = _request_state.get()
+    if state is not None:
+        state["wrote"] = True
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        return None  # primary, or the alias of the instance the read starts from
+
+    def db_for_write(self, model, **hints):
+        _mark_write()
+        # explicit: instances loaded from a replica must still be saved to the primary
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True  # replicas are copies of the primary
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
+
+
+class ReadYourWritesMiddleware:
+    """
+    Tracks writes per request; a request that wrote pins its user to the primary
+    for READ_YOUR_WRITES_WINDOW seconds.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        state, token = self._start(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            _request_state.reset(token)
+
+        user_id = _user_id(request)
+        if state["wrote"] and user_id is not None and _window() > 0:
+            cache.set(_pin_key(user_id), 1, _window())
+        return response
+
+    async def __acall__(self, request):
+        state, token = self._start(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _request_state.reset(token)
+
+        user_id = _user_id(request)
+        if state["wrote"] and user_id is not None and _window() > 0:
+            await cache.aset(_pin_key(user_id), 1, _window())
+        return response
+
+    @staticmethod
+    def _start(request):
+        state = {"request": request, "wrote": False, "alias": None}
+        return state, _request_state.set(state)
@@ -26,3 +26,20 @@ class PermissionDenied(AppError):
 class BusinessRuleViolation(AppError):
     code = "BUSINESS_RULE_VIOLATION"
     status = 400
+
+
+class Conflict(AppError):
+    code = "CONFLICT"
+    status = 409
+
+
+class ResourceBusy(AppError):
+    """Transient contention (row lock not available): the client should retry after `retry_after` seconds."""
+    code = "RESOURCE_BUSY"
+    status = 409
+
+    def __init__(self, message="Error", details=None, *, retry_after: int = 1, status: int | None = None):
+        super().__init__(message, details)
+        self.retry_after = retry_after
+        if status is not None:
+            self.status = status
@@ -0,0 +1,11 @@
+def format_datetime(value) -> str | None:
+    """
+    Same output as DRF's DateTimeField (ISO 8601, UTC as "Z"),
+    without building a serializer.
+    """
+    if value is None:
+        return None
+    value = value.isoformat()
+    if value.endswith("+00:00"):
+        value = value[:-6] + "Z"
+    return value
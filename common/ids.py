@@ -0,0 +1,11 @@
+import uuid
+
+from common.exceptions import ValidationError
+
+
+def parse_uuid(value: str, field_name: str) -> uuid.UUID:
+    """UUID query param -> UUID; a malformed one is a 400, not a query-time 500."""
+    try:
+        return uuid.UUID(str(value))
+    except ValueError:
+        raise ValidationError(f"Invalid {field_name} id", details={field_name: value})
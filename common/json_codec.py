@@ -0,0 +1,70 @@
+"""
+JSON encoding/decoding for API bodies: orjson when installed, stdlib otherwise.
+
+dumps() gives the bytes of DRF's JSONRenderer: compact, UTF-8 (no \\u escapes),
+UUIDs as strings, aware UTC datetimes as "...Z", U+2028/U+2029 escaped.
+orjson encodes UUIDs and datetimes natively (OPT_UTC_Z). Types it doesn't
+know (Decimal, lazy strings, timedelta, ...) go through DRF's encoder as its
+`default`. If orjson still refuses the document (non-str keys, ints beyond
+64 bits), the stdlib encodes the whole document.
+
+Known difference: orjson spells floats that Python prints in exponent form
+without the "+" and zero padding ("1e16", not "1e+16"; same value). It also
+writes NaN/Infinity as null where DRF's strict mode raises.
+
+settings.JSON_BACKEND = "orjson" (default, used when importable) | "stdlib".
+See `manage.py bench_json_render`.
+"""
+import json
+
+from django.conf import settings
+from rest_framework.utils import json as drf_json
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # optional: the stdlib path produces the same bytes
+    orjson = None
+
+BACKEND_ORJSON = "orjson"
+BACKEND_STDLIB = "stdlib"
+
+_drf_default = JSONEncoder().default
+_LINE_SEPARATORS = (b"\xe2\x80\xa8", b"\xe2\x80\xa9")  # U+2028, U+2029 in UTF-8
+
+
+def backend() -> str:
+    if orjson is None:
+        return BACKEND_STDLIB
+    return getattr(settings, "JSON_BACKEND", BACKEND_ORJSON)
+
+
+def dumps_stdlib(data) -> bytes:
+    ret = json.dumps(data, cls=JSONEncoder, ensure_ascii=False, allow_nan=False, separators=(",", ":"))
+    return ret.replace("\u2028", "\\u2028").replace("\u2029", "\\u2029").encode()
+
+
+def dumps_orjson(data) -> bytes:
+    try:
+        ret = orjson.dumps(data, default=_drf_default, option=orjson.OPT_UTC_Z)
+    except orjson.JSONEncodeError:
+        return dumps_stdlib(data)
+    if _LINE_SEPARATORS[0] in ret or _LINE_SEPARATORS[1] in ret:
+        ret = ret.replace(_LINE_SEPARATORS[0], b"\\u2028").replace(_LINE_SEPARATORS[1], b"\\u2029")
+    return ret
+
+
+def encoder():
+    """The dumps function of the configured backend (resolve once for per-row loops)."""
+    return dumps_orjson if backend() == BACKEND_ORJSON else dumps_stdlib
+
+
+def dumps(data) -> bytes:
+    return encoder()(data)
+
+
+def loads(raw: bytes | str):
+    """Raises ValueError on invalid JSON (orjson.JSONDecodeError is a subclass)."""
+    if backend() == BACKEND_ORJSON:
+        return orjson.loads(raw)
+    return drf_json.loads(raw, parse_constant=drf_json.strict_constant)  # NaN/Infinity rejected, like orjson
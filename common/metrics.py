@@ -0,0 +1,281 @@
+"""
+In-process metrics (counters + histograms) in the Prometheus text format.
+
+    BOOKINGS_CREATED = counter("bookings_created_total", "Bookings created", ["engine"])
+    BOOKINGS_CREATED.inc(engine="lock")
+
+    CREATE_SECONDS = histogram("booking_create_seconds", "create_booking latency")
+    with CREATE_SECONDS.time():
+        ...
+
+Recording is a lock + dict update (a few microseconds, see `bench_metrics`).
+
+Multiprocess mode (gunicorn workers): set METRICS_MULTIPROC_DIR. Each process then
+snapshots its values to <dir>/metrics-<pid>.json every METRICS_FLUSH_INTERVAL
+seconds (daemon thread), and /metrics sums the snapshots of all processes.
+Wipe the directory when the server (re)starts.
+
+/metrics is closed by default. Scrapers send `Authorization: Bearer <METRICS_TOKEN>`;
+METRICS_ALLOWED_IPS matches REMOTE_ADDR, which behind a reverse proxy on the same
+host is the proxy's address for every client, so only list IPs that reach the app
+directly (or don't proxy /metrics).
+"""
+import glob
+import hmac
+import json
+import os
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http import Http404, HttpResponse
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+_KEY_SEP = "\x1f"  # joins label values into JSON-able snapshot keys
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: dict[tuple, object] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> tuple:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {_KEY_SEP.join(k): self._copy(v) for k, v in self._values.items()}
+
+    @staticmethod
+    def _copy(value):
+        return value
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self, values: dict):
+        for key, value in values.items():
+            yield self.name, key, value
+
+    @staticmethod
+    def merge(a, b):
+        return a + b
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # [per-bucket counts..., +Inf count], sum
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            state[0][index] += 1
+            state[1] += value
+
+    @contextmanager
+    def time(self, **labels):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - t0, **labels)
+
+    @staticmethod
+    def _copy(value):
+        return [list(value[0]), value[1]]
+
+    def samples(self, values: dict):
+        for key, (counts, total) in values.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else _format_number(bound)
+                yield f"{self.name}_bucket", key, cumulative, ("le", le)
+            yield f"{self.name}_sum", key, total
+            yield f"{self.name}_count", key, cumulative
+
+    @staticmethod
+    def merge(a, b):
+        return [[x + y for x, y in zip(a[0], b[0])], a[1] + b[1]]
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+        self._flusher = None
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing  # module reloads (runserver, tests) keep one instance
+            self._metrics[metric.name] = metric
+        return metric
+
+    def collect(self) -> dict:
+        """name -> {label key -> value}, summed over all processes in multiprocess mode."""
+        directory = _multiproc_dir()
+        if not directory:
+            return {name: metric.snapshot() for name, metric in self._metrics.items()}
+
+        self.flush()
+        merged: dict[str, dict] = {}
+        for path in glob.glob(os.path.join(directory, "metrics-*.json")):
+            try:
+                with open(path) as f:
+                    snapshot = json.load(f)
+            except (OSError, ValueError):
+                continue  # being replaced / partially written
+            for name, values in snapshot.items():
+                metric = self._metrics.get(name)
+                if metric is None:
+                    continue
+                target = merged.setdefault(name, {})
+                for key, value in values.items():
+                    target[key] = metric.merge(target[key], value) if key in target else value
+        return merged
+
+    def render(self) -> str:
+        collected = self.collect()
+        lines = []
+        for name, metric in sorted(self._metrics.items()):
+            lines.append(f"# HELP {name} {metric.documentation}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            for sample in metric.samples(collected.get(name, {})):
+                sample_name, key, value, *extra = sample
+                labels = list(zip(metric.labelnames, key.split(_KEY_SEP) if metric.labelnames else []))
+                labels += extra
+                label_text = ",".join(f'{k}="{_escape(v)}"' for k, v in labels)
+                lines.append(f"{sample_name}{{{label_text}}} {_format_number(value)}" if label_text
+                             else f"{sample_name} {_format_number(value)}")
+        return "\n".join(lines) + "\n"
+
+    # --- multiprocess mode ---------------------------------------------------
+
+    def flush(self) -> None:
+        directory = _multiproc_dir()
+        if not directory:
+            return
+        snapshot = {name: metric.snapshot() for name, metric in self._metrics.items()}
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=".metrics-")
+        with os.fdopen(fd, "w") as f:
+            json.dump(snapshot, f)
+        os.replace(tmp, os.path.join(directory, f"metrics-{os.getpid()}.json"))
+
+    def start_flusher(self) -> None:
+        """Periodic snapshots for this process; called per request by MetricsMiddleware (after fork)."""
+        if not _multiproc_dir() or (self._flusher and self._flusher[0] == os.getpid()):
+            return
+        with self._lock:
+            if self._flusher and self._flusher[0] == os.getpid():
+                return
+            thread = threading.Thread(target=self._flush_loop, name="metrics-flush", daemon=True)
+            self._flusher = (os.getpid(), thread)
+            thread.start()
+
+    def _flush_loop(self) -> None:
+        interval = getattr(settings, "METRICS_FLUSH_INTERVAL", 5)
+        while True:
+            time.sleep(interval)
+            self.flush()
+
+
+def _multiproc_dir() -> str | None:
+    return getattr(settings, "METRICS_MULTIPROC_DIR", None) or None
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def _format_number(value) -> str:
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value)) if abs(value) < 1e15 else repr(value)
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+REGISTRY = Registry()
+
+
+def counter(name: str, documentation: str, labelnames=()) -> Counter:
+    return REGISTRY.register(Counter(name, documentation, labelnames))
+
+
+def histogram(name: str, documentation: str, labelnames=(), buckets=DEFAULT_BUCKETS) -> Histogram:
+    return REGISTRY.register(Histogram(name, documentation, labelnames, buckets))
+
+
+HTTP_RESPONSE_SIZE = histogram(
+    "http_response_size_bytes", "Response body size per endpoint", ["method", "route"], buckets=SIZE_BUCKETS
+)
+
+
+class MetricsMiddleware:
+    """Per-endpoint response size (route pattern, not the raw path: bounded label values)."""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        response = self.get_response(request)
+        self._observe(request, response)
+        return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        self._observe(request, response)
+        return response
+
+    @staticmethod
+    def _observe(request, response) -> None:
+        REGISTRY.start_flusher()
+        if response.streaming:
+            return
+        match = getattr(request, "resolver_match", None)
+        route = match.route if match is not None else "unmatched"
+        HTTP_RESPONSE_SIZE.observe(len(response.content), method=request.method, route=route)
+
+
+def metrics_view(request):
+    """GET /metrics/ (Prometheus scrape); METRICS_TOKEN bearer or METRICS_ALLOWED_IPS, 404 for everyone else."""
+    token = getattr(settings, "METRICS_TOKEN", "")
+    authorized = bool(token) and hmac.compare_digest(
+        request.headers.get("Authorization", "").encode(), f"Bearer {token}".encode()
+    )
+    allowed = getattr(settings, "METRICS_ALLOWED_IPS", [])
+    if not authorized and "*" not in allowed and request.META.get("REMOTE_ADDR") not in allowed:
+        raise Http404
+    return HttpResponse(REGISTRY.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
@@ -1,22 +1,295 @@
+import json
+from datetime import datetime
 from math import ceil
+from uuid import UUID
+
+from asgiref.sync import sync_to_async
+from django.core import signing
+from django.db import connections
+from django.db.models import F, Func, Q, Value
+from django.db.models.lookups import GreaterThan, LessThan
+
+from common.db import is_postgres
 from common.exceptions import ValidationError
+from common.metrics import histogram
+
+
+MAX_PAGE_SIZE = 50
+CURSOR_SALT = "common.pagination.cursor"
+
+# ?count= modes for page-number pagination
+COUNT_EXACT = "exact"        # SELECT COUNT(*) (default, old behaviour)
+COUNT_ESTIMATE = "estimate"  # capped count, planner estimate beyond the cap
+COUNT_NONE = "none"          # no count at all, `has_next` from page_size + 1 rows
+COUNT_MODES = (COUNT_EXACT, COUNT_ESTIMATE, COUNT_NONE)
+ESTIMATE_CAP = 1000
 
+PAGINATION_COUNT_SECONDS = histogram("pagination_count_seconds", "Time spent counting rows for page meta", ["mode"])
 
-def paginate_queryset(qs, *, page: int, page_size: int):
+
+def _check_page_size(page_size: int) -> None:
+    if page_size < 1 or page_size > MAX_PAGE_SIZE:
+        raise ValidationError(f"page_size must be between 1 and {MAX_PAGE_SIZE}")
+
+
+def parse_paging(params) -> dict:
+    """
+    ?cursor= (keyset mode when present) | ?page=&count= ; ?page_size= for both.
+    Raises ValueError on non-integer page/page_size.
+    """
+    return {
+        "cursor": params.get("cursor"),
+        "page": int(params.get("page", "1")),
+        "page_size": int(params.get("page_size", "10")),
+        "count_mode": params.get("count", COUNT_EXACT),
+    }
+
+
+def paginate(qs, *, paging: dict, ordering: tuple[str, ...]):
+    if paging["cursor"] is not None:
+        return paginate_keyset(qs, ordering=ordering, cursor=paging["cursor"], page_size=paging["page_size"])
+    return paginate_queryset(
+        qs, page=paging["page"], page_size=paging["page_size"], count_mode=paging["count_mode"]
+    )
+
+
+async def apaginate(qs, *, paging: dict, ordering: tuple[str, ...]):
+    if paging["cursor"] is not None:
+        return await apaginate_keyset(
+            qs, ordering=ordering, cursor=paging["cursor"], page_size=paging["page_size"]
+        )
+    return await apaginate_queryset(
+        qs, page=paging["page"], page_size=paging["page_size"], count_mode=paging["count_mode"]
+    )
+
+
+def _check_page(page: int, page_size: int, count_mode: str) -> None:
     if page < 1:
         raise ValidationError("page must be >= 1")
-    if page_size < 1 or page_size > 50:
-        raise ValidationError("page_size must be between 1 and 50")
+    _check_page_size(page_size)
+    if count_mode not in COUNT_MODES:
+        raise ValidationError("Invalid count mode", details={"count": "|".join(COUNT_MODES)})
 
-    total = qs.count()
-    offset = (page - 1) * page_size
-    items = list(qs[offset : offset + page_size])
 
-    total_pages = ceil(total / page_size) if page_size else 1
+def _uncounted_page(items: list, *, page: int, page_size: int) -> dict:
     return {
+        "count": None,
+        "page": page,
+        "page_size": page_size,
+        "total_pages": None,
+        "has_next": len(items) > page_size,
+        "results": items[:page_size],
+    }
+
+
+def _counted_page(items: list, *, total: int, exact: bool, page: int, page_size: int, count_mode: str) -> dict:
+    total_pages = ceil(total / page_size) if page_size else 1
+    paged = {
         "count": total,
         "page": page,
         "page_size": page_size,
         "total_pages": total_pages,
         "results": items,
     }
+    if count_mode == COUNT_ESTIMATE:
+        paged["count_exact"] = exact
+    return paged
+
+
+def paginate_queryset(qs, *, page: int, page_size: int, count_mode: str = COUNT_EXACT):
+    _check_page(page, page_size, count_mode)
+    offset = (page - 1) * page_size
+
+    if count_mode == COUNT_NONE:
+        items = list(qs[offset : offset + page_size + 1])
+        return _uncounted_page(items, page=page, page_size=page_size)
+
+    exact = True
+    with PAGINATION_COUNT_SECONDS.time(mode=count_mode):
+        if count_mode == COUNT_ESTIMATE:
+            total, exact = _estimate_count(qs)
+        else:
+            total = qs.count()
+    items = list(qs[offset : offset + page_size])
+    return _counted_page(items, total=total, exact=exact, page=page, page_size=page_size, count_mode=count_mode)
+
+
+async def apaginate_queryset(qs, *, page: int, page_size: int, count_mode: str = COUNT_EXACT):
+    """Async-ORM twin of paginate_queryset (same queries, same result shape)."""
+    _check_page(page, page_size, count_mode)
+    offset = (page - 1) * page_size
+
+    if count_mode == COUNT_NONE:
+        items = [row async for row in qs[offset : offset + page_size + 1]]
+        return _uncounted_page(items, page=page, page_size=page_size)
+
+    exact = True
+    with PAGINATION_COUNT_SECONDS.time(mode=count_mode):
+        if count_mode == COUNT_ESTIMATE:
+            total, exact = await sync_to_async(_estimate_count)(qs)
+        else:
+            total = await qs.acount()
+    items = [row async for row in qs[offset : offset + page_size]]
+    return _counted_page(items, total=total, exact=exact, page=page, page_size=page_size, count_mode=count_mode)
+
+
+def _estimate_count(qs) -> tuple[int, bool]:
+    """
+    -> (count, is_exact)
+    Small results are counted exactly but the scan stops after ESTIMATE_CAP + 1 rows;
+    beyond that Postgres' planner estimate is used (other backends report the cap).
+    """
+    capped = qs[: ESTIMATE_CAP + 1].count()
+    if capped <= ESTIMATE_CAP:
+        return capped, True
+    if is_postgres(connections[qs.db]):
+        return max(_planner_rows(qs), capped), False
+    return capped, False
+
+
+def _planner_rows(qs) -> int:
+    plan = json.loads(qs.order_by().explain(format="json"))
+    # psycopg hands Django the parsed EXPLAIN list, which explain() re-dumps item by item:
+    # the text is then the bare {"Plan": ...} object rather than a one-element list
+    plan = plan[0] if isinstance(plan, list) else plan
+    return int(plan["Plan"]["Plan Rows"])
+
+
+# --- keyset (cursor) pagination ---------------------------------------------
+#
+# Cursor = signed, opaque encoding of the ordering key of the last row served.
+# The next page is `WHERE key > last_key ORDER BY key LIMIT n`, so every page
+# costs the same index range scan no matter how deep it is, and no COUNT runs.
+
+
+class _CursorSerializer:
+    # full microsecond precision (DjangoJSONEncoder would truncate datetimes)
+    def dumps(self, obj):
+        return json.dumps(obj, separators=(",", ":"), default=_cursor_value).encode("latin-1")
+
+    def loads(self, data):
+        return json.loads(data.decode("latin-1"))
+
+
+def _cursor_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    raise TypeError(f"Unsupported cursor value: {type(value).__name__}")
+
+
+def _row_value(row, name: str):
+    return row[name] if isinstance(row, dict) else getattr(row, name)
+
+
+def encode_cursor(*, ordering: tuple[str, ...], values: list) -> str:
+    return signing.dumps(
+        {"o": list(ordering), "v": values},
+        salt=CURSOR_SALT,
+        serializer=_CursorSerializer,
+        compress=True,
+    )
+
+
+def decode_cursor(qs, *, ordering: tuple[str, ...], cursor: str) -> list:
+    try:
+        data = signing.loads(cursor, salt=CURSOR_SALT, serializer=_CursorSerializer)
+    except signing.BadSignature:
+        raise ValidationError("Invalid cursor", details={"cursor": cursor})
+
+    if data.get("o") != list(ordering) or len(data.get("v", [])) != len(ordering):
+        raise ValidationError("Invalid cursor", details={"cursor": cursor})
+
+    opts = qs.model._meta
+    return [
+        opts.get_field(name.lstrip("-")).to_python(value)
+        for name, value in zip(ordering, data["v"])
+    ]
+
+
+def _row(expressions: list, output_field) -> Func:
+    # "(a, b, c)": SQL row value; the lookup only needs an output_field to compile
+    return Func(*expressions, template="(%(expressions)s)", output_field=output_field)
+
+
+def _after(qs, ordering: tuple[str, ...], values: list):
+    """
+    Rows strictly after `values`, as a condition the index range scan can start from.
+
+    One sort direction (e.g. BOOKING_LIST_ORDERING): a row-value comparison,
+      (a, b, c) > (x, y, z)
+    which Postgres uses as the Index Cond of the matching btree index.
+
+    Mixed asc/desc (e.g. RESOURCE_LIST_ORDERING):
+      a >= x AND ((a > x) OR (a = x AND b < y) OR (a = x AND b = y AND c > z) ...)
+    the OR alone has no plain range on the leading column, so without the redundant
+    `a >= x` the scan would start at the beginning of the index and filter every
+    earlier row (O(rows before the cursor), like OFFSET).
+    """
+    descending = {name.startswith("-") for name in ordering}
+    if len(descending) == 1:
+        opts = qs.model._meta
+        fields = [name.lstrip("-") for name in ordering]
+        lhs = _row([F(field) for field in fields], opts.get_field(fields[0]))
+        rhs = _row(
+            [Value(value, output_field=opts.get_field(field)) for field, value in zip(fields, values)],
+            opts.get_field(fields[0]),
+        )
+        return LessThan(lhs, rhs) if descending == {True} else GreaterThan(lhs, rhs)
+
+    q = Q()
+    equal = {}
+    for name, value in zip(ordering, values):
+        field = name.lstrip("-")
+        lookup = "lt" if name.startswith("-") else "gt"
+        q |= Q(**equal, **{f"{field}__{lookup}": value})
+        equal[field] = value
+    first = ordering[0]
+    bound = Q(**{f"{first.lstrip('-')}__{'lte' if first.startswith('-') else 'gte'}": values[0]})
+    return bound & q
+
+
+def _keyset_queryset(qs, *, ordering: tuple[str, ...], cursor: str | None):
+    qs = qs.order_by(*ordering)
+    if cursor:
+        qs = qs.filter(_after(qs, ordering, decode_cursor(qs, ordering=ordering, cursor=cursor)))
+    return qs
+
+
+def _keyset_page(items: list, *, ordering: tuple[str, ...], page_size: int) -> dict:
+    # one extra row was fetched: it tells whether a next page exists
+    has_next = len(items) > page_size
+    items = items[:page_size]
+
+    next_cursor = None
+    if has_next:
+        last = items[-1]
+        next_cursor = encode_cursor(
+            ordering=ordering,
+            values=[_row_value(last, name.lstrip("-")) for name in ordering],
+        )
+
+    return {
+        "page_size": page_size,
+        "next_cursor": next_cursor,
+        "results": items,
+    }
+
+
+def paginate_keyset(qs, *, ordering: tuple[str, ...], cursor: str | None, page_size: int):
+    """
+    `ordering` must end with a unique column (e.g. "id") so the key is total.
+    Empty/missing cursor -> first page.
+    """
+    _check_page_size(page_size)
+    qs = _keyset_queryset(qs, ordering=ordering, cursor=cursor)
+    return _keyset_page(list(qs[: page_size + 1]), ordering=ordering, page_size=page_size)
+
+
+async def apaginate_keyset(qs, *, ordering: tuple[str, ...], cursor: str | None, page_size: int):
+    """Async-ORM twin of paginate_keyset."""
+    _check_page_size(page_size)
+    qs = _keyset_queryset(qs, ordering=ordering, cursor=cursor)
+    items = [row async for row in qs[: page_size + 1]]
+    return _keyset_page(items, ordering=ordering, page_size=page_size)
@@ -0,0 +1,18 @@
+from rest_framework import parsers
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import get_encoding
+
+from common import json_codec
+
+
+class JSONParser(parsers.JSONParser):
+    """DRF's JSONParser on common.json_codec (orjson when available); same errors."""
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = get_encoding(parser_context or {})
+        if encoding.lower().replace("-", "") != "utf8":
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return json_codec.loads(stream.read())
+        except ValueError as exc:
+            raise ParseError("JSON parse error - %s" % str(exc))
@@ -0,0 +1,281 @@
+"""
+Opt-in profiling of single requests (ProfilerMiddleware).
+
+A request is profiled when one of these holds:
+- it carries a valid `X-Profile-Token` header. Mint one with
+  `manage.py profile_token --path /bookings/`. The token is
+  "<expires>:<hmac(PROFILING_SECRET, expires:path)>".
+- it has `?_profile=cprofile|sample` and the caller is a staff user.
+- it is picked by PROFILING_SAMPLE_RATES, e.g. {"/bookings/": 0.01}:
+  path prefix -> fraction of requests. This gives continuous low-rate profiling.
+  Requests that are not picked pay one random() call.
+
+Modes:
+- "cprofile": deterministic. Writes a pstats file:
+  `python -m pstats <dir>/<id>.pstats`, or snakeviz. One capture per process
+  at a time: a request asking for it while another runs gets "sample" instead.
+- "sample": a thread samples the request thread's stack every
+  PROFILING_SAMPLER_INTERVAL_MS. Writes speedscope JSON
+  (https://www.speedscope.app). Its overhead does not depend on call count,
+  so it is the default for rate-sampled requests.
+
+Files go to PROFILING_DIR; the file name is returned in the `X-Profile-Id`
+header. The middleware is disabled entirely when PROFILING_DIR is empty.
+Each write prunes the directory: profiles older than PROFILING_MAX_AGE seconds
+go, then the oldest beyond PROFILING_MAX_FILES.
+
+Under ASGI, both modes see the event loop thread, i.e. also other requests
+running concurrently on it. ORM calls run in sync_to_async worker threads and
+are missed. Profile with WSGI (or sync views) for clean numbers.
+"""
+import cProfile
+import hashlib
+import hmac
+import json
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from apps.users.authentication import JWTAuthentication
+from common.exceptions import AppError
+
+MODE_CPROFILE = "cprofile"
+MODE_SAMPLE = "sample"
+MODES = (MODE_CPROFILE, MODE_SAMPLE)
+
+TOKEN_HEADER = "X-Profile-Token"
+QUERY_FLAG = "_profile"
+PROFILE_ID_HEADER = "X-Profile-Id"
+PROFILE_SUFFIXES = (".pstats", ".speedscope.json")
+_TOKEN_META_KEY = "HTTP_X_PROFILE_TOKEN"
+_CPROFILE_LOCK = threading.Lock()  # held while a cProfile capture runs (see _start)
+
+
+def _secret() -> bytes:
+    return (getattr(settings, "PROFILING_SECRET", None) or settings.SECRET_KEY).encode("utf-8")
+
+
+def _signature(expires: int, path: str) -> str:
+    return hmac.new(_secret(), f"{expires}:{path}".encode("utf-8"), hashlib.sha256).hexdigest()
+
+
+def sign_profile_token(path: str, *, ttl: int = 300) -> str:
+    """Header value that enables profiling of requests to `path` for `ttl` seconds."""
+    expires = int(time.time()) + ttl
+    return f"{expires}:{_signature(expires, path)}"
+
+
+def verify_profile_token(token: str, path: str) -> bool:
+    expires, _, signature = token.partition(":")
+    try:
+        expires = int(expires)
+    except ValueError:
+        return False
+    if expires < time.time():
+        return False
+    return hmac.compare_digest(_signature(expires, path), signature)
+
+
+class Sampler:
+    """Stack sampler for one thread; output in speedscope's "sampled" format."""
+
+    def __init__(self, thread_id: int, *, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self._frames: dict[tuple, int] = {}
+        self._samples: list[list[int]] = []
+        self._weights: list[float] = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._started = self._last = time.perf_counter()
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+        self._duration = time.perf_counter() - self._started
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            now = time.perf_counter()
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                key = (code.co_qualname, code.co_filename, code.co_firstlineno)
+                stack.append(self._frames.setdefault(key, len(self._frames)))
+                frame = frame.f_back
+            stack.reverse()  # root first
+            self._samples.append(stack)
+            self._weights.append(now - self._last)
+            self._last = now
+
+    def speedscope(self, name: str) -> dict:
+        frames = [{"name": n, "file": f, "line": line} for (n, f, line) in self._frames]
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {"frames": frames},
+            "profiles": [{
+                "type": "sampled",
+                "name": name,
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": self._duration,
+                "samples": self._samples,
+                "weights": self._weights,
+            }],
+            "exporter": "booking_api common.profiling",
+        }
+
+
+class ProfilerMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.directory = getattr(settings, "PROFILING_DIR", "")
+        if not self.directory:
+            raise MiddlewareNotUsed
+        os.makedirs(self.directory, exist_ok=True)
+        self.sample_rates = getattr(settings, "PROFILING_SAMPLE_RATES", {})
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        mode = self._mode(request)
+        if mode is None:
+            flag = _flag_mode(request)
+            if flag is None or not _is_staff(request):
+                return self.get_response(request)
+            mode = flag
+
+        profiler = self._start(mode)
+        try:
+            response = self.get_response(request)
+        finally:
+            self._stop(profiler)
+        return self._save(request, response, profiler)
+
+    async def __acall__(self, request):
+        mode = self._mode(request)
+        if mode is None:
+            flag = _flag_mode(request)
+            if flag is None or not await sync_to_async(_is_staff)(request):
+                return await self.get_response(request)
+            mode = flag
+
+        profiler = self._start(mode)
+        try:
+            response = await self.get_response(request)
+        finally:
+            self._stop(profiler)
+        return self._save(request, response, profiler)
+
+    def _mode(self, request) -> str | None:
+        """Signed token or rate sampling; the staff query flag is checked by the caller."""
+        token = request.META.get(_TOKEN_META_KEY)  # not request.headers: that builds a dict per access
+        if token is not None and verify_profile_token(token, request.path):
+            return _flag_mode(request) or MODE_CPROFILE
+
+        for prefix, rate in self.sample_rates.items():
+            if request.path.startswith(prefix):
+                if random.random() < rate:
+                    return getattr(settings, "PROFILING_SAMPLE_MODE", MODE_SAMPLE)
+                break
+        return None
+
+    @staticmethod
+    def _start(mode: str):
+        # one cProfile per process: on 3.12+ it sits on sys.monitoring and a second
+        # enable() raises "Another profiling tool is already active". Busy -> sampler.
+        if mode == MODE_CPROFILE and _CPROFILE_LOCK.acquire(blocking=False):
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:  # a debugger/coverage tool holds the profiling hook
+                _CPROFILE_LOCK.release()
+            else:
+                return profiler
+        interval = getattr(settings, "PROFILING_SAMPLER_INTERVAL_MS", 5) / 1000
+        profiler = Sampler(threading.get_ident(), interval=interval)
+        profiler.start()
+        return profiler
+
+    @staticmethod
+    def _stop(profiler) -> None:
+        if isinstance(profiler, cProfile.Profile):
+            profiler.disable()
+            _CPROFILE_LOCK.release()
+        else:
+            profiler.stop()
+
+    def _save(self, request, response, profiler):
+        profile_id = f"{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:12]}"
+        if isinstance(profiler, cProfile.Profile):
+            profile_id += ".pstats"
+            profiler.dump_stats(os.path.join(self.directory, profile_id))
+        else:
+            profile_id += ".speedscope.json"
+            with open(os.path.join(self.directory, profile_id), "w") as f:
+                json.dump(profiler.speedscope(f"{request.method} {request.path}"), f)
+        response[PROFILE_ID_HEADER] = profile_id
+        prune_profiles(
+            self.directory,
+            max_files=getattr(settings, "PROFILING_MAX_FILES", 500),
+            max_age=getattr(settings, "PROFILING_MAX_AGE", 7 * 86400),
+        )
+        return response
+
+
+def prune_profiles(directory: str, *, max_files: int, max_age: float) -> int:
+    """Delete profiles older than max_age seconds, then the oldest beyond max_files; returns files deleted."""
+    entries = []
+    with os.scandir(directory) as it:
+        for entry in it:
+            if entry.name.endswith(PROFILE_SUFFIXES):
+                try:
+                    entries.append((entry.stat().st_mtime, entry.path))
+                except FileNotFoundError:  # pruned by another worker
+                    pass
+    entries.sort(reverse=True)  # newest first
+    cutoff = time.time() - max_age
+    stale = [path for i, (mtime, path) in enumerate(entries) if i >= max_files or mtime < cutoff]
+    for path in stale:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+    return len(stale)
+
+
+def _flag_mode(request) -> str | None:
+    if QUERY_FLAG not in request.META.get("QUERY_STRING", ""):
+        return None  # skip parsing the query string on the hot path
+    mode = request.GET.get(QUERY_FLAG)
+    return mode if mode in MODES else None
+
+
+def _is_staff(request) -> bool:
+    # runs before DRF authentication: resolve the JWT here (cached, see users.authentication)
+    user = getattr(request, "user", None)
+    if user is not None and user.is_authenticated:
+        return user.is_staff
+    try:
+        result = JWTAuthentication().authenticate(request)
+    except AppError:
+        return False
+    return result is not None and result[0].is_staff
@@ -0,0 +1,20 @@
+from rest_framework import renderers
+
+from common import json_codec
+from common.request_timing import timed
+
+
+class JSONRenderer(renderers.JSONRenderer):
+    """
+    DRF's JSONRenderer on common.json_codec (orjson when available, same bytes);
+    rendering counts as the request's "serialize" time.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with timed("serialize"):
+            if data is None:
+                return b""
+            if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+                # pretty-printing asked for (?indent / browsable API): stdlib layout
+                return super().render(data, accepted_media_type, renderer_context)
+            return json_codec.dumps(data)
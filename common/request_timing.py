@@ -0,0 +1,151 @@
+"""
+Per-request timing: query count, DB time, row-lock wait, auth and serialization time.
+
+RequestTimingMiddleware reports them as a `Server-Timing` header (settings.SERVER_TIMING)
+and one structured log line per request (logger "common.request_timing", the numbers
+are in `record.timing`).
+
+- db / queries: every statement, through a wrapper installed on each DB connection
+- lock:         statements with FOR UPDATE (select_for_update in create/cancel/bulk),
+                i.e. the time spent waiting for the row lock plus the lookup itself
+- auth / serialize: `timed("auth")`, `timed("serialize")` spans around that code
+"""
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+logger = logging.getLogger("common.request_timing")
+
+_current: ContextVar["RequestTimings | None"] = ContextVar("request_timings", default=None)
+
+
+class RequestTimings:
+    __slots__ = ("queries", "db", "lock", "spans")
+
+    def __init__(self):
+        self.queries = 0
+        self.db = 0.0
+        self.lock = 0.0
+        self.spans: dict[str, float] = {}
+
+    def add(self, name: str, seconds: float) -> None:
+        self.spans[name] = self.spans.get(name, 0.0) + seconds
+
+    def as_dict(self, total: float) -> dict:
+        return {
+            "total_ms": round(total * 1000, 3),
+            "queries": self.queries,
+            "db_ms": round(self.db * 1000, 3),
+            "lock_ms": round(self.lock * 1000, 3),
+            **{f"{name}_ms": round(seconds * 1000, 3) for name, seconds in self.spans.items()},
+        }
+
+    def server_timing(self, total: float) -> str:
+        metrics = [
+            f'db;dur={self.db * 1000:.2f};desc="{self.queries} queries"',
+            f"lock;dur={self.lock * 1000:.2f}",
+            *(f"{name};dur={seconds * 1000:.2f}" for name, seconds in self.spans.items()),
+            f"total;dur={total * 1000:.2f}",
+        ]
+        return ", ".join(metrics)
+
+
+def current_timings() -> RequestTimings | None:
+    return _current.get()
+
+
+@contextmanager
+def timed(name: str):
+    """Adds the block's duration to the current request's `name` span (no-op outside requests)."""
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(name, time.perf_counter() - t0)
+
+
+def _record_query(execute, sql, params, many, context):
+    timings = _current.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    t0 = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        elapsed = time.perf_counter() - t0
+        timings.queries += 1
+        timings.db += elapsed
+        if "FOR UPDATE" in sql:
+            timings.lock += elapsed
+
+
+def _install_wrapper(connection, **kwargs) -> None:
+    # first, so connection.execute_wrapper() blocks (which pop the last one) never remove it
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, _record_query)
+
+
+# connections opened later, in any thread (incl. the async ORM's worker threads)
+connection_created.connect(_install_wrapper)
+
+
+class RequestTimingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        timings, token, t0 = self._start()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self._finish(request, response, timings, time.perf_counter() - t0)
+
+    async def __acall__(self, request):
+        timings, token, t0 = self._start()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self._finish(request, response, timings, time.perf_counter() - t0)
+
+    @staticmethod
+    def _start():
+        # connections that were already open in this thread before the middleware loaded
+        for connection in connections.all(initialized_only=True):
+            _install_wrapper(connection)
+        timings = RequestTimings()
+        return timings, _current.set(timings), time.perf_counter()
+
+    @staticmethod
+    def _finish(request, response, timings: RequestTimings, total: float):
+        if getattr(settings, "SERVER_TIMING", False):
+            response["Server-Timing"] = timings.server_timing(total)
+
+        data = timings.as_dict(total)
+        logger.info(
+            "%s %s %s %.1fms queries=%d db=%.1fms lock=%.1fms",
+            request.method, request.path, response.status_code,
+            data["total_ms"], timings.queries, data["db_ms"], data["lock_ms"],
+            extra={"timing": {"method": request.method, "path": request.path,
+                              "status": response.status_code, **data}},
+        )
+        return response
@@ -1,13 +1,20 @@
 from rest_framework.response import Response
 
+
+def error_payload(exc) -> dict:
+    return {
+        "code": getattr(exc, "code", "APP_ERROR"),
+        "message": getattr(exc, "message", str(exc)),
+        "details": getattr(exc, "details", {}),
+    }
+
+
 def error_response(exc):
-    return Response(
-        {
-            "error": {
-                "code": getattr(exc, "code", "APP_ERROR"),
-                "message": getattr(exc, "message", str(exc)),
-                "details": getattr(exc, "details", {}),
-            }
-        },
+    response = Response(
+        {"error": error_payload(exc)},
         status=getattr(exc, "status", 400),
     )
+    retry_after = getattr(exc, "retry_after", None)
+    if retry_after is not None:
+        response["Retry-After"] = str(retry_after)
+    return response
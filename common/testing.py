@@ -0,0 +1,32 @@
+"""
+Test helpers.
+
+    with assert_query_budget(self, queries=2, joins=0):
+        self.client.get("/bookings/")
+
+fails when the block runs more queries (or SQL JOINs in total) than budgeted,
+listing the captured SQL, so an extra query or join on a hot endpoint fails CI.
+"""
+import re
+from contextlib import contextmanager
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test.utils import CaptureQueriesContext
+
+_JOIN = re.compile(r"\bJOIN\b")
+
+
+@contextmanager
+def assert_query_budget(testcase, *, queries: int, joins: int | None = None, using: str = DEFAULT_DB_ALIAS):
+    with CaptureQueriesContext(connections[using]) as ctx:
+        yield ctx
+
+    executed = [q["sql"] for q in ctx.captured_queries]
+    listing = "\n".join(f"{i}. {sql}" for i, sql in enumerate(executed, start=1))
+    testcase.assertLessEqual(
+        len(executed), queries,
+        f"query budget exceeded: {len(executed)} > {queries}\n{listing}",
+    )
+    if joins is not None:
+        found = sum(len(_JOIN.findall(sql)) for sql in executed)
+        testcase.assertLessEqual(found, joins, f"join budget exceeded: {found} > {joins}\n{listing}")
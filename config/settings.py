@@ -42,11 +42,16 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'common.request_timing.RequestTimingMiddleware',
+    'common.metrics.MetricsMiddleware',
+    'common.profiling.ProfilerMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'common.db_routing.ReadYourWritesMiddleware',
+    'common.db_pool.PoolStatsMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -85,6 +90,47 @@ DATABASES = {
     }
 }
 
+# Connection pooling: psycopg 3 pool per worker process (pip install "psycopg[binary,pool]").
+# DB_POOL_MAX_SIZE=0 disables it (then DB_CONN_MAX_AGE applies, 0 = connect per request).
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "0"))
+if DB_POOL_MAX_SIZE:
+    DATABASES["default"]["OPTIONS"] = {
+        "pool": {
+            "min_size": int(os.getenv("DB_POOL_MIN_SIZE", "2")),
+            "max_size": DB_POOL_MAX_SIZE,
+            "timeout": float(os.getenv("DB_POOL_TIMEOUT", "10")),          # max wait for a connection
+            "max_idle": float(os.getenv("DB_POOL_MAX_IDLE", "600")),
+            "max_lifetime": float(os.getenv("DB_POOL_MAX_LIFETIME", "3600")),
+        },
+    }
+    # pre-ping: the pool checks a connection before handing it out
+    DATABASES["default"]["CONN_HEALTH_CHECKS"] = True
+else:
+    DATABASES["default"]["CONN_MAX_AGE"] = int(os.getenv("DB_CONN_MAX_AGE", "0"))
+
+# pool saturation/wait samples -> hooks (see common/db_pool.py)
+DB_POOL_STATS_HOOKS = ["common.db_pool.log_pool_stats"]
+DB_POOL_STATS_INTERVAL = int(os.getenv("DB_POOL_STATS_INTERVAL", "10"))
+DB_POOL_SATURATION_WARN = float(os.getenv("DB_POOL_SATURATION_WARN", "0.9"))
+
+# Read replicas (comma separated hosts, same credentials) serve the read selectors;
+# see common/db_routing.py. Locally, a streaming replica with
+# `recovery_min_apply_delay = '2s'` is an easy way to simulate replication lag.
+DATABASE_REPLICAS = []
+for i, host in enumerate(filter(None, os.getenv("DB_REPLICA_HOSTS", "").split(",")), start=1):
+    alias = f"replica_{i}"
+    DATABASES[alias] = {
+        **DATABASES["default"],
+        "HOST": host.strip(),
+        "PORT": os.getenv("DB_REPLICA_PORT", os.getenv("DB_PORT")),
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ["common.db_routing.PrimaryReplicaRouter"]
+# seconds a user's reads stay on the primary after they wrote (0 disables)
+READ_YOUR_WRITES_WINDOW = int(os.getenv("READ_YOUR_WRITES_WINDOW", "5"))
+
 
 
 # Password validation
@@ -132,13 +178,88 @@ AUTH_USER_MODEL = "users.User"
 
 JWT_SECRET = os.getenv("JWT_SECRET", SECRET_KEY)
 JWT_ACCESS_TTL = int(os.getenv("JWT_ACCESS_TTL", "3600"))
+JWT_REFRESH_TTL = int(os.getenv("JWT_REFRESH_TTL", str(30 * 24 * 3600)))
+# verified-token LRU size per process (0 disables)
+JWT_CACHE_SIZE = int(os.getenv("JWT_CACHE_SIZE", "4096"))
+# authenticated-user cache: seconds (0 disables); shared cache alias from CACHES.
+# Without an alias each worker has its own cache that only it invalidates, so the
+# TTL is capped at AUTH_USER_LOCAL_CACHE_TTL: set the alias for multi-worker servers.
+AUTH_USER_CACHE_TTL = int(os.getenv("AUTH_USER_CACHE_TTL", "60"))
+AUTH_USER_CACHE_ALIAS = os.getenv("AUTH_USER_CACHE_ALIAS") or None
+AUTH_USER_LOCAL_CACHE_TTL = int(os.getenv("AUTH_USER_LOCAL_CACHE_TTL", "5"))
+
+# "lock" (default, any backend) | "constraint" (Postgres exclusion constraint)
+BOOKING_OVERLAP_ENGINE = os.getenv("BOOKING_OVERLAP_ENGINE", "lock")
+# resource lock of the "lock" engine (Postgres): "block" | "nowait" | "timeout" (BOOKING_LOCK_TIMEOUT_MS)
+BOOKING_LOCK_POLICY = os.getenv("BOOKING_LOCK_POLICY", "block")
+BOOKING_LOCK_TIMEOUT_MS = int(os.getenv("BOOKING_LOCK_TIMEOUT_MS", "200"))
+BOOKING_LOCK_RETRIES = int(os.getenv("BOOKING_LOCK_RETRIES", "2"))
+BOOKING_LOCK_RETRY_BACKOFF_MS = int(os.getenv("BOOKING_LOCK_RETRY_BACKOFF_MS", "50"))
+# still busy after the retries -> 409 (or 429) with Retry-After: <seconds>
+BOOKING_LOCK_BUSY_STATUS = int(os.getenv("BOOKING_LOCK_BUSY_STATUS", "409"))
+BOOKING_LOCK_RETRY_AFTER = int(os.getenv("BOOKING_LOCK_RETRY_AFTER", "1"))
+
+# bookings that ended more than this many days ago move to BookingArchive (manage.py archive_bookings)
+BOOKING_ARCHIVE_AFTER_DAYS = int(os.getenv("BOOKING_ARCHIVE_AFTER_DAYS", "90"))
+
+# GET /resources/occupancy/: largest heatmap (resources x cells) served in one response
+OCCUPANCY_MAX_CELLS = int(os.getenv("OCCUPANCY_MAX_CELLS", "500000"))
+
+# Idempotency-Key on booking writes (apps/bookings/idempotency.py): stored responses live
+# IDEMPOTENCY_KEY_TTL seconds (purge_idempotency_keys); an unfinished claim is taken over after the timeout
+IDEMPOTENCY_KEY_TTL = int(os.getenv("IDEMPOTENCY_KEY_TTL", str(24 * 3600)))
+IDEMPOTENCY_IN_FLIGHT_TIMEOUT = int(os.getenv("IDEMPOTENCY_IN_FLIGHT_TIMEOUT", "60"))
+
+# JSON bodies (common.json_codec): "orjson" (used when installed) | "stdlib"; identical output
+JSON_BACKEND = os.getenv("JSON_BACKEND", "orjson")
+
+# serve the hot read endpoints with native async views (enable when running under ASGI)
+ASYNC_READ_VIEWS = os.getenv("ASYNC_READ_VIEWS", "False") == "True"
 
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
         "apps.users.authentication.JWTAuthentication",
     ],
+    "DEFAULT_RENDERER_CLASSES": [
+        "common.renderers.JSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "common.parsers.JSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
+}
+
+# per-request query/DB/lock/auth/serialize timings as a Server-Timing header
+# (always logged, see common/request_timing.py)
+SERVER_TIMING = os.getenv("SERVER_TIMING", str(DEBUG)) == "True"
+
+# /metrics (Prometheus text format, common/metrics.py): closed unless one of these is set.
+# METRICS_TOKEN: scrapers send "Authorization: Bearer <token>" (works behind a proxy).
+# METRICS_ALLOWED_IPS: REMOTE_ADDR allowlist ("*" = any); behind a same-host reverse proxy
+# every request comes from the proxy's address, so don't list it there.
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+METRICS_ALLOWED_IPS = [ip.strip() for ip in os.getenv("METRICS_ALLOWED_IPS", "").split(",") if ip.strip()]
+# multi-worker servers (gunicorn): shared snapshot dir, wiped on every server start
+METRICS_MULTIPROC_DIR = os.getenv("METRICS_MULTIPROC_DIR") or None
+METRICS_FLUSH_INTERVAL = int(os.getenv("METRICS_FLUSH_INTERVAL", "5"))
+
+# opt-in request profiling (common/profiling.py); empty PROFILING_DIR = middleware off
+PROFILING_DIR = os.getenv("PROFILING_DIR", "")
+PROFILING_SECRET = os.getenv("PROFILING_SECRET", SECRET_KEY)
+# "/bookings/=0.01,/resources/=0.001": path prefix -> fraction of requests profiled
+PROFILING_SAMPLE_RATES = {
+    prefix.strip(): float(rate)
+    for prefix, _, rate in (item.partition("=") for item in os.getenv("PROFILING_SAMPLE_RATES", "").split(","))
+    if prefix.strip() and rate
 }
+PROFILING_SAMPLE_MODE = os.getenv("PROFILING_SAMPLE_MODE", "sample")  # sample | cprofile
+PROFILING_SAMPLER_INTERVAL_MS = int(os.getenv("PROFILING_SAMPLER_INTERVAL_MS", "5"))
+# pruned on every write: oldest files beyond the count, anything older than the age (seconds)
+PROFILING_MAX_FILES = int(os.getenv("PROFILING_MAX_FILES", "500"))
+PROFILING_MAX_AGE = int(os.getenv("PROFILING_MAX_AGE", str(7 * 86400)))
 
 
 
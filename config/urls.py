@@ -1,10 +1,12 @@
 from django.contrib import admin
 from django.urls import path, include
 
+from common.metrics import metrics_view
+
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("auth/", include("apps.users.urls")),
     path("resources/", include("apps.resources.urls")),
     path("bookings/", include("apps.bookings.urls")),
-
+    path("metrics/", metrics_view),
 ]